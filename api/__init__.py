@@ -2,4 +2,4 @@ from flask import Blueprint
 
 api_blueprint = Blueprint('api', __name__)
 
-from . import users, departments, courses, students, professors, registrations, exams, announcements, seed_data, auth
\ No newline at end of file
+from . import routing, pagination, filters, conditional, bulk, includes, users, departments, courses, students, professors, registrations, exams, announcements, search, events, jobs, seed_data, auth, stats
\ No newline at end of file
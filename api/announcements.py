@@ -1,7 +1,12 @@
 from flask import request, jsonify
 from . import api_blueprint
-from models import db, Announcements, Courses
+from models import db, Announcements, Courses, Course_Registrations
 from .auth import token_required, roles_required
+from .serializers import ANNOUNCEMENT, ANNOUNCEMENT_SUMMARY, dump_page
+from .pagination import page_args, encode_cursor, cursor_parser
+from .export import wants_ndjson, ndjson_response
+from .pubsub import publish_event
+import datetime
 
 # Yeni bir duyuru oluşturma (Admin ve Professor)
 @api_blueprint.route('/announcements', methods=['POST'])
@@ -29,6 +34,7 @@ def create_announcement(current_user):
     try:
         db.session.add(new_announcement)
         db.session.commit()
+        publish_event('announcement', ANNOUNCEMENT_SUMMARY.dump(new_announcement))
         return jsonify({'message': 'Duyuru başarıyla oluşturuldu.', 'announcement_id': new_announcement.id}), 201
     except Exception as e:
         db.session.rollback()
@@ -37,14 +43,64 @@ def create_announcement(current_user):
 # Tüm duyuruları listeleme (Herkes)
 @api_blueprint.route('/announcements', methods=['GET'])
 def get_all_announcements():
-    announcements = Announcements.query.all()
-    output = []
-    for ann in announcements:
-        output.append({
-            'id': ann.id,
-            'title': ann.title,
-            'content': ann.content,
-            'date_posted': ann.date_posted.isoformat(),
-            'course_id': ann.course_id
-        })
-    return jsonify({'announcements': output})
\ No newline at end of file
+    if wants_ndjson():
+        return ndjson_response(ANNOUNCEMENT)
+
+    announcements, next_cursor = dump_page(ANNOUNCEMENT, ['course'])
+    return jsonify({'announcements': announcements, 'next_cursor': next_cursor})
+
+# Tek bir duyurunun tam metni (Herkes)
+@api_blueprint.route('/announcements/<int:announcement_id>', methods=['GET'])
+def get_announcement(announcement_id):
+    row = db.session.execute(ANNOUNCEMENT.select().where(Announcements.id == announcement_id)).first()
+    if row is None:
+        return jsonify({'error': f'{announcement_id} numaralı duyuru bulunamadı.'}), 404
+    return jsonify(ANNOUNCEMENT.dump_rows([row])[0])
+
+def feed_courses_query(current_user):
+    """Kullanıcının akışına giren dersler: öğrencinin kayıtlı, akademisyenin verdiği dersler; diğerleri için None."""
+    if current_user.student_id is not None:
+        return db.select(Course_Registrations.course_id).where(Course_Registrations.student_id == current_user.student_id)
+    if current_user.professor_id is not None:
+        return db.select(Courses.id).where(Courses.professor_id == current_user.professor_id)
+    return None
+
+def feed_course_ids(current_user):
+    query = feed_courses_query(current_user)
+    return db.session.scalars(query).all() if query is not None else []
+
+def feed_query(course_ids, limit, after=None):
+    """Genel duyurular ve verilen derslerin duyurularından en yeni `limit` kaydı seçen sorgu.
+
+    Her ders (ve genel duyurular) için ayrı bir alt sorgu (course_id, date_posted, id)
+    indeksinde geriye doğru en fazla `limit` satır okur; sonuçlar birleştirilip
+    yeniden sıralanır. Böylece maliyet toplam duyuru sayısına değil, ders sayısı
+    ile sayfa boyutuna bağlıdır. `after`, (date_posted, id) imlecidir.
+    """
+    newest_first = (Announcements.date_posted.desc(), Announcements.id.desc())
+    branches = []
+    for course_id in [None, *sorted(set(course_ids))]:
+        branch = ANNOUNCEMENT_SUMMARY.select().where(
+            Announcements.course_id.is_(None) if course_id is None else Announcements.course_id == course_id)
+        if after is not None:
+            branch = branch.where(db.tuple_(Announcements.date_posted, Announcements.id) < after)
+        # SQLite birleşimin parçalarında ORDER BY/LIMIT kabul etmez; her parça alt sorguya sarılır
+        branch = branch.order_by(*newest_first).limit(limit).subquery()
+        branches.append(db.select(branch))
+
+    feed = db.union_all(*branches).subquery()
+    return db.select(*(feed.c[field] for field in ANNOUNCEMENT_SUMMARY.fields)) \
+        .order_by(feed.c.date_posted.desc(), feed.c.id.desc()).limit(limit)
+
+# Kullanıcıya ait duyuru akışı, en yeniden eskiye (Giriş yapmış herkes)
+@api_blueprint.route('/me/announcements', methods=['GET'])
+@token_required
+def get_my_announcements(current_user):
+    limit, after = page_args(cursor=cursor_parser(datetime.datetime, int))
+    rows = db.session.execute(feed_query(feed_course_ids(current_user), limit + 1, after)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].date_posted, rows[-1].id)
+    return jsonify({'announcements': ANNOUNCEMENT_SUMMARY.dump_rows(rows), 'next_cursor': next_cursor})
@@ -1,11 +1,77 @@
-from flask import request, jsonify, current_app
+from flask import request, jsonify, current_app, g
 from . import api_blueprint
-from models import Users, db
+from models import Users, Students, Professors, db
+from .caching import LRUCache, response_cache
+from .roles import role_registry
+from .routing import use_primary
+from collections import namedtuple
 import jwt
 import datetime
 from datetime import timezone
 from functools import wraps
 
+# Token sahibinin istekler arasında önbellekte tutulan özeti (ORM nesnesi değildir)
+class Principal(namedtuple('Principal', ['id', 'username', 'role_id', 'student_id', 'professor_id'])):
+    __slots__ = ()
+
+    @property
+    def role_name(self):
+        return role_registry.name_for(self.role_id)
+
+PRINCIPAL_CACHE_SIZE = 10000
+PRINCIPAL_CACHE_TTL = 60  # saniye
+
+# `?access_token=` ile yalnızca bu kapsamdaki kısa ömürlü token kabul edilir; sorgu dizesi
+# erişim günlüklerine yazılabildiği için 24 saatlik oturum token'ı URL'de taşınmaz.
+STREAM_TOKEN_SCOPE = 'events'
+DEFAULT_STREAM_TOKEN_SECONDS = 60
+
+# Girdiler (sürüm, özet) çiftidir; bkz. principal_version
+principal_cache = LRUCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL)
+
+def principal_version(user_id):
+    """Kullanıcı özetinin sürümü; yanıt önbelleğinin arka ucunda tutulur.
+
+    `invalidate_principal` sürümü artırır. Arka uç Redis ise tüm gunicorn
+    işçileri ve ASGI süreci aynı sürümü gördüğü için hepsinin önbelleğindeki
+    eski özet bir sonraki istekte kullanılmaz.
+    """
+    return response_cache.versions(f'principal:{user_id}')
+
+def cached_principal(cache, user_id, version):
+    """Önbellekteki özet güncel sürüme aitse döndürür, değilse None."""
+    entry = cache.get(user_id)
+    if entry is None or entry[0] != version:
+        return None
+    return entry[1]
+
+def load_principal(user_id):
+    """Kullanıcının rol ve profil bilgisini önbellekten, yoksa tek sorguyla getirir."""
+    version = principal_version(user_id)
+    principal = cached_principal(principal_cache, user_id, version)
+    if principal is not None:
+        return principal
+
+    # Rol/parola değişikliği hemen geçerli olsun diye okuma kopyası kullanılmaz
+    with use_primary():
+        row = db.session.execute(
+            db.select(Users.id, Users.username, Users.role_id, Students.id, Professors.id)
+            .outerjoin(Students, Students.user_id == Users.id)
+            .outerjoin(Professors, Professors.user_id == Users.id)
+            .where(Users.id == user_id)
+        ).first()
+    if row is None:
+        return None
+
+    principal = Principal(*row)
+    principal_cache.set(user_id, (version, principal))
+    return principal
+
+def invalidate_principal(user_id):
+    """Kullanıcı değiştiğinde veya silindiğinde önbellekteki özetini tüm süreçlerde geçersiz kılar."""
+    principal_cache.delete(user_id)
+    response_cache.backend.bump(f'principal:{user_id}')
+
 @api_blueprint.route('/login', methods=['POST'])
 def login():
     data = request.get_json()
@@ -31,20 +97,38 @@ def login():
 
     return jsonify({'message': 'Giriş Başarılı', 'token': token}), 200
 
-def token_required(f):
+def stream_token(user_id, role_id, secret_key, seconds=DEFAULT_STREAM_TOKEN_SECONDS):
+    """Yalnızca olay akışına bağlanmakta kullanılabilen kısa ömürlü token üretir."""
+    payload = {
+        'id': user_id,
+        'role_id': role_id,
+        'scope': STREAM_TOKEN_SCOPE,
+        'exp': datetime.datetime.now(timezone.utc) + datetime.timedelta(seconds=seconds)
+    }
+    return jwt.encode(payload, secret_key, algorithm='HS256')
+
+def token_scope_allowed(data, from_query):
+    """Sorgu dizesindeki token akış token'ı olmalı; akış token'ı başlıkta kullanılamaz."""
+    return data.get('scope') == (STREAM_TOKEN_SCOPE if from_query else None)
+
+def token_required(f, allow_query_token=False):
     @wraps(f)
     def decorated(*args, **kwargs):
         token = None
+        from_query = False
 
         if 'Authorization' in request.headers:
             token = request.headers['Authorization'].split()[1]
+        elif allow_query_token:
+            token = request.args.get('access_token')
+            from_query = True
 
         if not token:
             return jsonify({'message': 'Token is missing'}), 401
 
         try:
             data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
-            current_user = db.session.get(Users, data['id'])
+            current_user = load_principal(data['id'])
         except jwt.ExpiredSignatureError:
             return jsonify({'message': 'Token has expired'}), 401
         except jwt.InvalidTokenError:
@@ -52,16 +136,25 @@ def token_required(f):
         except Exception as e:
             return jsonify({'message': str(e)}), 401
 
+        # Token'daki rol kullanıcının güncel rolüyle uyuşmuyorsa token eskimiştir
+        if current_user is None or data.get('role_id') != current_user.role_id or not token_scope_allowed(data, from_query):
+            return jsonify({'message': 'Token is invalid'}), 401
+
+        g.user_id = current_user.id
         return f(current_user, *args, **kwargs)
 
     return decorated
 
+def query_token_required(f):
+    """`token_required` gibi; başlık gönderemeyen istemciler (EventSource) `?access_token=` ile akış token'ı verebilir."""
+    return token_required(f, allow_query_token=True)
+
 def roles_required(roles):
     def wrapper(f):
         @wraps(f)
         @token_required
         def decorated_function(current_user, *args, **kwargs):
-            if current_user.role.role_name not in roles:
+            if current_user.role_id not in role_registry.ids_for(roles):
                 return jsonify({'message': 'Access forbidden: Erişim Engellendi'}), 403
             return f(current_user, *args, **kwargs)
         return decorated_function
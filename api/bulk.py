@@ -0,0 +1,69 @@
+from flask import request, jsonify
+from . import api_blueprint
+from models import db
+import csv
+import io
+
+# Tek bir INSERT veya IN sorgusunda gönderilecek en fazla satır/değer sayısı
+BULK_CHUNK_SIZE = 1000
+
+
+class BulkInputError(ValueError):
+    """Toplu yükleme gövdesi okunamadığında fırlatılır."""
+
+
+@api_blueprint.errorhandler(BulkInputError)
+def handle_bulk_input_error(error):
+    return jsonify({'error': str(error)}), 400
+
+
+def read_bulk_rows(key):
+    """Toplu istek gövdesini satır sözlükleri listesi olarak okur.
+
+    JSON gövdesi doğrudan bir dizi veya `{key: [...]}` olabilir. CSV için
+    `file` alanıyla bir dosya yüklenebilir ya da gövde `text/csv` olarak
+    gönderilebilir; ilk satır kolon adlarını içermelidir.
+    """
+    if 'file' in request.files:
+        try:
+            text = request.files['file'].read().decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise BulkInputError('CSV dosyası UTF-8 olarak kaydedilmelidir.')
+        return list(csv.DictReader(io.StringIO(text)))
+    if request.mimetype == 'text/csv':
+        return list(csv.DictReader(io.StringIO(request.get_data(as_text=True))))
+
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get(key)
+    if not isinstance(data, list):
+        raise BulkInputError(f'Gövde bir dizi veya "{key}" alanında bir dizi içermelidir.')
+    if not all(isinstance(row, dict) for row in data):
+        raise BulkInputError('Dizideki her eleman bir nesne olmalıdır.')
+    return data
+
+
+def chunked(items, size=BULK_CHUNK_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def existing_ids(column, ids):
+    """Verilen id'lerden veritabanında bulunanları parça parça IN sorgusuyla döndürür."""
+    found = set()
+    for chunk in chunked(ids):
+        found.update(db.session.scalars(db.select(column).where(column.in_(chunk))))
+    return found
+
+
+def dialect_insert(model, session=None):
+    """Aktif veritabanının ON CONFLICT destekli INSERT yapısını döndürür."""
+    dialect = (session or db.session).get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f'{dialect} için toplu ekleme desteklenmiyor.')
+    return insert(model)
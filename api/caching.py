@@ -0,0 +1,344 @@
+from collections import OrderedDict
+from flask import request, make_response, current_app, g
+from functools import wraps
+import hashlib
+import threading
+import time
+import uuid
+
+try:
+    import redis
+except ImportError:  # Redis arka ucu kullanılmıyorsa paket gerekmez
+    redis = None
+
+# Yanıt önbelleği varsayılanları (app.config üzerinden değiştirilebilir)
+DEFAULT_CACHE_SIZE = 10000
+DEFAULT_CACHE_TTL = 300  # saniye
+DEFAULT_KEY_PREFIX = 'akademik:'
+DEFAULT_WRITE_WINDOW = 5  # saniye; yazma sonrası okumaların birincil veritabanına gideceği süre
+
+
+class LRUCache:
+    """Boyutu sınırlı, süreli (TTL) ve iş parçacığı güvenli bir bellek içi önbellek.
+
+    Kapasite dolduğunda en uzun süredir kullanılmayan girdi atılır; `ttl`
+    saniyeden eski girdiler okunurken yok sayılır. İsabet, ıskalama ve
+    kapasite nedeniyle atılan girdi sayıları `stats()` ile okunur.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = ttl or self.ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self._data)}
+
+    def __len__(self):
+        return len(self._data)
+
+
+class MemoryCache:
+    """Tek süreçlik önbellek arka ucu; tek sunuculu kurulumlar ve testler içindir.
+
+    Tablo sürümleri süreç belleğinde tutulur; süreç yeniden başladığında eski
+    anahtar ve ETag'lerin eşleşmemesi için rastgele bir `epoch` kullanılır.
+    Sürümler de girdiler kadar sınırlıdır: en uzun süredir artırılmayan sürüm
+    atılır. Atılan ya da hiç artırılmamış anahtarlar `_floor` sürümünü okur;
+    her atmada taban, şimdiye kadar verilmiş tüm sürümlerin üstüne çıkar ve
+    eski bir girdi yeniden eşleşmez.
+    """
+
+    name = 'memory'
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, ttl=DEFAULT_CACHE_TTL):
+        self._entries = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._marks = LRUCache(maxsize=maxsize)
+        self._versions = OrderedDict()
+        self._max_versions = maxsize
+        self._clock = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+        self._epoch = uuid.uuid4().hex
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def set(self, key, value, ttl=None):
+        self._entries.set(key, value, ttl)
+
+    def delete(self, key):
+        self._entries.delete(key)
+
+    def mark(self, key, ttl):
+        self._marks.set(key, True, ttl)
+
+    def is_marked(self, *keys):
+        return any(self._marks.get(key) for key in keys)
+
+    def versions(self, *tables):
+        with self._lock:
+            return (self._epoch,) + tuple(self._versions.get(table, self._floor) for table in tables)
+
+    def bump(self, *tables):
+        with self._lock:
+            for table in tables:
+                self._clock += 1
+                self._versions[table] = self._clock
+                self._versions.move_to_end(table)
+            while len(self._versions) > self._max_versions:
+                self._versions.popitem(last=False)
+                self._clock += 1
+                self._floor = self._clock
+
+    def clear(self):
+        self._entries.clear()
+        self._marks.clear()
+        with self._lock:
+            self._versions.clear()
+            self._clock = self._floor = 0
+
+    def stats(self):
+        return {'backend': self.name, **self._entries.stats()}
+
+
+class RedisCache:
+    """Redis protokolü konuşan bir sunucuyu paylaşılan önbellek olarak kullanır.
+
+    Tüm işçi süreçleri aynı tablo sürümlerini gördüğü için bir süreçteki
+    yazma işlemi diğerlerindeki önbellek girdilerini ve ETag'leri de
+    geçersizleştirir. Kapasite nedeniyle atılan girdiler sunucunun
+    `evicted_keys` sayacından okunur.
+    """
+
+    name = 'redis'
+
+    def __init__(self, client, ttl=DEFAULT_CACHE_TTL, prefix=DEFAULT_KEY_PREFIX):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        if redis is None:
+            raise RuntimeError("CACHE_REDIS_URL ayarlı fakat 'redis' paketi yüklü değil.")
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        self._count(value is not None)
+        return value
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, value, ex=ttl or self.ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def mark(self, key, ttl):
+        self.client.set(self.prefix + 'mark:' + key, b'1', ex=ttl)
+
+    def is_marked(self, *keys):
+        return bool(keys) and self.client.exists(*(self.prefix + 'mark:' + key for key in keys)) > 0
+
+    def versions(self, *tables):
+        epoch_key = self.prefix + 'epoch'
+        values = self.client.mget([epoch_key] + [self.prefix + 'version:' + table for table in tables])
+        if values[0] is None:
+            # Sunucu boşaltıldıysa sayaçlar sıfırlanmıştır; yeni bir epoch eski ETag'leri geçersiz kılar
+            self.client.set(epoch_key, uuid.uuid4().hex, nx=True)
+            values[0] = self.client.get(epoch_key)
+        return tuple(self._decode(value) for value in values)
+
+    @staticmethod
+    def _decode(value):
+        if value is None:
+            return 0
+        return value.decode() if isinstance(value, bytes) else value
+
+    def bump(self, *tables):
+        for table in tables:
+            self.client.incr(self.prefix + 'version:' + table)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self):
+        try:
+            evictions = int(self.client.info('stats').get('evicted_keys', 0))
+        except Exception:
+            evictions = None
+        return {'backend': self.name, 'hits': self.hits, 'misses': self.misses, 'evictions': evictions}
+
+
+class ResponseCache:
+    """Yanıt önbelleği ve tablo sürümleri için uygulama genelindeki giriş noktası.
+
+    `CACHE_REDIS_URL` ayarlıysa Redis arka ucu, değilse süreç içi LRU
+    kullanılır. Önbellek anahtarları ilgili tabloların sürümlerini içerir;
+    yazma işlemleri `invalidate_tables` ile sürümü artırarak eski girdileri
+    erişilemez hale getirir, girdiler TTL dolunca kendiliğinden silinir.
+    """
+
+    def __init__(self):
+        self.backend = MemoryCache()
+        self.write_window = DEFAULT_WRITE_WINDOW
+
+    def init_app(self, app):
+        app.config.setdefault('CACHE_TTL', DEFAULT_CACHE_TTL)
+        app.config.setdefault('CACHE_SIZE', DEFAULT_CACHE_SIZE)
+        app.config.setdefault('READ_YOUR_WRITES_SECONDS', DEFAULT_WRITE_WINDOW)
+        self.write_window = app.config['READ_YOUR_WRITES_SECONDS']
+        url = app.config.get('CACHE_REDIS_URL')
+        if url:
+            self.backend = RedisCache.from_url(url, ttl=app.config['CACHE_TTL'])
+        else:
+            self.backend = MemoryCache(maxsize=app.config['CACHE_SIZE'], ttl=app.config['CACHE_TTL'])
+        app.extensions['response_cache'] = self
+
+    def versions(self, *tables):
+        return self.backend.versions(*tables)
+
+    def invalidate(self, *tables):
+        self.backend.bump(*tables)
+        self.mark_written(*('table:' + table for table in tables))
+
+    def mark_written(self, *keys):
+        """Anahtarları (ör. `user:5`, `table:courses`) yazma penceresi boyunca işaretler."""
+        for key in keys:
+            self.backend.mark(key, self.write_window)
+
+    def written_recently(self, *keys):
+        return self.backend.is_marked(*keys)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        return self.backend.stats()
+
+    def cached(self, *tables, per_user=False):
+        """Başarılı JSON GET yanıtını, dayandığı tabloların sürümüne bağlı olarak önbelleğe alır.
+
+        Yanıt isteği yapan kullanıcının yetkisine göre değişiyorsa
+        `per_user=True` verilir; anahtara kullanıcı ve rol eklenir ve
+        fonksiyonun ilk argümanı `current_user` olmalıdır.
+        """
+        def decorator(f):
+            @wraps(f)
+            def decorated(*args, **kwargs):
+                # Okuma yönlendirmesi bu tablolara yeni yazıldıysa birincil veritabanını seçer
+                g.response_tables = tables
+                parts = [str(self.versions(*tables)), request.full_path]
+                if per_user:
+                    current_user = args[0]
+                    parts.append(f'user={current_user.id}:role={current_user.role_id}')
+                key = 'response:' + hashlib.sha256('|'.join(parts).encode()).hexdigest()
+
+                body = self.backend.get(key)
+                if body is not None:
+                    return current_app.response_class(body, mimetype='application/json')
+
+                response = make_response(f(*args, **kwargs))
+                if response.status_code == 200 and response.is_json and not response.is_streamed:
+                    self.backend.set(key, response.get_data())
+                return response
+            return decorated
+        return decorator
+
+
+response_cache = ResponseCache()
+
+
+class KeyedCache:
+    """Anahtar bazında geçersizleştirilen, yanıt önbelleğinin arka ucunu paylaşan önbellek.
+
+    Redis arka ucunda tüm işçi süreçleri aynı girdileri ve anahtar
+    sürümlerini görür; bir süreçteki `invalidate` diğerlerinin girdilerini de
+    geçersiz kılar. Girdi adı anahtarın o anki sürümünü içerdiği için
+    geçersizleştirmeyle yarışan eski bir hesaplama yeni sürüme yazılamaz.
+    Değerler bayt olarak saklanır.
+    """
+
+    def __init__(self, namespace, ttl=None, cache=response_cache):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, key):
+        """(girdi adı, değer) döndürür; değer yoksa None'dır ve hesaplanan değer `store` ile bu ada yazılır."""
+        version = self.cache.versions(f'{self.namespace}:{key}')
+        entry = f'{self.namespace}:{key}:' + ':'.join(map(str, version))
+        value = self.cache.backend.get(entry)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry, value
+
+    def store(self, entry, value):
+        self.cache.backend.set(entry, value, self.ttl)
+
+    def invalidate(self, *keys):
+        self.cache.backend.bump(*(f'{self.namespace}:{key}' for key in keys))
+
+    def stats(self):
+        return {'backend': self.cache.backend.name, 'hits': self.hits, 'misses': self.misses}
+
+
+def invalidate_tables(*tables):
+    """Yazma işleminden sonra tabloların sürümünü artırır; ilgili önbellek girdileri ve ETag'ler geçersizleşir."""
+    response_cache.invalidate(*tables)
@@ -0,0 +1,39 @@
+from flask import request, make_response, current_app
+from functools import wraps
+from .caching import response_cache
+import hashlib
+
+# Katalog yanıtlarının ters vekil sunucularda (reverse proxy) önbellekte tutulabileceği süre (saniye)
+CATALOG_MAX_AGE = 30
+
+
+def _etag_for(tables):
+    # Sürümler önbellek arka ucundan okunur; Redis kullanılıyorsa tüm işçilerde aynıdır
+    versions = response_cache.versions(*tables)
+    raw = f'{request.full_path}|{versions}'
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def conditional_get(*tables):
+    """GET yanıtına tablo sürümlerinden türetilen güçlü bir ETag ekler.
+
+    ETag; istek yolu, sorgu parametreleri ve yanıtın dayandığı tabloların
+    sürümlerinden hesaplanır. İstemci `If-None-Match` ile aynı ETag'i
+    gönderirse veritabanına hiç gidilmeden 304 döndürülür.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            etag = _etag_for(tables)
+            if request.if_none_match.contains(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.cache_control.public = True
+            response.cache_control.max_age = current_app.config.get('CATALOG_MAX_AGE', CATALOG_MAX_AGE)
+            return response
+        return decorated
+    return decorator
@@ -1,23 +1,35 @@
 from flask import request, jsonify
 from . import api_blueprint
-from models import db, Courses
+from models import db, Courses, Exams, Exam_Results, Course_Registrations, Course_Waitlist
 from .auth import token_required, roles_required
+from .serializers import COURSE, dump_page
+from .filters import list_filters
+from .conditional import conditional_get
+from .caching import response_cache, invalidate_tables
+from .enrollment import set_capacity, recount_enrollments
+from .bulk import chunked
+from .jobs import job_type
+import itertools
+import numpy as np
+
+# Not dağılımı histogramı için 0-100 aralığında eşit genişlikte kutu sayısı
+HISTOGRAM_BINS = 10
+PERCENTILES = [10, 25, 75, 90]
+
+# Ders listesinin (include ile birlikte) dayandığı tablolar
+COURSE_LIST_TABLES = ('courses', 'departments', 'professors', 'exams')
 
 # Tüm dersleri listeleme (Herkes)
 @api_blueprint.route('/courses', methods=['GET'])
+@conditional_get(*COURSE_LIST_TABLES)
+@response_cache.cached(*COURSE_LIST_TABLES)
 def get_all_courses():
-    courses = Courses.query.all()
-    output = []
-    for course in courses:
-        output.append({
-            'id': course.id,
-            'course_code': course.course_code,
-            'course_name': course.course_name,
-            'credits': course.credits,
-            'department_id': course.department_id,
-            'professor_id': course.professor_id
-        })
-    return jsonify({'courses': output})
+    criteria = list_filters(
+        equals={'department_id': Courses.department_id, 'professor_id': Courses.professor_id},
+        prefix={'course_code': Courses.course_code}
+    )
+    courses, next_cursor = dump_page(COURSE, ['department', 'professor', 'exams'], criteria)
+    return jsonify({'courses': courses, 'next_cursor': next_cursor})
 
 # Yeni bir ders oluşturma (Admin ve Professor)
 @api_blueprint.route('/courses', methods=['POST'])
@@ -29,26 +41,193 @@ def create_course(current_user):
     credits = data.get('credits')
     department_id = data.get('department_id')
     professor_id = data.get('professor_id')
+    capacity = data.get('capacity')
 
     if not all([course_code, course_name, credits, department_id]):
         return jsonify({'error': 'Eksik bilgi girişi!!!'}), 400
+    if not _valid_capacity(capacity):
+        return jsonify({'error': 'Kontenjan negatif olmayan bir tam sayı olmalıdır.'}), 400
 
     new_course = Courses(
         course_code=course_code,
         course_name=course_name,
         credits=credits,
         department_id=department_id,
-        professor_id=professor_id
+        professor_id=professor_id,
+        capacity=capacity
     )
 
     try:
         db.session.add(new_course)
         db.session.commit()
+        invalidate_tables('courses')
         return jsonify({'message': 'Ders başarıyla oluşturuldu', 'course_id': new_course.id}), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+def _valid_capacity(capacity):
+    # None sınırsız kontenjan anlamına gelir
+    return capacity is None or (isinstance(capacity, int) and not isinstance(capacity, bool) and capacity >= 0)
+
+# Ders kontenjanını değiştirme; açılan koltuklar bekleme listesinden doldurulur (Admin ve dersin akademisyeni)
+@api_blueprint.route('/courses/<int:course_id>/capacity', methods=['PUT'])
+@roles_required(['Admin', 'Professor'])
+def update_course_capacity(current_user, course_id):
+    course = Courses.query.get_or_404(course_id)
+    if current_user.role_name == 'Professor' and course.professor_id != current_user.professor_id:
+        return jsonify({'message': 'Erişim Reddedildi: Yalnızca kendi derslerinizin kontenjanını değiştirebilirsiniz'}), 403
+
+    data = request.get_json()
+    if 'capacity' not in data or not _valid_capacity(data['capacity']):
+        return jsonify({'error': 'Kontenjan negatif olmayan bir tam sayı olmalıdır.'}), 400
+
+    try:
+        promoted = set_capacity(course, data['capacity'])
+        invalidate_tables('courses', 'course_registrations')
+        return jsonify({'message': 'Kontenjan güncellendi', 'promoted_student_ids': promoted})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# Dersin kontenjan durumu (Herkes)
+@api_blueprint.route('/courses/<int:course_id>/seats', methods=['GET'])
+@token_required
+def get_course_seats(current_user, course_id):
+    row = db.session.execute(
+        db.select(Courses.capacity, Courses.enrolled_count).where(Courses.id == course_id)
+    ).first()
+    if row is None:
+        return jsonify({'error': 'Ders bulunamadı.'}), 404
+    waitlist_length = db.session.scalar(
+        db.select(db.func.count()).select_from(Course_Waitlist).where(Course_Waitlist.course_id == course_id)
+    )
+    return jsonify({
+        'course_id': course_id,
+        'capacity': row.capacity,
+        'enrolled': row.enrolled_count,
+        'available': None if row.capacity is None else max(0, row.capacity - row.enrolled_count),
+        'waitlist_length': waitlist_length
+    })
+
+# Dersin bekleme listesi, sırasıyla (Admin ve dersin akademisyeni)
+@api_blueprint.route('/courses/<int:course_id>/waitlist', methods=['GET'])
+@roles_required(['Admin', 'Professor'])
+def get_course_waitlist(current_user, course_id):
+    course = Courses.query.get_or_404(course_id)
+    if current_user.role_name == 'Professor' and course.professor_id != current_user.professor_id:
+        return jsonify({'message': 'Erişim Reddedildi: Yalnızca kendi derslerinizin bekleme listesini görüntüleyebilirsiniz'}), 403
+
+    rows = db.session.execute(
+        db.select(Course_Waitlist.student_id, Course_Waitlist.created_at)
+        .where(Course_Waitlist.course_id == course_id)
+        .order_by(Course_Waitlist.id)
+    ).all()
+    return jsonify({'course_id': course_id, 'waitlist': [
+        {'position': position, 'student_id': row.student_id, 'created_at': row.created_at}
+        for position, row in enumerate(rows, start=1)
+    ]})
+
+@job_type('recount_enrollments', concurrency=1, roles=('Admin',))
+def recount_enrollments_job(ctx, params):
+    """Tüm derslerin kayıt sayacını parça parça yeniden hesaplar (sayaç onarımı)."""
+    course_ids = db.session.scalars(db.select(Courses.id).order_by(Courses.id)).all()
+    corrected, done = [], 0
+    for chunk in chunked(course_ids):
+        corrected += recount_enrollments(chunk)
+        done += len(chunk)
+        ctx.progress(done, len(course_ids))
+    if corrected:
+        invalidate_tables('courses')
+    return {'courses': len(course_ids), 'corrected_course_ids': corrected}
+
+def _nan_to_none(values):
+    """NumPy dizisini NaN değerleri None olacak şekilde listeye çevirir."""
+    values = np.round(values, 2)
+    return np.where(np.isnan(values), None, values).tolist()
+
+# Dersin not defteri: öğrenci x sınav matrisi ve sınav istatistikleri (Admin ve dersin akademisyeni)
+@api_blueprint.route('/courses/<int:course_id>/gradebook', methods=['GET'])
+@roles_required(['Admin', 'Professor'])
+def get_course_gradebook(current_user, course_id):
+    course = Courses.query.get_or_404(course_id)
+    if current_user.role_name == 'Professor' and course.professor_id != current_user.professor_id:
+        return jsonify({'message': 'Erişim Reddedildi: Yalnızca kendi derslerinizin notlarını görüntüleyebilirsiniz'}), 403
+
+    exams = db.session.execute(
+        db.select(Exams.id, Exams.exam_type, Exams.exam_date)
+        .where(Exams.course_id == course_id)
+        .order_by(Exams.exam_date, Exams.id)
+    ).all()
+    registered = np.fromiter(
+        db.session.scalars(db.select(Course_Registrations.student_id).where(Course_Registrations.course_id == course_id)),
+        dtype=np.int64
+    )
+    # Sonuçlar ORM katmanı atlanarak doğrudan düz bir float dizisine okunur
+    results = db.session.connection().execute(
+        db.select(Exam_Results.student_id, Exam_Results.exam_id, Exam_Results.grade)
+        .join(Exams, Exams.id == Exam_Results.exam_id)
+        .where(Exams.course_id == course_id)
+    )
+    data = np.fromiter(itertools.chain.from_iterable(results), dtype=np.float64).reshape(-1, 3)
+
+    # Matris indeksleri vektörel hesaplanır
+    result_students = data[:, 0].astype(np.int64)
+    result_exams = data[:, 1].astype(np.int64)
+    grades = data[:, 2]
+
+    exam_ids = np.array([exam.id for exam in exams], dtype=np.int64)
+    exam_order = np.argsort(exam_ids)
+    student_ids = np.union1d(registered, result_students)
+
+    matrix = np.full((len(student_ids), len(exam_ids)), np.nan)
+    rows = np.searchsorted(student_ids, result_students)
+    columns = exam_order[np.searchsorted(exam_ids[exam_order], result_exams)]
+    matrix[rows, columns] = grades
+
+    graded = ~np.isnan(matrix)
+    counts = graded.sum(axis=0)
+    has_grades = counts > 0
+    means = np.full(len(exam_ids), np.nan)
+    medians = np.full(len(exam_ids), np.nan)
+    stddevs = np.full(len(exam_ids), np.nan)
+    percentiles = np.full((len(PERCENTILES), len(exam_ids)), np.nan)
+    if has_grades.any():
+        graded_columns = matrix[:, has_grades]
+        means[has_grades] = np.nanmean(graded_columns, axis=0)
+        medians[has_grades] = np.nanmedian(graded_columns, axis=0)
+        stddevs[has_grades] = np.nanstd(graded_columns, axis=0)
+        percentiles[:, has_grades] = np.nanpercentile(graded_columns, PERCENTILES, axis=0)
+
+    # Her sınav için kutu indeksi hesaplanıp tek bincount ile histogram çıkarılır
+    bin_index = np.clip((grades / (100 / HISTOGRAM_BINS)).astype(np.int64), 0, HISTOGRAM_BINS - 1)
+    histograms = np.bincount(
+        columns * HISTOGRAM_BINS + bin_index, minlength=len(exam_ids) * HISTOGRAM_BINS
+    ).reshape(len(exam_ids), HISTOGRAM_BINS)
+    bin_edges = np.linspace(0, 100, HISTOGRAM_BINS + 1).tolist()
+
+    summary = []
+    for index, exam in enumerate(exams):
+        summary.append({
+            'exam_id': exam.id,
+            'exam_type': exam.exam_type,
+            'exam_date': exam.exam_date,
+            'count': int(counts[index]),
+            'mean': _nan_to_none(means[index:index + 1])[0],
+            'median': _nan_to_none(medians[index:index + 1])[0],
+            'stddev': _nan_to_none(stddevs[index:index + 1])[0],
+            'percentiles': dict(zip(map(str, PERCENTILES), _nan_to_none(percentiles[:, index]))),
+            'histogram': {'bin_edges': bin_edges, 'counts': histograms[index].tolist()}
+        })
+
+    return jsonify({
+        'course_id': course.id,
+        'exam_ids': exam_ids.tolist(),
+        'student_ids': student_ids.tolist(),
+        'grades': _nan_to_none(matrix),
+        'exams': summary
+    })
+
 # Ders silme (Sadece Admin)
 @api_blueprint.route('/courses/<int:course_id>', methods=['DELETE'])
 @roles_required(['Admin'])
@@ -57,6 +236,7 @@ def delete_course(current_user, course_id):
     try:
         db.session.delete(course)
         db.session.commit()
+        invalidate_tables('courses')
         return jsonify({'message': 'Ders başarıyla kaldırıldı'})
     except Exception as e:
         db.session.rollback()
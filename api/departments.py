@@ -2,15 +2,20 @@ from flask import request, jsonify
 from . import api_blueprint
 from models import db, Departments
 from .auth import token_required, roles_required
+from .serializers import DEPARTMENT, dump_page
+from .conditional import conditional_get
+from .caching import response_cache, invalidate_tables
+
+# Bölüm listesinin (include ile birlikte) dayandığı tablolar
+DEPARTMENT_LIST_TABLES = ('departments', 'courses', 'professors')
 
 # Tüm bölümleri listeleme (Herkes)
 @api_blueprint.route('/departments', methods=['GET'])
+@conditional_get(*DEPARTMENT_LIST_TABLES)
+@response_cache.cached(*DEPARTMENT_LIST_TABLES)
 def get_all_departments():
-    departments = Departments.query.all()
-    output = []
-    for department in departments:
-        output.append({'id': department.id, 'department_name': department.department_name})
-    return jsonify({'departments': output})
+    departments, next_cursor = dump_page(DEPARTMENT, ['courses', 'professors'])
+    return jsonify({'departments': departments, 'next_cursor': next_cursor})
 
 # Yeni bir bölüm oluşturma (Sadece Admin)
 @api_blueprint.route('/departments', methods=['POST'])
@@ -25,6 +30,7 @@ def create_department(current_user):
     try:
         db.session.add(new_department)
         db.session.commit()
+        invalidate_tables('departments')
         return jsonify({'message': 'Bölüm başarıyla oluşturuldu.', 'department_id': new_department.id}), 201
     except Exception as e:
         db.session.rollback()
@@ -38,6 +44,7 @@ def delete_department(current_user, department_id):
     try:
         db.session.delete(department)
         db.session.commit()
+        invalidate_tables('departments')
         return jsonify({'message': 'Bölüm başarıyla silindi.'})
     except Exception as e:
         db.session.rollback()
@@ -0,0 +1,253 @@
+from models import db, Courses, Course_Registrations, Course_Waitlist
+from .bulk import dialect_insert, chunked
+
+# Kayıt denemesinin sonucu
+REGISTERED = 'registered'
+WAITLISTED = 'waitlisted'
+ALREADY_REGISTERED = 'already_registered'
+ALREADY_WAITLISTED = 'already_waitlisted'
+
+# Kontenjan kuralları:
+# - Courses.enrolled_count yalnızca bu modüldeki koşullu UPDATE'lerle değişir; istek
+#   başına count(*) yapılmaz. Sayaç ile kayıt satırı aynı işlemde yazılır.
+# - Ders satırının kilidi (UPDATE veya FOR UPDATE) her zaman bekleme listesi
+#   satırlarından önce alınır; böylece eşzamanlı işlemler kilitlenmez (deadlock).
+# - Bu modüldeki fonksiyonlar işlemi kendileri commit eder.
+
+
+def _take_seats(session, course_id, count=1):
+    """Kontenjan yetiyorsa sayacı tek bir koşullu UPDATE ile artırır; başarılıysa True döner."""
+    result = session.execute(
+        db.update(Courses)
+        .where(Courses.id == course_id,
+               db.or_(Courses.capacity.is_(None), Courses.enrolled_count + count <= Courses.capacity))
+        .values(enrolled_count=Courses.enrolled_count + count)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def _release_seats(session, course_id, count=1):
+    # Sayaca hiç yansımamış (ör. bu modül dışından eklenmiş) bir kayıt silinirse sayaç eksiye düşmez;
+    # eksi sayaç _take_seats'in kontenjanı aşmasına izin verirdi
+    session.execute(
+        db.update(Courses)
+        .where(Courses.id == course_id, Courses.enrolled_count >= count)
+        .values(enrolled_count=Courses.enrolled_count - count)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _fill_from_waitlist(session, course_id):
+    """Boş koltukları bekleme listesinin başındaki öğrencilere sırayla verir."""
+    promoted = []
+    while _take_seats(session, course_id):
+        head = session.execute(
+            db.select(Course_Waitlist.id, Course_Waitlist.student_id)
+            .where(Course_Waitlist.course_id == course_id)
+            .order_by(Course_Waitlist.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+        if head is None:
+            _release_seats(session, course_id)
+            break
+        session.execute(db.delete(Course_Waitlist).where(Course_Waitlist.id == head.id))
+        session.execute(db.insert(Course_Registrations).values(student_id=head.student_id, course_id=course_id))
+        promoted.append(head.student_id)
+    return promoted
+
+
+def waitlist_position(course_id, student_id, session=None):
+    """Öğrencinin bekleme listesindeki sırasını (1'den başlar) döndürür; listede değilse None."""
+    session = session or db.session
+    entry_id = session.scalar(db.select(Course_Waitlist.id).where(
+        Course_Waitlist.course_id == course_id, Course_Waitlist.student_id == student_id))
+    if entry_id is None:
+        return None
+    return session.scalar(db.select(db.func.count()).select_from(Course_Waitlist).where(
+        Course_Waitlist.course_id == course_id, Course_Waitlist.id <= entry_id))
+
+
+def enroll(student_id, course_id, session=None):
+    """Öğrenciyi derse kaydeder; kontenjan doluysa bekleme listesine ekler.
+
+    Kayıt satırı önce eklenir (tekrar kayıt benzersiz kısıtla yakalanır),
+    koltuk ardından koşullu UPDATE ile alınır. Ders satırı kilidi yalnızca
+    bu UPDATE'ten commit'e kadar tutulduğu için popüler bir derse gelen
+    eşzamanlı istekler kısa sürelerle sıraya girer. (durum, bekleme sırası) döndürür.
+    """
+    session = session or db.session
+    inserted = session.scalar(
+        dialect_insert(Course_Registrations, session)
+        .values(student_id=student_id, course_id=course_id)
+        .on_conflict_do_nothing(index_elements=['student_id', 'course_id'])
+        .returning(Course_Registrations.id)
+    )
+    if inserted is None:
+        session.rollback()
+        return ALREADY_REGISTERED, None
+
+    if _take_seats(session, course_id):
+        session.execute(db.delete(Course_Waitlist).where(
+            Course_Waitlist.course_id == course_id, Course_Waitlist.student_id == student_id))
+        session.commit()
+        return REGISTERED, None
+
+    # Kontenjan dolu: eklenen kayıt geri alınır ve öğrenci bekleme listesine yazılır. Ders satırı
+    # bekleme listesinden önce kilitlenir; rollback ile kilit arasında boşalan bir koltuk
+    # (boş listeyi görüp geri verilen) aynı işlemde bekleyenlere dağıtılır, kimse listede unutulmaz.
+    session.rollback()
+    session.execute(db.select(Courses.id).where(Courses.id == course_id).with_for_update())
+    entry = session.scalar(
+        dialect_insert(Course_Waitlist, session)
+        .values(student_id=student_id, course_id=course_id)
+        .on_conflict_do_nothing(index_elements=['student_id', 'course_id'])
+        .returning(Course_Waitlist.id)
+    )
+    promoted = _fill_from_waitlist(session, course_id)
+    session.commit()
+    if student_id in promoted:
+        return REGISTERED, None
+    return (WAITLISTED if entry is not None else ALREADY_WAITLISTED), waitlist_position(course_id, student_id, session)
+
+
+def enroll_many(pairs, session=None):
+    """(öğrenci, ders) çiftlerini kontenjana göre toplu kaydeder.
+
+    Ders satırları id sırasıyla tek sorguda kilitlenir, boş koltuk sayısı
+    kadar kayıt eklenir, kalanlar bekleme listesine alınır. Her çift için
+    durumu içeren bir sözlük döndürür.
+    """
+    session = session or db.session
+    by_course = {}
+    for student_id, course_id in pairs:
+        by_course.setdefault(course_id, []).append(student_id)
+    statuses = {}
+    if not by_course:
+        return statuses
+
+    courses = session.execute(
+        db.select(Courses.id, Courses.capacity, Courses.enrolled_count)
+        .where(Courses.id.in_(by_course))
+        .order_by(Courses.id)
+        .with_for_update()
+    ).all()
+    existing = set(session.execute(
+        db.select(Course_Registrations.student_id, Course_Registrations.course_id)
+        .where(Course_Registrations.course_id.in_(by_course),
+               Course_Registrations.student_id.in_({student_id for student_id, _ in pairs}))
+    ).all())
+
+    to_register, to_waitlist = [], []
+    for course_id, capacity, enrolled in courses:
+        candidates = []
+        for student_id in by_course[course_id]:
+            if (student_id, course_id) in existing:
+                statuses[(student_id, course_id)] = ALREADY_REGISTERED
+            else:
+                candidates.append(student_id)
+        free = len(candidates) if capacity is None else max(0, capacity - enrolled)
+        to_register += [{'student_id': s, 'course_id': course_id} for s in candidates[:free]]
+        to_waitlist += [{'student_id': s, 'course_id': course_id} for s in candidates[free:]]
+
+    registered = set()
+    if to_register:
+        for chunk in chunked(to_register):
+            registered.update(tuple(row) for row in session.execute(
+                dialect_insert(Course_Registrations, session).values(chunk)
+                .on_conflict_do_nothing(index_elements=['student_id', 'course_id'])
+                .returning(Course_Registrations.student_id, Course_Registrations.course_id)
+            ))
+        taken = {}
+        for row in to_register:
+            pair = (row['student_id'], row['course_id'])
+            if pair in registered:
+                statuses[pair] = REGISTERED
+                taken[pair[1]] = taken.get(pair[1], 0) + 1
+            else:
+                # Başka bir istek aynı anda kaydetmiş
+                statuses[pair] = ALREADY_REGISTERED
+        if taken:
+            # Ders satırları kilitli ve boş koltuklar hesaplandı; tüm sayaçlar tek UPDATE ile artırılır
+            session.execute(
+                db.update(Courses).where(Courses.id.in_(taken))
+                .values(enrolled_count=Courses.enrolled_count + db.case(taken, value=Courses.id))
+                .execution_options(synchronize_session=False)
+            )
+        for chunk in chunked(registered):
+            session.execute(db.delete(Course_Waitlist).where(
+                db.tuple_(Course_Waitlist.student_id, Course_Waitlist.course_id).in_(chunk)
+            ))
+
+    if to_waitlist:
+        waitlisted = set()
+        for chunk in chunked(to_waitlist):
+            waitlisted.update(tuple(row) for row in session.execute(
+                dialect_insert(Course_Waitlist, session).values(chunk)
+                .on_conflict_do_nothing(index_elements=['student_id', 'course_id'])
+                .returning(Course_Waitlist.student_id, Course_Waitlist.course_id)
+            ))
+        for row in to_waitlist:
+            pair = (row['student_id'], row['course_id'])
+            statuses[pair] = WAITLISTED if pair in waitlisted else ALREADY_WAITLISTED
+        # Yarışta kullanılmayan koltuklar varsa bekleyenlere verilir
+        if len(registered) < len(to_register):
+            for course_id in {row['course_id'] for row in to_waitlist}:
+                for student_id in _fill_from_waitlist(session, course_id):
+                    if statuses.get((student_id, course_id)) == WAITLISTED:
+                        statuses[(student_id, course_id)] = REGISTERED
+
+    session.commit()
+    return statuses
+
+
+def drop_registration(registration, session=None):
+    """Kaydı siler, koltuğu bekleme listesinin başındakine verir; terfi eden öğrencileri döndürür."""
+    session = session or db.session
+    course_id = registration.course_id
+    session.delete(registration)
+    _release_seats(session, course_id)
+    promoted = _fill_from_waitlist(session, course_id)
+    session.commit()
+    return promoted
+
+
+def set_capacity(course, capacity, session=None):
+    """Kontenjanı değiştirir; açılan koltuklar bekleme listesinden doldurulur."""
+    session = session or db.session
+    session.execute(
+        db.update(Courses).where(Courses.id == course.id).values(capacity=capacity)
+        .execution_options(synchronize_session=False)
+    )
+    promoted = _fill_from_waitlist(session, course.id)
+    session.commit()
+    return promoted
+
+
+def recount_enrollments(course_ids, session=None):
+    """Derslerin kayıt sayacını kayıt tablosundan yeniden hesaplar; düzeltilen ders id'lerini döndürür.
+
+    Ders satırları önce id sırasıyla kilitlenir, sayım kilit alındıktan sonra
+    yapılır; böylece aynı anda yapılan kayıtlar sayaca iki kez yansımaz
+    ya da kaybolmaz.
+    """
+    session = session or db.session
+    session.execute(db.select(Courses.id).where(Courses.id.in_(course_ids)).order_by(Courses.id).with_for_update())
+    counts = db.select(Course_Registrations.course_id, db.func.count().label('registered')) \
+        .where(Course_Registrations.course_id.in_(course_ids)) \
+        .group_by(Course_Registrations.course_id).subquery()
+    rows = session.execute(
+        db.select(Courses.id, Courses.enrolled_count, db.func.coalesce(counts.c.registered, 0))
+        .outerjoin(counts, counts.c.course_id == Courses.id)
+        .where(Courses.id.in_(course_ids))
+    ).all()
+    corrected = {course_id: registered for course_id, enrolled, registered in rows if enrolled != registered}
+    if corrected:
+        session.execute(
+            db.update(Courses).where(Courses.id.in_(corrected))
+            .values(enrolled_count=db.case(corrected, value=Courses.id))
+            .execution_options(synchronize_session=False)
+        )
+    session.commit()
+    return sorted(corrected)
@@ -0,0 +1,187 @@
+from flask import request, jsonify, current_app, stream_with_context
+from . import api_blueprint
+from models import db, Announcements, Exam_Results
+from .auth import token_required, query_token_required, stream_token, DEFAULT_STREAM_TOKEN_SECONDS
+from .announcements import feed_courses_query
+from .pubsub import event_hub
+from .serializers import ANNOUNCEMENT_SUMMARY, EXAM_RESULT, dumps
+import time
+
+# Olay türleri: duyuru özeti ve yeni girilen sınav notu
+ANNOUNCEMENT = 'announcement'
+GRADE = 'grade'
+
+# Bağlantı boştayken ara sunucular kapatmasın diye gönderilen yorum satırı aralığı (saniye)
+DEFAULT_HEARTBEAT_SECONDS = 15
+# Kayıtlı derslerin (kime hangi duyurunun gideceği) yeniden okunma aralığı (saniye)
+DEFAULT_AUDIENCE_REFRESH_SECONDS = 60
+# Yeniden bağlanmada veritabanından tekrar gönderilecek en fazla olay; fazlası için `reset` gönderilir
+DEFAULT_REPLAY_LIMIT = 500
+# İstemcinin bağlantı koptuğunda yeniden denemeden önce bekleyeceği süre (ms)
+RETRY_MS = 3000
+
+SSE_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+
+class Audience:
+    """Bir kullanıcının hangi olayları alacağı.
+
+    Duyurular `/me/announcements` akışıyla aynı kurala göre süzülür (genel
+    duyurular ve kullanıcının dersleri); notları yalnızca notun sahibi olan
+    öğrenci alır.
+    """
+
+    def __init__(self, current_user, course_ids=()):
+        self.student_id = current_user.student_id
+        self.course_ids = set(course_ids)
+        self.loaded_at = time.monotonic()
+
+    def stale(self, max_age):
+        """Ders listesi `max_age` saniyeden eskiyse True; akış her olayda kontrol eder."""
+        return time.monotonic() - self.loaded_at > max_age
+
+    def wants(self, kind, data):
+        if kind == ANNOUNCEMENT:
+            return data['course_id'] is None or data['course_id'] in self.course_ids
+        if kind == GRADE:
+            return self.student_id is not None and data['student_id'] == self.student_id
+        return False
+
+    def replay_queries(self, cursor, limit):
+        """Last-Event-ID'den sonra kaçırılan olayları (tür, sorgu) olarak döndürür."""
+        announcement_id, grade_id = cursor
+        queries = [(ANNOUNCEMENT, ANNOUNCEMENT_SUMMARY.select().where(
+            Announcements.id > announcement_id,
+            db.or_(Announcements.course_id.is_(None), Announcements.course_id.in_(self.course_ids))
+        ).order_by(Announcements.id).limit(limit))]
+        if self.student_id is not None:
+            queries.append((GRADE, EXAM_RESULT.select().where(
+                Exam_Results.student_id == self.student_id, Exam_Results.id > grade_id
+            ).order_by(Exam_Results.id).limit(limit)))
+        return queries
+
+
+def head_query():
+    """En son duyuru ve sınav sonucu id'leri; yeni bağlanan istemcinin başlangıç imleci."""
+    return db.select(
+        db.select(db.func.coalesce(db.func.max(Announcements.id), 0)).scalar_subquery(),
+        db.select(db.func.coalesce(db.func.max(Exam_Results.id), 0)).scalar_subquery(),
+    )
+
+
+def parse_event_id(value):
+    """`<duyuru id>-<not id>` biçimindeki Last-Event-ID değerini çözer; geçersizse None."""
+    try:
+        announcement_id, grade_id = value.split('-')
+        return int(announcement_id), int(grade_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+class EventStream:
+    """Tek bir SSE bağlantısının durumu; senkron ve asyncio sunucularında ortak kullanılır.
+
+    İmleç (son duyuru id, son not id) her olayın `id` alanında gönderilir.
+    Abonelik veritabanı okunmadan önce açılır; böylece okuma ile abonelik
+    arasında yayınlanan olay kaçmaz, iki kez gelen olaylar `floor` ile elenir.
+    """
+
+    def __init__(self, audience, head, cursor=None):
+        self.audience = audience
+        self.head = head
+        self.cursor = cursor or head
+        self.floor = head
+
+    def open(self):
+        return f'retry: {RETRY_MS}\n\n'
+
+    def replayed(self, kind, rows, limit):
+        """Veritabanından okunan kaçırılmış olayları SSE metnine çevirir."""
+        chunks = [self.format(kind, row._asdict()) for row in rows]
+        if len(rows) >= limit:
+            # Kaçırılan olay sayısı sınırı aşıyor; istemci listeleri baştan almalı
+            self.cursor = self.head
+            chunks.append(f'id: {self.event_id()}\nevent: reset\ndata: {{}}\n\n')
+        # Tekrar gönderilenler canlı olarak bir daha gönderilmez
+        self.floor = tuple(map(max, self.floor, self.cursor))
+        return chunks
+
+    def live(self, event):
+        """Yayınlanan olayı kullanıcıya gidecekse SSE metnine çevirir, gitmeyecekse None döndürür."""
+        kind, data = event['type'], event['data']
+        index = 0 if kind == ANNOUNCEMENT else 1
+        if data['id'] <= self.floor[index] or not self.audience.wants(kind, data):
+            return None
+        return self.format(kind, data)
+
+    def format(self, kind, data):
+        index = 0 if kind == ANNOUNCEMENT else 1
+        cursor = list(self.cursor)
+        cursor[index] = max(cursor[index], data['id'])
+        self.cursor = tuple(cursor)
+        return f'id: {self.event_id()}\nevent: {kind}\ndata: {dumps(data).decode()}\n\n'
+
+    def event_id(self):
+        return '-'.join(map(str, self.cursor))
+
+    @staticmethod
+    def heartbeat():
+        return ': keep-alive\n\n'
+
+
+def _load_audience(current_user):
+    query = feed_courses_query(current_user)
+    return Audience(current_user, db.session.scalars(query).all() if query is not None else ())
+
+
+# Olay akışına `?access_token=` ile bağlanmak için kısa ömürlü token (Giriş yapmış herkes)
+@api_blueprint.route('/events/token', methods=['POST'])
+@token_required
+def create_stream_token(current_user):
+    seconds = current_app.config.get('EVENTS_TOKEN_SECONDS', DEFAULT_STREAM_TOKEN_SECONDS)
+    token = stream_token(current_user.id, current_user.role_id, current_app.config['SECRET_KEY'], seconds)
+    return jsonify({'token': token, 'expires_in': seconds}), 200
+
+# Yeni duyuru ve notların anlık akışı, Server-Sent Events (Giriş yapmış herkes)
+@api_blueprint.route('/events', methods=['GET'])
+@query_token_required
+def stream_events(current_user):
+    config = current_app.config
+    heartbeat = config.get('EVENTS_HEARTBEAT_SECONDS', DEFAULT_HEARTBEAT_SECONDS)
+    refresh = config.get('EVENTS_AUDIENCE_REFRESH_SECONDS', DEFAULT_AUDIENCE_REFRESH_SECONDS)
+    limit = config.get('EVENTS_REPLAY_LIMIT', DEFAULT_REPLAY_LIMIT)
+    cursor = parse_event_id(request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+
+    subscription = event_hub.subscribe()
+    try:
+        audience = _load_audience(current_user)
+        stream = EventStream(audience, tuple(db.session.execute(head_query()).one()), cursor)
+        backlog = []
+        if cursor is not None:
+            for kind, query in audience.replay_queries(cursor, limit):
+                backlog += stream.replayed(kind, db.session.execute(query).all(), limit)
+        # Akış boyunca bağlantı havuzdan bir bağlantı tutulmaz
+        db.session.remove()
+    except Exception:
+        subscription.close()
+        raise
+
+    def generate():
+        with subscription:
+            yield stream.open()
+            yield from backlog
+            while not subscription.dropped:
+                event = subscription.get(timeout=heartbeat)
+                # Sürekli olay gelen akışta da yenilenmesi için boşta olmayı beklemeden kontrol edilir
+                if stream.audience.stale(refresh):
+                    stream.audience = _load_audience(current_user)
+                    db.session.remove()
+                if event is None:
+                    yield stream.heartbeat()
+                    continue
+                chunk = stream.live(event)
+                if chunk is not None:
+                    yield chunk
+
+    return current_app.response_class(stream_with_context(generate()), mimetype='text/event-stream',
+                                      headers=SSE_HEADERS)
@@ -1,7 +1,15 @@
 from flask import request, jsonify
 from . import api_blueprint
-from models import db, Exams, Exam_Results, Courses, Students
+from models import db, Exams, Exam_Results, Courses, Students, Course_Registrations
 from .auth import token_required, roles_required
+from .serializers import EXAM_RESULT, STUDENT_EXAM_RESULT, dump_page
+from .export import wants_ndjson, ndjson_response
+from .bulk import read_bulk_rows, dialect_insert, chunked
+from .caching import invalidate_tables
+from .students import invalidate_transcript
+from .pubsub import publish_event
+from .jobs import job_type, wants_async, job_accepted, job_queue, JobError
+import time
 
 # Yeni bir sınav oluşturma (Admin ve Professor)
 @api_blueprint.route('/exams', methods=['POST'])
@@ -28,6 +36,7 @@ def create_exam(current_user):
     try:
         db.session.add(new_exam)
         db.session.commit()
+        invalidate_tables('exams')
         return jsonify({'message': 'Sınav başarıyla oluşturuldu.', 'exam_id': new_exam.id}), 201
     except Exception as e:
         db.session.rollback()
@@ -65,26 +74,153 @@ def add_exam_result(current_user):
     try:
         db.session.add(new_result)
         db.session.commit()
+        invalidate_transcript(int(student_id))
+        invalidate_tables('exam_results')
+        publish_event('grade', EXAM_RESULT.dump(new_result))
         return jsonify({'message': 'Sınav sonucu baraşıyla kaydedildi.'}), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+def import_exam_results(exam_id, rows, replace=False):
+    """Bir sınavın not satırlarını doğrulayıp yazar; (özet, satır sonuçları) döndürür.
+
+    `replace` ile mevcut notlar güncellenir, aksi halde olduğu gibi bırakılır.
+    """
+    results = [None] * len(rows)
+    grades = {}
+    for index, row in enumerate(rows):
+        try:
+            student_id = int(row.get('student_id'))
+            grade = float(row.get('grade'))
+        except (TypeError, ValueError):
+            results[index] = {'row': index, 'status': 'invalid', 'error': 'Öğrenci numarası veya not geçersiz.'}
+            continue
+        if not 0 <= grade <= 100:
+            results[index] = {'row': index, 'student_id': student_id, 'status': 'invalid', 'error': 'Not 0 ile 100 arasında olmalıdır.'}
+            continue
+        if student_id in grades:
+            results[index] = {'row': index, 'student_id': student_id, 'status': 'duplicate'}
+            continue
+        grades[student_id] = (index, grade)
+
+    # Dersin kayıtlı öğrencileri ve mevcut notlar, parça başına tek sorguyla
+    registered = set()
+    graded = set()
+    for chunk in chunked(grades):
+        registered.update(db.session.scalars(
+            db.select(Course_Registrations.student_id)
+            .join(Exams, Exams.course_id == Course_Registrations.course_id)
+            .where(Exams.id == exam_id, Course_Registrations.student_id.in_(chunk))
+        ))
+        graded.update(db.session.scalars(
+            db.select(Exam_Results.student_id)
+            .where(Exam_Results.exam_id == exam_id, Exam_Results.student_id.in_(chunk))
+        ))
+
+    to_write = []
+    for student_id, (index, grade) in grades.items():
+        result = {'row': index, 'student_id': student_id, 'grade': grade}
+        if student_id not in registered:
+            result['status'] = 'not_registered'
+        elif student_id in graded:
+            result['status'] = 'updated' if replace else 'already_graded'
+        else:
+            result['status'] = 'created'
+        if result['status'] in ('created', 'updated'):
+            to_write.append({'student_id': student_id, 'exam_id': exam_id, 'grade': grade})
+        results[index] = result
+
+    written = []
+    for chunk in chunked(to_write):
+        stmt = dialect_insert(Exam_Results).values(chunk)
+        if replace:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['student_id', 'exam_id'],
+                set_={'grade': stmt.excluded.grade}
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=['student_id', 'exam_id'])
+        written += db.session.execute(stmt.returning(*EXAM_RESULT.columns)).all()
+    db.session.commit()
+    invalidate_transcript(*(row['student_id'] for row in to_write))
+    invalidate_tables('exam_results')
+
+    # Yalnızca yeni girilen notlar bildirilir; güncellenen notların id'si değişmez
+    created = {result['student_id'] for result in results if result['status'] == 'created'}
+    for row in EXAM_RESULT.dump_rows(written):
+        if row['student_id'] in created:
+            publish_event('grade', row)
+
+    summary = {}
+    for result in results:
+        summary[result['status']] = summary.get(result['status'], 0) + 1
+    return summary, results
+
+def _validate_exam_import(params):
+    if not isinstance(params.get('exam_id'), int):
+        raise JobError('exam_id bir tam sayı olmalıdır.')
+    rows = params.get('rows')
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise JobError('rows bir nesne dizisi olmalıdır.')
+
+@job_type('exam_results_import', concurrency=1, validate=_validate_exam_import)
+def exam_results_import_job(ctx, params):
+    _validate_exam_import(params)
+    if db.session.get(Exams, params['exam_id']) is None:
+        raise JobError(f"{params['exam_id']} numaralı sınav bulunamadı.")
+    summary, results = import_exam_results(params['exam_id'], params['rows'], params.get('replace', False))
+    return {'summary': summary, 'results': results}
+
+# Bir sınavın notlarını toplu girme; ?async=1 ile arka plan görevi olarak (Admin ve Professor)
+@api_blueprint.route('/exams/<int:exam_id>/results/bulk', methods=['POST'])
+@roles_required(['Admin', 'Professor'])
+def bulk_add_exam_results(current_user, exam_id):
+    started = time.perf_counter()
+    exam = db.session.get(Exams, exam_id)
+    if not exam:
+        return jsonify({'error': f'{exam_id} numaralı sınav bulunamadı.'}), 404
+
+    replace = request.args.get('replace', '').lower() in ('1', 'true', 'yes')
+    rows = read_bulk_rows('results')
+    if wants_async():
+        params = {'exam_id': exam_id, 'rows': rows, 'replace': replace}
+        return job_accepted(job_queue.submit('exam_results_import', params, current_user.id))
+
+    try:
+        summary, results = import_exam_results(exam_id, rows, replace)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+    elapsed = time.perf_counter() - started
+    return jsonify({
+        'summary': summary,
+        'elapsed_ms': round(elapsed * 1000, 2),
+        'rows_per_second': round(len(rows) / elapsed, 1) if elapsed else None,
+        'results': results
+    }), 200
+
 # Bir öğrencinin tüm sınav sonuçlarını getirme (Admin, Professor ve Öğrenci)
 @api_blueprint.route('/exam_results/student/<int:student_id>', methods=['GET'])
 @token_required
 def get_student_results(current_user, student_id):
-    if current_user.role.role_name == 'Student' and student_id != current_user.student.id:
+    if current_user.role_name == 'Student' and student_id != current_user.student_id:
         return jsonify({'message': 'Erişim Reddedildi: Sadece kendi sınav sonuçlarınızı görebilirsiniz.'}), 403
 
-    results = Exam_Results.query.filter_by(student_id=student_id).all()
-    if not results:
+    rows = db.session.execute(
+        STUDENT_EXAM_RESULT.select().where(Exam_Results.student_id == student_id)
+    ).all()
+    if not rows:
         return jsonify({'message': 'Bu öğrenci için sınav sonucu bulunamadı.'}), 404
+    return jsonify({'exam_results': STUDENT_EXAM_RESULT.dump_rows(rows)})
 
-    output = []
-    for result in results:
-        output.append({
-            'exam_id': result.exam_id,
-            'grade': result.grade
-        })
-    return jsonify({'exam_results': output})
\ No newline at end of file
+# Tüm sınav sonuçlarını listeleme (Admin ve Professor)
+@api_blueprint.route('/exam_results', methods=['GET'])
+@roles_required(['Admin', 'Professor'])
+def get_all_exam_results(current_user):
+    if wants_ndjson():
+        return ndjson_response(EXAM_RESULT)
+
+    results, next_cursor = dump_page(EXAM_RESULT, ['student', 'exam'])
+    return jsonify({'exam_results': results, 'next_cursor': next_cursor})
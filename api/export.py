@@ -0,0 +1,78 @@
+from flask import request, Response, stream_with_context, current_app
+from models import db
+from .serializers import STUDENT, REGISTRATION, EXAM_RESULT, ANNOUNCEMENT, dumps
+from .jobs import job_type, JobError
+
+# Sunucu tarafı imleçten her seferinde çekilecek satır sayısı
+EXPORT_BATCH_SIZE = 1000
+
+# Arka planda (export görevi) tamamı dışa aktarılabilen kaynaklar
+EXPORTS = {
+    'students': STUDENT,
+    'registrations': REGISTRATION,
+    'exam_results': EXAM_RESULT,
+    'announcements': ANNOUNCEMENT,
+}
+
+
+def wants_ndjson():
+    """İstemci `?format=ndjson` ile akış halinde dışa aktarım istiyor mu?"""
+    return request.args.get('format') == 'ndjson'
+
+
+def ndjson_response(schema, where=()):
+    """Şemadaki kolonları satır satır NDJSON olarak akıtan bir yanıt döndürür.
+
+    Sorgu ORM nesnesi oluşturmadan yalnızca şemanın kolonlarını seçer ve `yield_per` ile
+    sunucu tarafı imleçten parça parça okunur; bellek kullanımı tablo
+    boyutundan bağımsız kalır. `where` ile liste filtreleri aynen uygulanır.
+    """
+    batch_size = current_app.config.get('EXPORT_BATCH_SIZE', EXPORT_BATCH_SIZE)
+    stmt = (
+        schema.select()
+        .where(*where)
+        .order_by(schema.key)
+        .execution_options(yield_per=batch_size)
+    )
+
+    def generate():
+        fields = schema.fields
+        for row in db.session.execute(stmt):
+            yield dumps(dict(zip(fields, row))) + b'\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+def _validate_export(params):
+    if params.get('resource') not in EXPORTS:
+        raise JobError(f"resource şunlardan biri olmalıdır: {', '.join(EXPORTS)}")
+
+
+@job_type('export', concurrency=1, validate=_validate_export)
+def export_job(ctx, params):
+    """Bir kaynağın tamamını NDJSON dosyası olarak üretir.
+
+    Satırlar id üzerinden anahtar kümesi (keyset) sayfalarıyla okunur; her
+    sayfadan sonra ilerleme yazıldığı için sunucu tarafı imleç kullanılmaz.
+    Çıktı bellekte biriktirilmez, parça parça sonuç tablosuna yazılır.
+    """
+    _validate_export(params)
+    schema = EXPORTS[params['resource']]
+    batch_size = current_app.config.get('EXPORT_BATCH_SIZE', EXPORT_BATCH_SIZE)
+    total = db.session.scalar(db.select(db.func.count()).select_from(schema.model))
+    fields = schema.fields
+    key = fields.index('id')
+    output = ctx.result('application/x-ndjson')
+    last, done = 0, 0
+    while True:
+        rows = db.session.execute(
+            schema.select().where(schema.key > last).order_by(schema.key).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            output.write(dumps(dict(zip(fields, row))) + b'\n')
+        last = rows[-1][key]
+        done += len(rows)
+        ctx.progress(done, total)
+    return output
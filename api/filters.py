@@ -0,0 +1,50 @@
+from flask import request, jsonify
+from sqlalchemy import or_
+from . import api_blueprint
+
+
+class FilterError(ValueError):
+    """Geçersiz filtre parametreleri için fırlatılır."""
+
+
+@api_blueprint.errorhandler(FilterError)
+def handle_filter_error(error):
+    return jsonify({'error': str(error)}), 400
+
+
+def _escape_like(value):
+    """LIKE desenindeki özel karakterleri (%, _, \\) kaçışlar."""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def list_filters(equals=None, prefix=None, search=None, args=None):
+    """İstekteki filtre parametrelerini SQL koşullarına çevirir.
+
+    `equals` tam sayı eşitlik filtrelerini (`?department_id=3`), `prefix`
+    önek aramasını (`?course_code=BIL`), `search` ise verilen kolonlarda
+    kelime bazlı aramayı (`?name=ali yıl`) parametre adı -> kolon(lar)
+    şeklinde eşler. Her kelime kolonlardan en az birinde geçmelidir.
+    Koşullar listesi döndürülür; gönderilmeyen parametreler yok sayılır.
+    `args` verilmezse Flask isteğinin parametreleri kullanılır.
+    """
+    args = request.args if args is None else args
+    criteria = []
+    for name, column in (equals or {}).items():
+        value = args.get(name)
+        if value is None or value == '':
+            continue
+        try:
+            criteria.append(column == int(value))
+        except ValueError:
+            raise FilterError(f'{name} bir tam sayı olmalıdır.')
+
+    for name, column in (prefix or {}).items():
+        value = args.get(name, '').strip()
+        if value:
+            criteria.append(column.like(_escape_like(value) + '%', escape='\\'))
+
+    for name, columns in (search or {}).items():
+        for word in args.get(name, '').split():
+            pattern = '%' + _escape_like(word) + '%'
+            criteria.append(or_(*(column.ilike(pattern, escape='\\') for column in columns)))
+    return criteria
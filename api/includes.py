@@ -0,0 +1,60 @@
+from flask import request, jsonify
+from sqlalchemy.orm import joinedload, selectinload
+from . import api_blueprint
+
+
+class IncludeError(ValueError):
+    """Desteklenmeyen bir ilişki istendiğinde fırlatılır."""
+
+
+@api_blueprint.errorhandler(IncludeError)
+def handle_include_error(error):
+    return jsonify({'error': str(error)}), 400
+
+
+def requested_includes(allowed):
+    """`?include=` (veya `?expand=`) ile istenen ilişki adlarını doğrulayıp döndürür."""
+    raw = request.args.get('include') or request.args.get('expand') or ''
+    names = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise IncludeError(f'Desteklenmeyen ilişki: {", ".join(unknown)}. Geçerli değerler: {", ".join(allowed)}')
+    return names
+
+
+def with_includes(query, model, allowed):
+    """İstenen ilişkileri sorguya önceden yükletir (N+1 sorgusu oluşmaz).
+
+    Tekil ilişkiler aynı sorguda JOIN ile (`joinedload`), koleksiyonlar ise
+    sayfadaki tüm kayıtlar için tek bir ek IN sorgusuyla (`selectinload`)
+    yüklenir. Sorgu ve istenen ilişki adları döndürülür.
+    """
+    names = requested_includes(allowed)
+    for name in names:
+        attribute = getattr(model, name)
+        loader = selectinload if attribute.property.uselist else joinedload
+        query = query.options(loader(attribute))
+    return query, names
+
+
+def model_dict(obj):
+    """Bir model nesnesinin kolonlarını sözlüğe çevirir (`_` ile başlayanlar hariç)."""
+    return {
+        column.key: getattr(obj, column.key)
+        for column in obj.__mapper__.column_attrs
+        if not column.key.startswith('_')
+    }
+
+
+def dump_includes(obj, names):
+    """Önceden yüklenmiş ilişkileri yanıta eklenecek sözlük olarak döndürür."""
+    output = {}
+    for name in names:
+        value = getattr(obj, name)
+        if value is None:
+            output[name] = None
+        elif isinstance(value, list):
+            output[name] = [model_dict(item) for item in value]
+        else:
+            output[name] = model_dict(value)
+    return output
@@ -0,0 +1,513 @@
+from flask import request, jsonify, current_app, url_for, stream_with_context
+from . import api_blueprint
+from models import db, Jobs, Job_Result_Chunks
+from .auth import token_required
+from .serializers import JOB, dump_page, dumps
+import collections
+import datetime
+import logging
+import os
+import socket
+import threading
+import time
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Görev durumları
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+# İşçinin boştayken kuyruğu yeniden kontrol etme aralığı (saniye)
+DEFAULT_POLL_SECONDS = 2.0
+# Bu süre boyunca heartbeat_at güncellenmeyen çalışan görevin işçisi ölmüş sayılır (saniye)
+DEFAULT_STALE_SECONDS = 300
+# İşçisi ölen bir görev en fazla bu kadar denenir, sonra başarısız olarak işaretlenir
+DEFAULT_MAX_ATTEMPTS = 3
+# İlerleme veritabanına en fazla bu aralıkla yazılır (saniye)
+PROGRESS_INTERVAL_SECONDS = 1.0
+# Sonuç job_result_chunks tablosuna bu büyüklükte parçalar halinde yazılır (bayt)
+DEFAULT_RESULT_CHUNK_BYTES = 1024 * 1024
+
+# Sonucun indirme dosyası uzantısı
+RESULT_EXTENSIONS = {'application/json': 'json', 'application/x-ndjson': 'ndjson', 'text/csv': 'csv'}
+
+
+class JobError(Exception):
+    """Görev parametreleri geçersiz olduğunda fırlatılır; mesajı kullanıcıya gösterilir."""
+
+
+JobType = collections.namedtuple('JobType', 'name handler concurrency roles validate')
+
+
+class JobRegistry:
+    """Görev türleri: ad -> (işleyici, eşzamanlılık sınırı, başlatabilecek roller)."""
+
+    def __init__(self):
+        self._types = {}
+
+    def register(self, name, concurrency=1, roles=('Admin', 'Professor'), validate=None):
+        def decorator(handler):
+            self._types[name] = JobType(name, handler, concurrency, tuple(roles), validate)
+            return handler
+        return decorator
+
+    def get(self, name):
+        return self._types.get(name)
+
+    def names(self):
+        return list(self._types)
+
+
+job_registry = JobRegistry()
+job_type = job_registry.register
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+class ResultWriter:
+    """Görev sonucunu `job_result_chunks` tablosuna parça parça yazar.
+
+    Bellekte en fazla bir parça tutulur; dolan parça işleyicinin işlemine
+    eklenir ve sonraki `progress` çağrısıyla commit edilir.
+    """
+
+    def __init__(self, job_id, mimetype, chunk_bytes):
+        self.job_id = job_id
+        self.mimetype = mimetype
+        self.chunk_bytes = chunk_bytes
+        self._buffer = bytearray()
+        self._seq = 0
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self.chunk_bytes:
+            self._flush(self.chunk_bytes)
+
+    def _flush(self, size):
+        db.session.execute(db.insert(Job_Result_Chunks).values(
+            job_id=self.job_id, seq=self._seq, data=bytes(self._buffer[:size])
+        ))
+        del self._buffer[:size]
+        self._seq += 1
+
+    def close(self):
+        """Kalan baytları yazar ve sonucun mimetype'ını döndürür."""
+        if self._buffer:
+            self._flush(len(self._buffer))
+        return self.mimetype
+
+
+class JobContext:
+    """Çalışan bir görevin işleyiciye verilen durumu.
+
+    `progress` mevcut işlemi commit eder; işleyiciler onu bir iş birimi
+    (ör. bir parça) tamamlandıktan sonra çağırmalıdır. Büyük sonuç üreten
+    işleyiciler `result` ile aldıkları yazıcıya yazıp onu döndürür.
+    """
+
+    def __init__(self, job_id, created_by=None):
+        self.job_id = job_id
+        self.created_by = created_by
+        self._reported = 0.0
+
+    def result(self, mimetype):
+        chunk_bytes = current_app.config.get('JOBS_RESULT_CHUNK_BYTES', DEFAULT_RESULT_CHUNK_BYTES)
+        return ResultWriter(self.job_id, mimetype, chunk_bytes)
+
+    def progress(self, done, total=None, force=False):
+        now = time.monotonic()
+        if not force and now - self._reported < PROGRESS_INTERVAL_SECONDS:
+            return
+        self._reported = now
+        values = {'progress': done}
+        if total is not None:
+            values['total'] = total
+        db.session.execute(db.update(Jobs).where(Jobs.id == self.job_id).values(**values)
+                           .execution_options(synchronize_session=False))
+        db.session.commit()
+
+
+def claim(types, worker):
+    """Verilen türlerden kuyruktaki en eski görevi bu işçiye alır; (id, tür) ya da None döndürür.
+
+    Postgres'te aday satır SKIP LOCKED ile seçilir, böylece işçiler aynı satır
+    için beklemez. Sahiplik durumu `queued` olan satırı güncelleyen koşullu
+    UPDATE ile alınır; yarışı kaybeden işçi sıradaki adayı dener.
+    """
+    if not types:
+        return None
+    while True:
+        candidate = db.session.execute(
+            db.select(Jobs.id, Jobs.job_type)
+            .where(Jobs.status == QUEUED, Jobs.job_type.in_(types))
+            .order_by(Jobs.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+        if candidate is None:
+            db.session.rollback()
+            return None
+        now = _now()
+        claimed = db.session.execute(
+            db.update(Jobs)
+            .where(Jobs.id == candidate.id, Jobs.status == QUEUED)
+            .values(status=RUNNING, worker=worker, started_at=now, heartbeat_at=now, attempts=Jobs.attempts + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return tuple(candidate)
+
+
+def _store_result(ctx, result):
+    # İşleyici None, bir ResultWriter, (bayt, mimetype) ya da JSON'a çevrilebilir bir nesne döndürebilir
+    if result is None:
+        return None
+    if not isinstance(result, ResultWriter):
+        data, mimetype = result if isinstance(result, tuple) else (dumps(result), 'application/json')
+        writer = ctx.result(mimetype)
+        writer.write(data)
+        result = writer
+    return result.close()
+
+
+def _delete_result(job_id):
+    db.session.execute(db.delete(Job_Result_Chunks).where(Job_Result_Chunks.job_id == job_id))
+
+
+def run_job(job_id):
+    """Sahiplenilmiş görevi çalıştırır ve sonucunu veya hatasını kaydeder; son durumu döndürür."""
+    job = db.session.execute(
+        db.select(Jobs.job_type, Jobs.params, Jobs.created_by).where(Jobs.id == job_id)
+    ).one()
+    # Önceki denemeden (ölen işçi) kalan parçalar silinir
+    _delete_result(job_id)
+    db.session.commit()
+    registered = job_registry.get(job.job_type)
+    try:
+        if registered is None:
+            raise JobError(f'Bilinmeyen görev türü: {job.job_type}')
+        params = orjson.loads(job.params) if job.params else {}
+        ctx = JobContext(job_id, job.created_by)
+        result_type = _store_result(ctx, registered.handler(ctx, params))
+        values = {'status': SUCCEEDED, 'result_type': result_type,
+                  'progress': db.func.coalesce(Jobs.total, Jobs.progress)}
+    except Exception as e:
+        db.session.rollback()
+        if not isinstance(e, JobError):
+            logger.exception('%s görevi (%s) başarısız oldu', job_id, job.job_type)
+        _delete_result(job_id)
+        values = {'status': FAILED, 'error': str(e)}
+    db.session.execute(db.update(Jobs).where(Jobs.id == job_id).values(finished_at=_now(), **values)
+                       .execution_options(synchronize_session=False))
+    db.session.commit()
+    return values['status']
+
+
+def requeue_stale(stale_seconds=DEFAULT_STALE_SECONDS, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """İşçisi durmuş (heartbeat'i eskimiş) görevleri kuyruğa geri koyar; deneme hakkı bitenleri başarısız yapar."""
+    cutoff = _now() - datetime.timedelta(seconds=stale_seconds)
+    stale = (Jobs.status == RUNNING, Jobs.heartbeat_at < cutoff)
+    failed = db.session.execute(
+        db.update(Jobs).where(*stale, Jobs.attempts >= max_attempts)
+        .values(status=FAILED, error='Görevi çalıştıran işçi yanıt vermiyor.', finished_at=_now())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    requeued = db.session.execute(
+        db.update(Jobs).where(*stale)
+        .values(status=QUEUED, worker=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return requeued, failed
+
+
+def purge_finished(days):
+    """`days` günden önce biten görevleri (sonuçlarıyla birlikte) siler; silinen sayısını döndürür."""
+    cutoff = _now() - datetime.timedelta(days=days)
+    finished = db.select(Jobs.id).where(Jobs.status.in_((SUCCEEDED, FAILED)), Jobs.finished_at < cutoff)
+    # SQLite yabancı anahtarları zorlamadığı için parçalar ON DELETE CASCADE'e bırakılmaz
+    db.session.execute(db.delete(Job_Result_Chunks).where(Job_Result_Chunks.job_id.in_(finished)))
+    deleted = db.session.execute(
+        db.delete(Jobs).where(Jobs.id.in_(finished))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return deleted
+
+
+class WorkerPool:
+    """Görevleri arka plan iş parçacıklarında çalıştıran yerel işçi havuzu.
+
+    Her görev türü için aynı anda çalışan görev sayısı türün eşzamanlılık
+    sınırını (veya `limits` ile verilen değeri) aşmaz; ağır türler tüm
+    iş parçacıklarını tutamaz. Sınırlar süreç başınadır. Havuz çalışan
+    görevlerin heartbeat_at değerini düzenli olarak günceller.
+    """
+
+    def __init__(self, app, threads=2, types=None, limits=None, poll_interval=DEFAULT_POLL_SECONDS,
+                 stale_seconds=DEFAULT_STALE_SECONDS):
+        self.app = app
+        self.threads = threads
+        self.types = list(types) if types else None
+        self.limits = dict(limits or {})
+        self.poll_interval = poll_interval
+        self.stale_seconds = stale_seconds
+        self.name = f'{socket.gethostname()}:{os.getpid()}'
+        self._running = collections.Counter()
+        self._active = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._threads = []
+
+    def limit(self, name):
+        if name in self.limits:
+            return self.limits[name]
+        registered = job_registry.get(name)
+        return registered.concurrency if registered else 0
+
+    def _available_types(self):
+        names = self.types if self.types is not None else job_registry.names()
+        return [name for name in names if self._running[name] < self.limit(name)]
+
+    def run_once(self):
+        """Sınırı dolmamış türlerden bir görev alıp bu iş parçacığında çalıştırır; görev yoksa None döndürür."""
+        with self.app.app_context():
+            with self._lock:
+                claimed = claim(self._available_types(), f'{self.name}:{threading.current_thread().name}')
+                if claimed is None:
+                    return None
+                job_id, name = claimed
+                self._running[name] += 1
+                self._active.add(job_id)
+            try:
+                run_job(job_id)
+            finally:
+                with self._lock:
+                    self._running[name] -= 1
+                    self._active.discard(job_id)
+                # Sınırı bekleyen türler için diğer iş parçacıkları uyandırılır
+                self._wake.set()
+        return job_id
+
+    def drain(self):
+        """Kuyrukta çalıştırılabilir görev kalmayana kadar çalıştırır; çalıştırılan görev sayısını döndürür."""
+        count = 0
+        while self.run_once() is not None:
+            count += 1
+        return count
+
+    def start(self):
+        self._stopped.clear()
+        for index in range(self.threads):
+            thread = threading.Thread(target=self._work, name=f'job-worker-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._maintain, name='job-heartbeat', daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def wake(self):
+        self._wake.set()
+
+    def _work(self):
+        while not self._stopped.is_set():
+            try:
+                if self.run_once() is not None:
+                    continue
+            except Exception as e:
+                logger.warning('Görev kuyruğu okunamadı: %s', e)
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _maintain(self):
+        # Çalışan görevlerin heartbeat'i eskime süresinin üçte biri aralıkla yenilenir
+        interval = self.stale_seconds / 3
+        while not self._stopped.wait(interval):
+            try:
+                with self.app.app_context():
+                    with self._lock:
+                        active = list(self._active)
+                    if active:
+                        db.session.execute(db.update(Jobs).where(Jobs.id.in_(active), Jobs.status == RUNNING)
+                                           .values(heartbeat_at=_now()).execution_options(synchronize_session=False))
+                        db.session.commit()
+                    requeued, failed = requeue_stale(self.stale_seconds)
+                    if requeued or failed:
+                        logger.warning('%d görev kuyruğa geri alındı, %d görev başarısız işaretlendi', requeued, failed)
+                        self._wake.set()
+            except Exception as e:
+                logger.warning('Görev heartbeat güncellenemedi: %s', e)
+
+    def stop(self, timeout=None):
+        """Yeni görev almayı durdurur; çalışan görevlerin bitmesini `timeout` kadar bekler."""
+        self._stopped.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+
+class JobQueue:
+    """Görevleri kuyruğa alır ve web sürecinde gömülü işçi havuzunu yönetir.
+
+    `JOBS_EMBEDDED_THREADS` sıfırdan büyükse süreç ilk görevi gönderdiğinde
+    kendi havuzunu başlatır (fork'tan sonra her işçi sürecinde ayrı ayrı).
+    Sıfırsa görevleri yalnızca `flask worker` ile başlatılan ayrı süreçler
+    çalıştırır; ağır görevler web işçilerini hiç meşgul etmez.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault('JOBS_EMBEDDED_THREADS', 2)
+        app.config.setdefault('JOBS_POLL_SECONDS', DEFAULT_POLL_SECONDS)
+        app.config.setdefault('JOBS_STALE_SECONDS', DEFAULT_STALE_SECONDS)
+        app.config.setdefault('JOBS_CONCURRENCY', {})
+        self.app = app
+        app.extensions['job_queue'] = self
+
+    def create_pool(self, threads, types=None, limits=None):
+        config = self.app.config
+        return WorkerPool(self.app, threads, types, {**config['JOBS_CONCURRENCY'], **(limits or {})},
+                          config['JOBS_POLL_SECONDS'], config['JOBS_STALE_SECONDS'])
+
+    def submit(self, name, params=None, created_by=None):
+        """Görevi kuyruğa yazar ve id'sini döndürür."""
+        job = Jobs(job_type=name, params=dumps(params or {}).decode(), created_by=created_by, status=QUEUED)
+        db.session.add(job)
+        db.session.commit()
+        self._notify()
+        return job.id
+
+    def _notify(self):
+        threads = self.app.config['JOBS_EMBEDDED_THREADS']
+        if not threads:
+            return
+        with self._lock:
+            if self.pool is None or self._pid != os.getpid():
+                self.pool = self.create_pool(threads)
+                self._pid = os.getpid()
+                self.pool.start()
+        self.pool.wake()
+
+    def close(self):
+        with self._lock:
+            if self.pool is not None and self._pid == os.getpid():
+                self.pool.stop(timeout=0)
+            self.pool = None
+
+
+job_queue = JobQueue()
+
+
+def wants_async():
+    """İstemci `?async=1` ile işlemin arka planda görev olarak çalışmasını istiyor mu?"""
+    return request.args.get('async', '').lower() in ('1', 'true', 'yes')
+
+
+def job_accepted(job_id):
+    """Kuyruğa alınan görev için 202 yanıtı; durum adresi Location başlığındadır."""
+    status_url = url_for('api.get_job', job_id=job_id)
+    response = jsonify({'message': 'Görev kuyruğa alındı.', 'job_id': job_id, 'status': QUEUED, 'status_url': status_url})
+    response.headers['Location'] = status_url
+    return response, 202
+
+
+def _can_view(current_user, created_by):
+    return current_user.role_name == 'Admin' or created_by == current_user.id
+
+
+# Arka plan görevi başlatma (görev türünün izin verdiği roller)
+@api_blueprint.route('/jobs', methods=['POST'])
+@token_required
+def create_job(current_user):
+    data = request.get_json(silent=True) or {}
+    registered = job_registry.get(data.get('type'))
+    if registered is None:
+        return jsonify({'error': f"Geçersiz görev türü. Geçerli türler: {', '.join(job_registry.names())}"}), 400
+    if current_user.role_name not in registered.roles:
+        return jsonify({'message': 'Access forbidden: Erişim Engellendi'}), 403
+
+    params = data.get('params') or {}
+    if not isinstance(params, dict):
+        return jsonify({'error': 'params bir nesne olmalıdır.'}), 400
+    try:
+        if registered.validate is not None:
+            registered.validate(params)
+    except JobError as e:
+        return jsonify({'error': str(e)}), 400
+    return job_accepted(job_queue.submit(registered.name, params, current_user.id))
+
+# Kullanıcının başlattığı görevler; Admin tüm görevleri görür (Giriş yapmış herkes)
+@api_blueprint.route('/jobs', methods=['GET'])
+@token_required
+def get_jobs(current_user):
+    criteria = [] if current_user.role_name == 'Admin' else [Jobs.created_by == current_user.id]
+    if request.args.get('status'):
+        criteria.append(Jobs.status == request.args['status'])
+    jobs, next_cursor = dump_page(JOB, criteria=criteria)
+    return jsonify({'jobs': jobs, 'next_cursor': next_cursor})
+
+# Görevin durumu ve ilerlemesi (görevi başlatan kullanıcı ve Admin)
+@api_blueprint.route('/jobs/<int:job_id>', methods=['GET'])
+@token_required
+def get_job(current_user, job_id):
+    row = db.session.execute(JOB.select().where(Jobs.id == job_id)).first()
+    if row is None:
+        return jsonify({'error': 'Görev bulunamadı.'}), 404
+    job = JOB.dump_rows([row])[0]
+    if not _can_view(current_user, job['created_by']):
+        return jsonify({'message': 'Erişim Reddedildi: Yalnızca kendi görevlerinizi görüntüleyebilirsiniz'}), 403
+    if job['status'] == SUCCEEDED:
+        job['result_url'] = url_for('api.get_job_result', job_id=job_id)
+    return jsonify(job)
+
+def _result_chunks(job_id):
+    """Sonucun parçalarını sırayla okur; indirme boyunca bellekte tek bir parça tutulur."""
+    seq = -1
+    while True:
+        row = db.session.execute(
+            db.select(Job_Result_Chunks.seq, Job_Result_Chunks.data)
+            .where(Job_Result_Chunks.job_id == job_id, Job_Result_Chunks.seq > seq)
+            .order_by(Job_Result_Chunks.seq)
+            .limit(1)
+        ).first()
+        # Yavaş istemci beklenirken bağlantı havuza geri verilir
+        db.session.commit()
+        if row is None:
+            return
+        seq = row.seq
+        yield row.data
+
+# Tamamlanan görevin sonucunu indirme (görevi başlatan kullanıcı ve Admin)
+@api_blueprint.route('/jobs/<int:job_id>/result', methods=['GET'])
+@token_required
+def get_job_result(current_user, job_id):
+    row = db.session.execute(
+        db.select(Jobs.job_type, Jobs.status, Jobs.error, Jobs.created_by, Jobs.result_type)
+        .where(Jobs.id == job_id)
+    ).first()
+    if row is None:
+        return jsonify({'error': 'Görev bulunamadı.'}), 404
+    if not _can_view(current_user, row.created_by):
+        return jsonify({'message': 'Erişim Reddedildi: Yalnızca kendi görevlerinizi görüntüleyebilirsiniz'}), 403
+    if row.status != SUCCEEDED:
+        return jsonify({'error': 'Görev başarıyla tamamlanmadı.', 'status': row.status, 'job_error': row.error}), 409
+    if row.result_type is None:
+        return '', 204
+
+    extension = RESULT_EXTENSIONS.get(row.result_type, 'bin')
+    return current_app.response_class(stream_with_context(_result_chunks(job_id)), mimetype=row.result_type, headers={
+        'Content-Disposition': f'attachment; filename={row.job_type}-{job_id}.{extension}'
+    })
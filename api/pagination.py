@@ -0,0 +1,89 @@
+from flask import request, jsonify, current_app
+from sqlalchemy import Select
+from models import db
+from . import api_blueprint
+import base64
+import datetime
+
+# Sayfa boyutu ayarları (app.config üzerinden değiştirilebilir)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class PaginationError(ValueError):
+    """Geçersiz limit/after parametreleri için fırlatılır."""
+
+
+@api_blueprint.errorhandler(PaginationError)
+def handle_pagination_error(error):
+    return jsonify({'error': str(error)}), 400
+
+
+def page_args(args=None, config=None, cursor=int):
+    """İstekteki `limit` ve `after` parametrelerini doğrulayıp döndürür.
+
+    `args` ve `config` verilmezse Flask isteği ve uygulaması kullanılır.
+    `after` değeri `cursor` ile çözülür; ValueError geçersiz imleç sayılır.
+    """
+    args = request.args if args is None else args
+    config = current_app.config if config is None else config
+    default_size = config.get('PAGE_SIZE_DEFAULT', DEFAULT_PAGE_SIZE)
+    max_size = config.get('PAGE_SIZE_MAX', MAX_PAGE_SIZE)
+
+    try:
+        limit = int(args.get('limit', default_size))
+    except ValueError:
+        raise PaginationError('limit bir tam sayı olmalıdır.')
+    if limit < 1:
+        raise PaginationError('limit en az 1 olmalıdır.')
+
+    after = args.get('after')
+    if after is not None:
+        try:
+            after = cursor(after)
+        except ValueError:
+            raise PaginationError('after geçerli bir imleç değil.')
+
+    return min(limit, max_size), after
+
+
+def paginate(query, key_column):
+    """Sorguyu `key_column` üzerinden keyset (imleç) sayfalamasıyla çalıştırır.
+
+    Bir sayfa kayıt ve bir sonraki sayfa için `next_cursor` döndürür; son
+    sayfada `next_cursor` None olur. Tablo hiçbir zaman tamamen okunmaz.
+    `query` bir ORM sorgusu ya da kolon seçen bir `select()` olabilir; ikincisinde
+    kayıtlar satır (Row) olarak döner.
+    """
+    limit, after = page_args()
+    if after is not None:
+        query = query.filter(key_column > after)
+    query = query.order_by(key_column).limit(limit + 1)
+    items = db.session.execute(query).all() if isinstance(query, Select) else query.all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = getattr(items[-1], key_column.key)
+    return items, next_cursor
+
+
+def encode_cursor(*values):
+    """Birden çok kolondan oluşan bir imleci URL'de taşınabilen opak bir metne çevirir."""
+    text = '|'.join(value.isoformat() if isinstance(value, datetime.datetime) else str(value) for value in values)
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip('=')
+
+
+def cursor_parser(*types):
+    """`encode_cursor` ile üretilen imleci verilen tiplere göre çözen bir fonksiyon döndürür.
+
+    Dönen fonksiyon `page_args(cursor=...)` ile kullanılır; tarih alanları için
+    `datetime.datetime` verilir.
+    """
+    def parse(value):
+        parts = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)).decode().split('|')
+        if len(parts) != len(types):
+            raise ValueError(value)
+        return tuple(datetime.datetime.fromisoformat(part) if kind is datetime.datetime else kind(part)
+                     for kind, part in zip(types, parts))
+    return parse
@@ -1,13 +1,26 @@
 from flask import request, jsonify
 from . import api_blueprint
-from models import db, Users, Professors, Roles
-from .auth import token_required, roles_required
+from models import db, Users, Professors
+from .auth import token_required, roles_required, invalidate_principal
+from .roles import role_registry
+from .includes import with_includes, dump_includes
+from .filters import list_filters
+from .serializers import PROFESSOR, dump_page
+from .conditional import conditional_get
+from .caching import response_cache, invalidate_tables
+from hashing import password_hasher
+
+# Akademisyen yanıtlarının (include ile birlikte) dayandığı tablolar
+PROFESSOR_TABLES = ('professors', 'departments', 'courses')
 
 # Yeni bir akademisyen ve kullanıcı hesabı oluşturma (Sadece Admin)
 @api_blueprint.route('/professors', methods=['POST'])
 @roles_required(['Admin'])
 def create_professor(current_user):
     data = request.get_json()
+    if isinstance(data, list):
+        return create_professors_bulk(data)
+
     username = data.get('username')
     password = data.get('password')
     email = data.get('email')
@@ -19,15 +32,15 @@ def create_professor(current_user):
     if not all([username, password, email, first_name, last_name, department_id]):
         return jsonify({'error': 'Eksik bilgi girildi.'}), 400
 
-    professor_role = Roles.query.filter_by(role_name='Professor').first()
-    if not professor_role:
+    professor_role_id = role_registry.id_for('Professor')
+    if not professor_role_id:
         return jsonify({'error': 'Profesör rölü bulunamadı.'}), 500
     
     new_user = Users(
         username=username,
         password=password,
         email=email,
-        role_id=professor_role.id
+        role_id=professor_role_id
     )
 
     try:
@@ -43,6 +56,7 @@ def create_professor(current_user):
         )
         db.session.add(new_professor)
         db.session.commit()
+        invalidate_tables('professors', 'users')
         
         return jsonify({
             'message': 'Profesör ve kullanıcı hesabı başarıyla oluşturuldu',
@@ -53,38 +67,76 @@ def create_professor(current_user):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+PROFESSOR_FIELDS = ['username', 'password', 'email', 'first_name', 'last_name', 'department_id']
+
+def create_professors_bulk(rows):
+    """Bir dizi akademisyeni tek işlemde oluşturur; parolalar hash havuzunda paralel hashlenir."""
+    missing = [index for index, row in enumerate(rows)
+               if not isinstance(row, dict) or not all(row.get(field) for field in PROFESSOR_FIELDS)]
+    if missing:
+        return jsonify({'error': 'Eksik bilgi girildi.', 'rows': missing}), 400
+
+    professor_role_id = role_registry.id_for('Professor')
+    if not professor_role_id:
+        return jsonify({'error': 'Profesör rölü bulunamadı.'}), 500
+
+    hashes = password_hasher.hash_many(row['password'] for row in rows)
+    users = [
+        Users(username=row['username'], _password=hashed, email=row['email'], role_id=professor_role_id)
+        for row, hashed in zip(rows, hashes)
+    ]
+
+    try:
+        db.session.add_all(users)
+        db.session.flush()
+        professors = [
+            Professors(
+                first_name=row['first_name'],
+                last_name=row['last_name'],
+                title=row.get('title'),
+                user_id=user.id,
+                department_id=row['department_id']
+            )
+            for row, user in zip(rows, users)
+        ]
+        db.session.add_all(professors)
+        db.session.flush()
+        # id'ler commit'ten önce alınır; commit sonrası her nesne yeniden sorgulanmasın
+        created = [{'user_id': user.id, 'professor_id': professor.id} for user, professor in zip(users, professors)]
+        db.session.commit()
+        invalidate_tables('professors', 'users')
+
+        return jsonify({
+            'message': f'{len(professors)} profesör ve kullanıcı hesabı başarıyla oluşturuldu',
+            'created': created
+        }), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 # Tüm akademisyenleri listeleme (Herkes)
 @api_blueprint.route('/professors', methods=['GET'])
+@conditional_get(*PROFESSOR_TABLES)
+@response_cache.cached(*PROFESSOR_TABLES)
 def get_all_professors():
-    professors = Professors.query.all()
-    output = []
-    for professor in professors:
-        output.append({
-            'id': professor.id,
-            'first_name': professor.first_name,
-            'last_name': professor.last_name,
-            'title': professor.title,
-            'user_id': professor.user_id,
-            'department_id': professor.department_id
-        })
-    return jsonify({'professors': output})
+    criteria = list_filters(
+        equals={'department_id': Professors.department_id},
+        search={'name': (Professors.first_name, Professors.last_name)}
+    )
+    professors, next_cursor = dump_page(PROFESSOR, ['department', 'courses'], criteria)
+    return jsonify({'professors': professors, 'next_cursor': next_cursor})
 
 # Belirli bir akademisyeni ID ile getirme (Herkes, kendi bilgisine erişir)
 @api_blueprint.route('/professors/<int:professor_id>', methods=['GET'])
 @token_required
+@response_cache.cached(*PROFESSOR_TABLES, per_user=True)
 def get_professor(current_user, professor_id):
-    professor = Professors.query.get_or_404(professor_id)
-    if current_user.role.role_name == 'Professor' and professor.user_id != current_user.id:
+    query, includes = with_includes(Professors.query, Professors, ['department', 'courses'])
+    professor = query.filter(Professors.id == professor_id).first_or_404()
+    if current_user.role_name == 'Professor' and professor.user_id != current_user.id:
         return jsonify({'message': 'Erişim Reddedildi: Yalnızca kendi profesör bilgilerinizi görüntüleyebilirsiniz'}), 403
     
-    return jsonify({
-        'id': professor.id,
-        'first_name': professor.first_name,
-        'last_name': professor.last_name,
-        'title': professor.title,
-        'user_id': professor.user_id,
-        'department_id': professor.department_id
-    })
+    return jsonify({**PROFESSOR.dump(professor), **dump_includes(professor, includes)})
 
 # Akademisyen silme (Sadece Admin)
 @api_blueprint.route('/professors/<int:professor_id>', methods=['DELETE'])
@@ -99,6 +151,8 @@ def delete_professor(current_user, professor_id):
             db.session.delete(user)
         
         db.session.commit()
+        invalidate_principal(user_id)
+        invalidate_tables('professors', 'users')
         return jsonify({'message': 'Profesör ve ilgili kullanıcı hesabı başarıyla silindi.'})
     except Exception as e:
         db.session.rollback()
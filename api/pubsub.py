@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import queue
+import select
+import threading
+import orjson
+from .serializers import dumps
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANNEL = 'academic_events'
+DEFAULT_QUEUE_SIZE = 1000
+
+
+class LocalBroker:
+    """Olayları aynı süreçteki abonelere doğrudan iletir (tek süreç, geliştirme ve testler)."""
+
+    name = 'local'
+
+    def __init__(self):
+        self.deliver = None
+
+    def start(self, deliver):
+        self.deliver = deliver
+
+    def publish(self, payload):
+        if self.deliver is not None:
+            self.deliver(payload)
+
+    def close(self):
+        self.deliver = None
+
+
+class PostgresBroker:
+    """Olayları Postgres LISTEN/NOTIFY ile tüm işçi süreçlerine dağıtır.
+
+    Yayınlama ayrı bir autocommit bağlantısında `pg_notify` çağırır; dinleme
+    yalnızca süreçte ilk abone oluştuğunda açılan tek bir bağlantı ve iş
+    parçacığıyla yapılır. Bağlantı koparsa yeniden bağlanılır; aradaki
+    olaylar istemcilerin Last-Event-ID ile devam etmesiyle telafi edilir.
+    """
+
+    name = 'postgresql'
+
+    def __init__(self, dsn, channel=DEFAULT_CHANNEL, poll_interval=5.0):
+        self.dsn = dsn
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self._publisher = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        from sqlalchemy.engine import make_url
+        # psycopg2 sürücü ekini (postgresql+psycopg2) tanımaz
+        dsn = make_url(url).set(drivername='postgresql').render_as_string(hide_password=False)
+        return cls(dsn, **kwargs)
+
+    def _connect(self):
+        import psycopg2
+        import psycopg2.extensions
+        connection = psycopg2.connect(self.dsn)
+        connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        return connection
+
+    def start(self, deliver):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._listen, args=(deliver,), name='event-listener', daemon=True)
+        self._thread.start()
+
+    def _listen(self, deliver):
+        while not self._stopped.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN {self.channel}')
+                while not self._stopped.is_set():
+                    if select.select([connection], [], [], self.poll_interval) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        deliver(connection.notifies.pop(0).payload)
+            except Exception as e:
+                logger.warning('Olay dinleme bağlantısı koptu, yeniden bağlanılacak: %s', e)
+                self._stopped.wait(1)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+    def publish(self, payload):
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._publisher is None or self._publisher.closed:
+                        self._publisher = self._connect()
+                    with self._publisher.cursor() as cursor:
+                        cursor.execute('SELECT pg_notify(%s, %s)', (self.channel, payload))
+                    return
+                except Exception:
+                    # Havuzdaki bağlantı sunucu tarafından kapatılmış olabilir; bir kez yeniden denenir
+                    self._publisher = None
+                    if attempt:
+                        raise
+
+    def close(self):
+        self._stopped.set()
+        with self._lock:
+            if self._publisher is not None:
+                self._publisher.close()
+                self._publisher = None
+
+
+class Subscription:
+    """Bir istemcinin olay kuyruğu.
+
+    Kuyruk dolarsa (istemci olayları yeterince hızlı okumuyorsa) abonelik
+    `dropped` olarak işaretlenir; akış kapanır ve istemci Last-Event-ID ile
+    yeniden bağlanıp kaçırdıklarını veritabanından alır.
+    """
+
+    def __init__(self, hub, maxsize):
+        self.hub = hub
+        self.queue = queue.Queue(maxsize)
+        self.dropped = False
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped = True
+
+    def get(self, timeout):
+        """Sıradaki olayı bekler; süre dolarsa None döndürür."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncSubscription(Subscription):
+    """asyncio akışları için abonelik; olaylar dinleyici iş parçacığından olay döngüsüne aktarılır."""
+
+    def __init__(self, hub, maxsize):
+        super().__init__(hub, maxsize)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+
+    def put(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # Olay döngüsü kapanmış
+            self.dropped = True
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped = True
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventHub:
+    """Süreç içi yayın/abonelik; olaylar seçilen aracı (broker) üzerinden taşınır.
+
+    `EVENT_BROKER_URL` bir Postgres adresiyse LISTEN/NOTIFY, değilse süreç içi
+    aracı kullanılır. Süreç içi aracıda olaylar yalnızca aynı süreçteki
+    abonelere ulaşır; birden çok işçi veya ayrı ASGI sunucusu varsa Postgres
+    aracı gerekir. Olaylar `{'type': ..., 'data': {...}}` sözlükleridir.
+    """
+
+    def __init__(self):
+        self.broker = LocalBroker()
+        self.queue_size = DEFAULT_QUEUE_SIZE
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        self._started = False
+
+    def init_app(self, app):
+        app.config.setdefault('EVENT_QUEUE_SIZE', DEFAULT_QUEUE_SIZE)
+        self.queue_size = app.config['EVENT_QUEUE_SIZE']
+        url = app.config.get('EVENT_BROKER_URL')
+        self.configure(PostgresBroker.from_url(url) if url else LocalBroker())
+        app.extensions['event_hub'] = self
+
+    def configure(self, broker):
+        with self._lock:
+            self.broker.close()
+            self.broker = broker
+            self._started = False
+            if self._subscriptions:
+                self._start()
+
+    def _start(self):
+        # Dinleme yalnızca abonesi olan süreçlerde başlar; sadece yayınlayan işçiler bağlantı tutmaz
+        if not self._started:
+            self.broker.start(self._deliver)
+            self._started = True
+
+    def publish(self, kind, data):
+        """Olayı yayınlar. Aracı hatası isteği bozmaz; istemciler Last-Event-ID ile telafi eder."""
+        try:
+            self.broker.publish(dumps({'type': kind, 'data': data}).decode())
+        except Exception as e:
+            logger.warning('%s olayı yayınlanamadı: %s', kind, e)
+
+    def subscribe(self, asynchronous=False):
+        subscription = (AsyncSubscription if asynchronous else Subscription)(self, self.queue_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+            self._start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def subscriber_count(self):
+        return len(self._subscriptions)
+
+    def _deliver(self, payload):
+        event = orjson.loads(payload)
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.put(event)
+
+    def close(self):
+        with self._lock:
+            self.broker.close()
+            self._started = False
+
+
+event_hub = EventHub()
+
+
+def publish_event(kind, data):
+    """Yazma işlemi commit edildikten sonra abonelere olay gönderir."""
+    event_hub.publish(kind, data)
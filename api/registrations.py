@@ -2,6 +2,13 @@ from flask import request, jsonify
 from . import api_blueprint
 from models import db, Course_Registrations, Students, Courses
 from .auth import token_required, roles_required
+from .serializers import REGISTRATION, dump_page
+from .export import wants_ndjson, ndjson_response
+from .bulk import read_bulk_rows, existing_ids
+from .enrollment import (enroll, enroll_many, drop_registration, REGISTERED, WAITLISTED,
+                         ALREADY_REGISTERED, ALREADY_WAITLISTED)
+from .caching import invalidate_tables
+from .jobs import job_type, wants_async, job_accepted, job_queue, JobError
 
 # Bir öğrenciyi bir derse kaydetme (Admin ve Professor)
 @api_blueprint.route('/registrations', methods=['POST'])
@@ -21,37 +28,114 @@ def register_course(current_user):
     if not course:
         return jsonify({'error': f'{course_id} numaralı ders bulunamadı.'}), 404
 
-    existing_registration = Course_Registrations.query.filter_by(
-        student_id=student_id,
-        course_id=course_id
-    ).first()
-    if existing_registration:
-        return jsonify({'message': 'Öğrenci bu derse zaten kayıtlı.'}), 409
+    try:
+        status, position = enroll(student.id, course.id)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
 
-    new_registration = Course_Registrations(
-        student_id=student_id,
-        course_id=course_id
-    )
+    if status == ALREADY_REGISTERED:
+        return jsonify({'message': 'Öğrenci bu derse zaten kayıtlı.', 'status': status}), 409
+    if status == ALREADY_WAITLISTED:
+        return jsonify({'message': 'Öğrenci bu dersin bekleme listesinde zaten var.', 'status': status, 'position': position}), 409
+    if status == WAITLISTED:
+        # Bekleme listesine eklenirken boşalmış bir koltuk başka bir öğrenciye verilmiş olabilir
+        invalidate_tables('course_registrations')
+        return jsonify({'message': 'Ders kontenjanı dolu, öğrenci bekleme listesine alındı.', 'status': status, 'position': position}), 202
+    invalidate_tables('course_registrations')
+    return jsonify({'message': 'Ders başarıyla kaydedildi', 'status': status}), 201
 
+# Bir ders kaydını silme; boşalan koltuk bekleme listesindeki ilk öğrenciye verilir (Admin ve dersin akademisyeni)
+@api_blueprint.route('/registrations/<int:registration_id>', methods=['DELETE'])
+@roles_required(['Admin', 'Professor'])
+def delete_registration(current_user, registration_id):
+    registration = Course_Registrations.query.get_or_404(registration_id)
+    if current_user.role_name == 'Professor' and db.session.scalar(
+        db.select(Courses.professor_id).where(Courses.id == registration.course_id)
+    ) != current_user.professor_id:
+        return jsonify({'message': 'Erişim Reddedildi: Yalnızca kendi derslerinizin kayıtlarını silebilirsiniz'}), 403
     try:
-        db.session.add(new_registration)
-        db.session.commit()
-        return jsonify({'message': 'Ders başarıyla kaydedildi'}), 201
+        promoted = drop_registration(registration)
+        invalidate_tables('course_registrations')
+        return jsonify({'message': 'Ders kaydı silindi', 'promoted_student_ids': promoted})
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+def register_rows(rows):
+    """Toplu kayıt satırlarını doğrulayıp kontenjana göre kaydeder; (özet, satır sonuçları) döndürür."""
+    results = [None] * len(rows)
+    pairs = {}
+    for index, row in enumerate(rows):
+        try:
+            pair = (int(row.get('student_id')), int(row.get('course_id')))
+        except (TypeError, ValueError):
+            results[index] = {'row': index, 'status': 'invalid', 'error': 'Öğrenci veya ders numarası geçersiz.'}
+            continue
+        if pair in pairs:
+            results[index] = {'row': index, 'student_id': pair[0], 'course_id': pair[1], 'status': 'duplicate'}
+            continue
+        pairs[pair] = index
+
+    # Her id türü için tek (parçalı) bir IN sorgusu
+    students = existing_ids(Students.id, {student_id for student_id, _ in pairs})
+    courses = existing_ids(Courses.id, {course_id for _, course_id in pairs})
+
+    to_enroll = []
+    for (student_id, course_id), index in pairs.items():
+        result = {'row': index, 'student_id': student_id, 'course_id': course_id}
+        if student_id not in students:
+            result['status'] = 'student_not_found'
+        elif course_id not in courses:
+            result['status'] = 'course_not_found'
+        else:
+            to_enroll.append((student_id, course_id))
+        results[index] = result
+
+    # Kontenjanı dolan derslerin fazla satırları bekleme listesine alınır
+    statuses = enroll_many(to_enroll)
+    invalidate_tables('course_registrations')
+
+    for pair in to_enroll:
+        results[pairs[pair]]['status'] = 'created' if statuses[pair] == REGISTERED else statuses[pair]
+
+    summary = {}
+    for result in results:
+        summary[result['status']] = summary.get(result['status'], 0) + 1
+    return summary, results
+
+def _validate_rows(params):
+    rows = params.get('rows')
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise JobError('rows bir nesne dizisi olmalıdır.')
+
+@job_type('registrations_import', concurrency=1, validate=_validate_rows)
+def registrations_import_job(ctx, params):
+    _validate_rows(params)
+    summary, results = register_rows(params['rows'])
+    return {'summary': summary, 'results': results}
+
+# Öğrencileri derslere toplu kaydetme; ?async=1 ile arka plan görevi olarak (Admin ve Professor)
+@api_blueprint.route('/registrations/bulk', methods=['POST'])
+@roles_required(['Admin', 'Professor'])
+def bulk_register_courses(current_user):
+    rows = read_bulk_rows('registrations')
+    if wants_async():
+        return job_accepted(job_queue.submit('registrations_import', {'rows': rows}, current_user.id))
+
+    try:
+        summary, results = register_rows(rows)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+    return jsonify({'summary': summary, 'results': results}), 200
+
 # Tüm ders kayıtlarını listeleme (Admin ve Professor)
 @api_blueprint.route('/registrations', methods=['GET'])
 @roles_required(['Admin', 'Professor'])
 def get_all_registrations(current_user):
-    registrations = Course_Registrations.query.all()
-    output = []
-    for reg in registrations:
-        output.append({
-            'id': reg.id,
-            'student_id': reg.student_id,
-            'course_id': reg.course_id,
-            'registration_date': reg.registration_date.isoformat()
-        })
-    return jsonify({'registrations': output})
\ No newline at end of file
+    if wants_ndjson():
+        return ndjson_response(REGISTRATION)
+
+    registrations, next_cursor = dump_page(REGISTRATION, ['student', 'course'])
+    return jsonify({'registrations': registrations, 'next_cursor': next_cursor})
\ No newline at end of file
@@ -0,0 +1,73 @@
+from models import db, Roles
+from .routing import use_primary
+import threading
+import time
+
+# Bilinmeyen bir ad veya id istendiğinde tablo en fazla bu aralıkla yeniden okunur (saniye);
+# yanlış yazılmış bir rol adı her istekte ek sorguya yol açmaz
+MISS_RELOAD_SECONDS = 30
+
+
+class RoleRegistry:
+    """Rol adları ile id'leri arasındaki eşlemeyi bellekte tutar.
+
+    Roller neredeyse hiç değişmediği için tablo uygulama açılışında (ve
+    `flask seed_roles` sonrasında) bir kez okunur. Bilinmeyen bir ad veya id
+    istendiğinde tablo yeniden okunur; ancak son okumadan bu yana
+    `MISS_RELOAD_SECONDS` geçmemişse ve bu süreçte rol yazılmamışsa bilinmeyen
+    değer sorgusuz olarak None döner.
+    """
+
+    def __init__(self):
+        self._ids_by_name = {}
+        self._names_by_id = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        # Yetki kontrolleri yeni eklenen rolü hemen görsün diye okuma kopyası kullanılmaz
+        with use_primary():
+            rows = db.session.execute(db.select(Roles.id, Roles.role_name)).all()
+        with self._lock:
+            self._ids_by_name = {name: role_id for role_id, name in rows}
+            self._names_by_id = {role_id: name for role_id, name in rows}
+            self._loaded_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._ids_by_name = {}
+            self._names_by_id = {}
+            self._loaded_at = None
+
+    def mark_stale(self):
+        """Bir sonraki bilinmeyen değerde tablonun beklemeden yeniden okunmasını sağlar."""
+        self._loaded_at = None
+
+    def _reload_on_miss(self):
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at >= MISS_RELOAD_SECONDS:
+            self.load()
+
+    def id_for(self, role_name):
+        if role_name not in self._ids_by_name:
+            self._reload_on_miss()
+        return self._ids_by_name.get(role_name)
+
+    def name_for(self, role_id):
+        if role_id not in self._names_by_id:
+            self._reload_on_miss()
+        return self._names_by_id.get(role_id)
+
+    def ids_for(self, role_names):
+        return {self.id_for(name) for name in role_names} - {None}
+
+
+role_registry = RoleRegistry()
+
+
+# ORM ile yazılan roller (ör. /roles uç noktaları, testler) bekleme süresini atlar
+@db.event.listens_for(Roles, 'after_insert')
+@db.event.listens_for(Roles, 'after_update')
+@db.event.listens_for(Roles, 'after_delete')
+def _roles_changed(mapper, connection, target):
+    role_registry.mark_stale()
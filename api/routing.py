@@ -0,0 +1,88 @@
+from flask import request, g, has_request_context
+from contextlib import contextmanager
+from sqlalchemy import create_engine
+from . import api_blueprint
+from .caching import response_cache
+from models import RoutingSession
+
+# Okuma yapan HTTP metodları; diğer tüm istekler birincil veritabanını kullanır
+READ_METHODS = ('GET', 'HEAD')
+
+
+class ReadReplica:
+    """GET isteklerindeki SELECT sorgularını isteğe bağlı okuma kopyasına yönlendirir.
+
+    `DATABASE_READ_URL` verilmemişse hiçbir şey değişmez. Kullanıcı kendi
+    yazma isteğinden sonraki `READ_YOUR_WRITES_SECONDS` boyunca, ya da
+    yanıtın dayandığı tablolara yeni yazılmışsa okumalar birincil
+    veritabanından yapılır; kopyadaki gecikme istemciye yansımaz.
+    """
+
+    def __init__(self):
+        self.engine = None
+
+    def init_app(self, app, url=None):
+        url = url or app.config.get('DATABASE_READ_URL')
+        self.close()
+        if url:
+            self.engine = create_engine(url, **app.config.get('SQLALCHEMY_READ_ENGINE_OPTIONS', {}))
+        RoutingSession.read_bind = self.engine_for_request
+        app.extensions['read_replica'] = self
+
+    def close(self):
+        if self.engine is not None:
+            self.engine.dispose()
+            self.engine = None
+
+    def engine_for_request(self):
+        """Mevcut istek kopyadan okuyabiliyorsa kopya motorunu, değilse None döndürür."""
+        if self.engine is None or not has_request_context():
+            return None
+        target = g.get('db_target')
+        if target is None:
+            # Karar, kullanıcı ve tablolar belli olduktan sonra değişmeyeceği için istek başına saklanır
+            state = (g.get('user_id'), g.get('response_tables'))
+            cached = g.get('db_routing')
+            if cached is None or cached[0] != state:
+                cached = (state, 'replica' if self._may_use_replica(*state) else 'primary')
+                g.db_routing = cached
+            target = cached[1]
+        return self.engine if target == 'replica' else None
+
+    def _may_use_replica(self, user_id, tables):
+        if request.method not in READ_METHODS:
+            return False
+        keys = ['table:' + table for table in tables or ()]
+        if user_id is not None:
+            keys.append(f'user:{user_id}')
+        return not response_cache.written_recently(*keys)
+
+
+read_replica = ReadReplica()
+
+
+@contextmanager
+def use_primary():
+    """Blok içindeki sorguları okuma isteğinde bile birincil veritabanına gönderir."""
+    previous = g.get('db_target')
+    g.db_target = 'primary'
+    try:
+        yield
+    finally:
+        g.db_target = previous
+
+
+@api_blueprint.before_request
+def reset_routing_state():
+    # g uygulama bağlamına aittir; bağlam birden çok istekte kullanılıyorsa (ör. testler) karar taşınmasın
+    for name in ('user_id', 'response_tables', 'db_target', 'db_routing'):
+        g.pop(name, None)
+
+
+@api_blueprint.after_request
+def remember_user_writes(response):
+    # Başarılı yazma isteğinden sonra kullanıcının okumaları bir süre birincilden yapılır
+    if (read_replica.engine is not None and request.method not in READ_METHODS
+            and response.status_code < 400 and g.get('user_id') is not None):
+        response_cache.mark_written(f'user:{g.user_id}')
+    return response
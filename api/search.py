@@ -0,0 +1,91 @@
+from flask import request, jsonify
+from . import api_blueprint
+from models import db, Announcements, Courses, search_fold
+from .pagination import page_args, encode_cursor, cursor_parser
+import re
+
+# Sorgudaki en fazla kelime sayısı; fazlası yok sayılır
+MAX_SEARCH_TERMS = 8
+
+# Aranabilen türler: tür -> (model, başlık kolonu, SQLite bm25 kolon ağırlıkları)
+# Ağırlıklar models.SEARCH_COLUMNS'taki A/B ağırlıklarının ts_rank karşılıklarıdır.
+SEARCH_TYPES = {
+    'announcement': (Announcements, Announcements.title, (1.0, 0.4)),
+    'course': (Courses, Courses.course_name, (1.0, 1.0)),
+}
+
+
+def search_terms(q):
+    """Sorguyu indeksle aynı şekilde normalleştirip kelimelerine ayırır."""
+    return re.findall(r'\w+', search_fold(q or ''))[:MAX_SEARCH_TERMS]
+
+
+def _postgresql_branch(kind, model, title, terms):
+    vector = db.literal_column(f'{model.__tablename__}.search_vector')
+    # Her kelime önek olarak aranır: 'veri taban' -> 'veri:* & taban:*'
+    query = db.func.to_tsquery('simple', ' & '.join(f'{term}:*' for term in terms))
+    # ts_rank `real` döndürür; imleçteki float ile birebir karşılaştırılabilmesi için double'a çevrilir
+    rank = db.cast(db.func.ts_rank(vector, query), db.Double)
+    return db.select(db.literal(kind).label('type'), model.id.label('id'), title.label('title'), rank.label('rank')) \
+        .where(vector.op('@@')(query))
+
+
+def _sqlite_branch(kind, model, title, terms, weights):
+    fts = db.table(f'{model.__tablename__}_fts', db.column('rowid'))
+    match = ' AND '.join(f'"{term}"*' for term in terms)
+    # bm25 küçük değerde daha iyidir; diğer veritabanlarıyla aynı yönde sıralamak için işareti çevrilir
+    rank = -db.func.bm25(db.literal_column(fts.name), *weights)
+    return db.select(db.literal(kind).label('type'), model.id.label('id'), title.label('title'), rank.label('rank')) \
+        .select_from(fts).join(model, model.id == fts.c.rowid) \
+        .where(db.literal_column(fts.name).op('MATCH')(match))
+
+
+def search_query(terms, kinds, limit, after=None, dialect='postgresql'):
+    """Seçilen türlerde kelimelerin hepsini içeren kayıtları ilgiye göre sıralayan sorgu.
+
+    Sıralama (rank azalan, tür, id) üzerindedir; `after` bu üçlünün imlecidir.
+    """
+    branches = []
+    for kind in kinds:
+        model, title, weights = SEARCH_TYPES[kind]
+        if dialect == 'postgresql':
+            branch = _postgresql_branch(kind, model, title, terms)
+        elif dialect == 'sqlite':
+            branch = _sqlite_branch(kind, model, title, terms, weights)
+        else:
+            raise NotImplementedError(f'{dialect} için tam metin arama desteklenmiyor.')
+        branches.append(branch)
+
+    results = db.union_all(*branches).subquery() if len(branches) > 1 else branches[0].subquery()
+    query = db.select(results.c.type, results.c.id, results.c.title, results.c.rank)
+    if after is not None:
+        rank, kind, key = after
+        query = query.where(db.or_(
+            results.c.rank < rank,
+            db.and_(results.c.rank == rank, db.or_(results.c.type > kind,
+                                                  db.and_(results.c.type == kind, results.c.id > key))),
+        ))
+    return query.order_by(results.c.rank.desc(), results.c.type, results.c.id).limit(limit)
+
+
+# Duyuru ve ders kataloğunda tam metin arama (Herkes)
+@api_blueprint.route('/search', methods=['GET'])
+def search():
+    terms = search_terms(request.args.get('q'))
+    if not terms:
+        return jsonify({'error': 'Arama için q parametresi gereklidir.'}), 400
+
+    kinds = request.args.get('type', ','.join(SEARCH_TYPES)).split(',')
+    unknown = set(kinds) - SEARCH_TYPES.keys()
+    if unknown:
+        return jsonify({'error': f"Geçersiz arama türü: {', '.join(sorted(unknown))}"}), 400
+
+    limit, after = page_args(cursor=cursor_parser(float, str, int))
+    dialect = db.session.get_bind().dialect.name
+    rows = db.session.execute(search_query(terms, list(dict.fromkeys(kinds)), limit + 1, after, dialect)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].rank, rows[-1].type, rows[-1].id)
+    return jsonify({'results': [row._asdict() for row in rows], 'next_cursor': next_cursor})
@@ -1,7 +1,14 @@
 from flask import jsonify
 from . import api_blueprint
-from models import db, Roles, Departments, Users, Students, Professors, Courses, Exams, Announcements, Course_Registrations, Exam_Results
+from models import db, Departments, Users, Students, Professors, Courses, Exams, Announcements, Course_Registrations, Exam_Results
+from .roles import role_registry
+from .caching import invalidate_tables
+from .jobs import job_type, JobError
+from datagen import generate_university, DataGenerationError, DEFAULT_SCALE
 import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 
 @api_blueprint.route('/seed_data', methods=['POST'])
 def seed_data():
@@ -16,20 +23,19 @@ def seed_data():
         db.session.add(department)
         db.session.flush()
 
-        # Create Roles if they don't exist
-        admin_role = Roles.query.filter_by(role_name='Admin').first()
-        if not admin_role:
+        # Roles must already exist (loaded from the role registry)
+        if not role_registry.id_for('Admin'):
             return jsonify({'error': 'Admin role not found. Please run "flask seed_roles" first.'}), 500
 
-        professor_role = Roles.query.filter_by(role_name='Professor').first()
-        student_role = Roles.query.filter_by(role_name='Student').first()
+        professor_role_id = role_registry.id_for('Professor')
+        student_role_id = role_registry.id_for('Student')
 
         # Create a Professor and a User account for the professor
         professor_user = Users(
             username='prof.demir',
             password='123',
             email='prof.demir@example.com',
-            role_id=professor_role.id
+            role_id=professor_role_id
         )
         db.session.add(professor_user)
         db.session.flush()
@@ -48,7 +54,7 @@ def seed_data():
             username='ayse.yilmaz',
             password='123',
             email='ayse.yilmaz@example.com',
-            role_id=student_role.id
+            role_id=student_role_id
         )
         db.session.add(student_user)
         db.session.flush()
@@ -68,7 +74,9 @@ def seed_data():
             course_name='Programlamaya Giriş',
             credits=3,
             department_id=department.id,
-            professor_id=professor.id
+            professor_id=professor.id,
+            capacity=40,
+            enrolled_count=1 # Aşağıdaki kayıt
         )
         db.session.add(course)
         db.session.flush()
@@ -106,9 +114,31 @@ def seed_data():
         db.session.add(announcement)
         
         db.session.commit()
+        invalidate_tables('departments', 'users', 'students', 'professors', 'courses', 'exams',
+                          'course_registrations', 'exam_results')
 
         return jsonify({'message': 'All essential data created successfully.'}), 201
 
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+def _validate_generate_data(params):
+    unknown = params.keys() - DEFAULT_SCALE.keys() - {'prefix', 'seed'}
+    if unknown:
+        raise JobError(f"Geçersiz parametreler: {', '.join(sorted(unknown))}")
+    if not all(isinstance(params[key], int) and params[key] >= 0 for key in params.keys() & DEFAULT_SCALE.keys()):
+        raise JobError('Ölçek değerleri negatif olmayan tam sayılar olmalıdır.')
+    if not isinstance(params.get('prefix', 'gen'), str) or not isinstance(params.get('seed', 42), int):
+        raise JobError('prefix metin, seed tam sayı olmalıdır.')
+
+# Sentetik üniversite verisi üretimi, `flask generate_data` komutunun görev karşılığı (Sadece Admin)
+@job_type('generate_data', concurrency=1, roles=('Admin',), validate=_validate_generate_data)
+def generate_data_job(ctx, params):
+    _validate_generate_data(params)
+    try:
+        counts = generate_university(log=logger.info, **params)
+    except DataGenerationError as e:
+        raise JobError(str(e))
+    invalidate_tables(*counts)
+    return counts
@@ -0,0 +1,94 @@
+from flask.json.provider import JSONProvider
+from models import (db, Users, Departments, Courses, Students, Professors, Course_Registrations,
+                    Exams, Exam_Results, Announcements, Jobs)
+from .pagination import paginate
+from .includes import requested_includes, with_includes, dump_includes
+import decimal
+import orjson
+
+# datetime/date değerleri orjson tarafından doğrudan ISO 8601 olarak yazılır
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value):
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    raise TypeError(f'{type(value).__name__} JSON olarak yazılamıyor')
+
+
+def dumps(obj):
+    """Nesneyi orjson ile JSON baytlarına çevirir."""
+    return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+
+
+class OrjsonProvider(JSONProvider):
+    """`jsonify` ve `request.get_json` için orjson kullanan JSON sağlayıcısı."""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
+
+
+class Schema:
+    """Bir modelin yanıtta yer alan alanları.
+
+    Liste uç noktaları bu kolonları ORM nesnesi oluşturmadan doğrudan satır
+    (tuple) olarak okur ve her satırı alan adlarıyla eşleyerek sözlüğe çevirir.
+    """
+
+    def __init__(self, model, *fields):
+        self.model = model
+        self.fields = fields
+        self.columns = [getattr(model, field) for field in fields]
+        self.key = model.id
+
+    def select(self):
+        return db.select(*self.columns)
+
+    def dump_rows(self, rows):
+        fields = self.fields
+        return [dict(zip(fields, row)) for row in rows]
+
+    def dump(self, obj):
+        return {field: getattr(obj, field) for field in self.fields}
+
+
+USER = Schema(Users, 'id', 'username', 'email', 'role_id')
+DEPARTMENT = Schema(Departments, 'id', 'department_name')
+COURSE = Schema(Courses, 'id', 'course_code', 'course_name', 'credits', 'department_id', 'professor_id', 'capacity')
+STUDENT = Schema(Students, 'id', 'student_id', 'first_name', 'last_name', 'user_id', 'department_id')
+PROFESSOR = Schema(Professors, 'id', 'first_name', 'last_name', 'title', 'user_id', 'department_id')
+REGISTRATION = Schema(Course_Registrations, 'id', 'student_id', 'course_id', 'registration_date')
+EXAM = Schema(Exams, 'id', 'exam_type', 'exam_date', 'course_id')
+EXAM_RESULT = Schema(Exam_Results, 'id', 'student_id', 'exam_id', 'grade')
+STUDENT_EXAM_RESULT = Schema(Exam_Results, 'exam_id', 'grade')
+ANNOUNCEMENT = Schema(Announcements, 'id', 'title', 'content', 'date_posted', 'course_id')
+# Akışta içerik taşınmaz; tam metin /announcements/<id> ile istenir
+ANNOUNCEMENT_SUMMARY = Schema(Announcements, 'id', 'title', 'date_posted', 'course_id')
+# Sonuç (result) yalnızca /jobs/<id>/result ile indirilir
+JOB = Schema(Jobs, 'id', 'job_type', 'status', 'progress', 'total', 'error', 'attempts', 'created_by',
+             'created_at', 'started_at', 'finished_at')
+
+
+def dump_page(schema, allowed_includes=(), criteria=()):
+    """Bir sayfa kaydı şemaya göre sözlük listesi olarak döndürür.
+
+    İlişki istenmemişse yalnızca şemanın kolonları seçilir; `include` ile
+    ilişki istendiğinde ORM nesneleri önceden yüklenen ilişkileriyle okunur.
+    Sayfadaki kayıtlar ve `next_cursor` döndürülür.
+    """
+    if requested_includes(allowed_includes):
+        query, includes = with_includes(schema.model.query.filter(*criteria), schema.model, allowed_includes)
+        objects, next_cursor = paginate(query, schema.key)
+        return [{**schema.dump(obj), **dump_includes(obj, includes)} for obj in objects], next_cursor
+
+    rows, next_cursor = paginate(schema.select().where(*criteria), schema.key)
+    return schema.dump_rows(rows), next_cursor
@@ -0,0 +1,15 @@
+from flask import jsonify
+from . import api_blueprint
+from .auth import roles_required, principal_cache
+from .caching import response_cache
+from .students import transcript_cache
+
+# Önbelleklerin isabet/ıskalama/atılma sayaçları (Sadece Admin)
+@api_blueprint.route('/cache/stats', methods=['GET'])
+@roles_required(['Admin'])
+def get_cache_stats(current_user):
+    return jsonify({
+        'responses': response_cache.stats(),
+        'principals': principal_cache.stats(),
+        'transcripts': transcript_cache.stats()
+    })
@@ -1,13 +1,33 @@
-from flask import request, jsonify
+from flask import request, jsonify, current_app
 from . import api_blueprint
-from models import db, Users, Students, Roles
-from .auth import token_required, roles_required
+from models import db, Users, Students, Courses, Exams, Exam_Results
+from .auth import token_required, roles_required, invalidate_principal
+from .roles import role_registry
+from .includes import with_includes, dump_includes
+from .export import wants_ndjson, ndjson_response
+from .filters import list_filters
+from .serializers import STUDENT, dump_page, dumps
+from .caching import KeyedCache, response_cache, invalidate_tables
+from hashing import password_hasher
+
+# Öğrenci bazında transkript önbelleği; yanıt önbelleğinin arka ucunda (Redis varsa tüm
+# işçilerde ortak) tutulur, not yazıldığında öğrencinin sürümü artırılarak geçersizleşir
+transcript_cache = KeyedCache('transcript', ttl=300)
+
+def invalidate_transcript(*student_ids):
+    transcript_cache.invalidate(*student_ids)
+
+# Öğrenci detay yanıtının (include ile birlikte) dayandığı tablolar
+STUDENT_TABLES = ('students', 'departments', 'users', 'course_registrations', 'exam_results')
 
 # Yeni bir öğrenci ve kullanıcı hesabı oluşturma (Sadece Admin)
 @api_blueprint.route('/students', methods=['POST'])
 @roles_required(['Admin'])
 def create_student(current_user):
     data = request.get_json()
+    if isinstance(data, list):
+        return create_students_bulk(data)
+
     username = data.get('username')
     password = data.get('password')
     email = data.get('email')
@@ -19,15 +39,15 @@ def create_student(current_user):
     if not all([username, password, email, student_id, first_name, last_name, department_id]):
         return jsonify({'error': 'Gerekli veriler eksik'}), 400
 
-    student_role = Roles.query.filter_by(role_name='Student').first()
-    if not student_role:
+    student_role_id = role_registry.id_for('Student')
+    if not student_role_id:
         return jsonify({'error': 'Öğrenci rolü bulunamadı'}), 500
 
     new_user = Users(
         username=username,
         password=password,
         email=email,
-        role_id=student_role.id
+        role_id=student_role_id
     )
 
     try:
@@ -43,6 +63,7 @@ def create_student(current_user):
         )
         db.session.add(new_student)
         db.session.commit()
+        invalidate_tables('students', 'users')
         
         return jsonify({
             'message': 'Öğrenci ve kullanıcı hesabı başarıyla oluşturuldu',
@@ -53,39 +74,129 @@ def create_student(current_user):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+STUDENT_FIELDS = ['username', 'password', 'email', 'student_id', 'first_name', 'last_name', 'department_id']
+
+def create_students_bulk(rows):
+    """Bir dizi öğrenciyi tek işlemde oluşturur; parolalar hash havuzunda paralel hashlenir."""
+    missing = [index for index, row in enumerate(rows)
+               if not isinstance(row, dict) or not all(row.get(field) for field in STUDENT_FIELDS)]
+    if missing:
+        return jsonify({'error': 'Gerekli veriler eksik', 'rows': missing}), 400
+
+    student_role_id = role_registry.id_for('Student')
+    if not student_role_id:
+        return jsonify({'error': 'Öğrenci rolü bulunamadı'}), 500
+
+    hashes = password_hasher.hash_many(row['password'] for row in rows)
+    users = [
+        Users(username=row['username'], _password=hashed, email=row['email'], role_id=student_role_id)
+        for row, hashed in zip(rows, hashes)
+    ]
+
+    try:
+        db.session.add_all(users)
+        db.session.flush()
+        students = [
+            Students(
+                student_id=row['student_id'],
+                first_name=row['first_name'],
+                last_name=row['last_name'],
+                user_id=user.id,
+                department_id=row['department_id']
+            )
+            for row, user in zip(rows, users)
+        ]
+        db.session.add_all(students)
+        db.session.flush()
+        # id'ler commit'ten önce alınır; commit sonrası her nesne yeniden sorgulanmasın
+        created = [{'user_id': user.id, 'student_id': student.id} for user, student in zip(users, students)]
+        db.session.commit()
+        invalidate_tables('students', 'users')
+
+        return jsonify({
+            'message': f'{len(students)} öğrenci ve kullanıcı hesabı başarıyla oluşturuldu',
+            'created': created
+        }), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 # Tüm öğrencileri listeleme (Sadece Admin ve Professor)
 @api_blueprint.route('/students', methods=['GET'])
 @roles_required(['Admin', 'Professor'])
 def get_all_students(current_user):
-    students = Students.query.all()
-    output = []
-    for student in students:
-        output.append({
-            'id': student.id,
-            'student_id': student.student_id,
-            'first_name': student.first_name,
-            'last_name': student.last_name,
-            'user_id': student.user_id,
-            'department_id': student.department_id
-        })
-    return jsonify({'students': output})
+    criteria = list_filters(
+        equals={'department_id': Students.department_id},
+        search={'name': (Students.first_name, Students.last_name)}
+    )
+    if wants_ndjson():
+        return ndjson_response(STUDENT, where=criteria)
+
+    students, next_cursor = dump_page(STUDENT, ['department', 'user'], criteria)
+    return jsonify({'students': students, 'next_cursor': next_cursor})
 
 # Belirli bir öğrenciyi ID ile getirme (Herkes, kendi bilgisine erişir)
 @api_blueprint.route('/students/<int:student_id>', methods=['GET'])
 @token_required
+@response_cache.cached(*STUDENT_TABLES, per_user=True)
 def get_student(current_user, student_id):
-    student = Students.query.get_or_404(student_id)
-    if current_user.role.role_name == 'Student' and student.user_id != current_user.id:
+    query, includes = with_includes(
+        Students.query, Students, ['department', 'user', 'course_registrations', 'exam_results']
+    )
+    student = query.filter(Students.id == student_id).first_or_404()
+    if current_user.role_name == 'Student' and student.user_id != current_user.id:
         return jsonify({'message': 'Erişim Reddedildi: Yalnızca kendi öğrenci bilgilerinizi görüntüleyebilirsiniz'}), 403
     
-    return jsonify({
-        'id': student.id,
-        'student_id': student.student_id,
-        'first_name': student.first_name,
-        'last_name': student.last_name,
-        'user_id': student.user_id,
-        'department_id': student.department_id
-    })
+    return jsonify({**STUDENT.dump(student), **dump_includes(student, includes)})
+
+# Bir öğrencinin ders ortalamaları ve kredi ağırlıklı not ortalaması (Admin, Professor ve Öğrenci)
+@api_blueprint.route('/students/<int:student_id>/transcript', methods=['GET'])
+@token_required
+def get_student_transcript(current_user, student_id):
+    if current_user.role_name == 'Student' and student_id != current_user.student_id:
+        return jsonify({'message': 'Erişim Reddedildi: Yalnızca kendi transkriptinizi görüntüleyebilirsiniz'}), 403
+
+    entry, body = transcript_cache.lookup(student_id)
+    if body is None:
+        rows = db.session.execute(
+            db.select(
+                Courses.id, Courses.course_code, Courses.course_name, Courses.credits,
+                db.func.avg(Exam_Results.grade), db.func.count(Exam_Results.id)
+            )
+            .join(Exams, Exams.id == Exam_Results.exam_id)
+            .join(Courses, Courses.id == Exams.course_id)
+            .where(Exam_Results.student_id == student_id)
+            .group_by(Courses.id, Courses.course_code, Courses.course_name, Courses.credits)
+            .order_by(Courses.course_code)
+        ).all()
+        if not rows and not db.session.get(Students, student_id):
+            return jsonify({'message': 'Öğrenci bulunamadı.'}), 404
+
+        courses = []
+        total_credits = 0
+        weighted_sum = 0.0
+        for course_id, course_code, course_name, credits, average, exam_count in rows:
+            courses.append({
+                'course_id': course_id,
+                'course_code': course_code,
+                'course_name': course_name,
+                'credits': credits,
+                'average': round(average, 2),
+                'exam_count': exam_count
+            })
+            total_credits += credits
+            weighted_sum += average * credits
+
+        transcript = {
+            'student_id': student_id,
+            'courses': courses,
+            'total_credits': total_credits,
+            'gpa': round(weighted_sum / total_credits, 2) if total_credits else None
+        }
+        body = dumps(transcript)
+        transcript_cache.store(entry, body)
+
+    return current_app.response_class(body, mimetype='application/json')
 
 # Öğrenci silme (Sadece Admin)
 @api_blueprint.route('/students/<int:student_id>', methods=['DELETE'])
@@ -100,6 +211,9 @@ def delete_student(current_user, student_id):
             db.session.delete(user)
         
         db.session.commit()
+        invalidate_principal(user_id)
+        invalidate_transcript(student_id)
+        invalidate_tables('students', 'users')
         return jsonify({'message': 'Öğrenci ve ilgili kullanıcı hesabı başarıyla silindi'})
     except Exception as e:
         db.session.rollback()
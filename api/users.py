@@ -1,23 +1,18 @@
 from flask import request, jsonify
 from . import api_blueprint
-from models import db, Users, Roles # 'Roles' modelini import etmeyi unutma
-from .auth import token_required, roles_required
+from models import db, Users
+from .auth import token_required, roles_required, invalidate_principal
+from .roles import role_registry
+from .includes import with_includes, dump_includes
+from .caching import invalidate_tables
+from .serializers import USER, dump_page
 
 # Tüm kullanıcıları getirme (Sadece Admin)
 @api_blueprint.route('/users', methods=['GET'])
 @roles_required(['Admin'])
 def get_all_users(current_user):
-    users = Users.query.all()
-    output = []
-    for user in users:
-        user_data = {
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'role_id': user.role_id
-        }
-        output.append(user_data)
-    return jsonify({'users': output})
+    users, next_cursor = dump_page(USER, ['student', 'professor'])
+    return jsonify({'users': users, 'next_cursor': next_cursor})
 
 # Yeni kullanıcı oluşturma (Sadece Admin)
 @api_blueprint.route('/users', methods=['POST'])
@@ -42,8 +37,8 @@ def create_user(current_user):
         return jsonify({'error': 'Kullanıcı adı veya e-posta zaten kullanımda'}), 409
     
     # Role'ün varlığını kontrol et
-    role = db.session.get(Roles, role_id)
-    if not role:
+    role_name = role_registry.name_for(role_id)
+    if not role_name:
         return jsonify({'error': 'Geçersiz rol belirtildi'}), 400
 
     new_user = Users(
@@ -56,11 +51,12 @@ def create_user(current_user):
     try:
         db.session.add(new_user)
         db.session.commit()
+        invalidate_tables('users')
         return jsonify({
             'message': 'User created successfully',
             'user_id': new_user.id,
             'username': new_user.username,
-            'role_name': new_user.role.role_name
+            'role_name': role_name
         }), 201
     except Exception as e:
         db.session.rollback()
@@ -70,26 +66,25 @@ def create_user(current_user):
 @api_blueprint.route('/users/<int:user_id>', methods=['GET'])
 @token_required
 def get_user(current_user, user_id):
-    if current_user.id != user_id and current_user.role.role_name != 'Admin':
+    if current_user.id != user_id and current_user.role_name != 'Admin':
         return jsonify({'message': 'Erişim Reddedildi: Yalnızca kendi profilinizi görüntüleyebilirsiniz veya yetkiniz yok'}), 403
     
-    user = Users.query.get_or_404(user_id)
+    query, includes = with_includes(Users.query, Users, ['student', 'professor'])
+    user = query.filter(Users.id == user_id).first_or_404()
     if not user:
         return jsonify({'message': 'Kullanıcı bulunamadı'}), 404
     
     return jsonify({
-        'id': user.id,
-        'username': user.username,
-        'email': user.email,
-        'role_id': user.role_id,
-        'role_name': user.role.role_name # Rol adını da ekle
+        **USER.dump(user),
+        'role_name': role_registry.name_for(user.role_id), # Rol adını da ekle
+        **dump_includes(user, includes)
     })
 
 # Kullanıcı güncelleme (Kullanıcı kendisi veya Admin)
 @api_blueprint.route('/users/<int:user_id>', methods=['PUT'])
 @token_required
 def update_user(current_user, user_id):
-    if current_user.id != user_id and current_user.role.role_name != 'Admin':
+    if current_user.id != user_id and current_user.role_name != 'Admin':
         return jsonify({'message': 'Erişim Reddedildi: Yalnızca kendi profilinizi güncelleyebilirsiniz veya yetkiniz yok.'}), 403
     
     user = Users.query.get_or_404(user_id)
@@ -102,6 +97,8 @@ def update_user(current_user, user_id):
 
     try:
         db.session.commit()
+        invalidate_principal(user_id)
+        invalidate_tables('users')
         return jsonify({'message': 'Kullanıcı başarıyla güncellendi.'})
     except Exception as e:
         db.session.rollback()
@@ -115,6 +112,8 @@ def delete_user(current_user, user_id):
     try:
         db.session.delete(user)
         db.session.commit()
+        invalidate_principal(user_id)
+        invalidate_tables('users')
         return jsonify({'message': 'Kullanıcı başarıyla silindi.'})
     except Exception as e:
         db.session.rollback()
@@ -1,28 +1,96 @@
 from flask import Flask, send_from_directory
-from models import db, bcrypt, Roles, Departments, Users
+from models import db, Roles, Departments, Users
+from hashing import password_hasher
 from api import api_blueprint
+from api.roles import role_registry
+from api.caching import response_cache, invalidate_tables
+from api.routing import read_replica
+from api.pubsub import event_hub
+from api.jobs import job_queue, job_registry, purge_finished
+from api.serializers import OrjsonProvider
+from health import health_blueprint
+from datagen import generate_university, DataGenerationError, DEFAULT_SCALE, DEFAULT_BATCH_SIZE, DEFAULT_PASSWORD
+from metrics import metrics_blueprint, request_metrics
+from sqlalchemy.exc import SQLAlchemyError
 from flask_swagger_ui import get_swaggerui_blueprint
 import os
+import signal
+import threading
+import click
 from flask_cors import CORS
+from flask_migrate import Migrate, upgrade
+from settings import DATABASE_URL, SECRET_KEY, engine_options_from_env
 
 # Flask uygulaması
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
 # Veritabanı bağlantı ayarları
-app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get(
-    'DATABASE_URL',
-    'postgresql://postgres:1234@db:5432/akademik_yonetim'
-)
+app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SECRET_KEY'] = 'sifreleme_icin_cok_gizli_bir_anahtar'
+app.config['SECRET_KEY'] = SECRET_KEY
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options_from_env(DATABASE_URL)
+
+# İsteğe bağlı okuma kopyası: GET isteklerindeki sorgular buraya yönlendirilir
+app.config['DATABASE_READ_URL'] = os.environ.get('DATABASE_READ_URL')
+if app.config['DATABASE_READ_URL']:
+    app.config['SQLALCHEMY_READ_ENGINE_OPTIONS'] = engine_options_from_env(app.config['DATABASE_READ_URL'])
+# Kullanıcının kendi yazmasından sonra okumalarının birincilden yapılacağı süre (saniye)
+app.config['READ_YOUR_WRITES_SECONDS'] = int(os.environ.get('READ_YOUR_WRITES_SECONDS', 5))
+
+# Herkese açık katalog yanıtlarının (bölüm, ders, akademisyen) vekil sunucuda önbellek süresi
+app.config['CATALOG_MAX_AGE'] = int(os.environ.get('CATALOG_MAX_AGE', 30))
+
+# Yanıt önbelleği: CACHE_REDIS_URL verilirse tüm işçiler ortak Redis'i, yoksa süreç içi LRU'yu kullanır
+app.config['CACHE_REDIS_URL'] = os.environ.get('CACHE_REDIS_URL')
+app.config['CACHE_TTL'] = int(os.environ.get('CACHE_TTL', 300))
+app.config['CACHE_SIZE'] = int(os.environ.get('CACHE_SIZE', 10000))
 
-# SQLAlchemy ve Bcrypt nesnelerini uygulamaya bağlama
+# Bu süreyi (ms) aşan SQL ifadeleri slow_query loguna yazılır; SERVER_TIMING=1 yanıta Server-Timing başlığı ekler
+app.config['SLOW_QUERY_MS'] = int(os.environ.get('SLOW_QUERY_MS', 200))
+app.config['SERVER_TIMING'] = os.environ.get('SERVER_TIMING', '0') == '1'
+
+# Anlık olaylar (/api/events): EVENT_BROKER_URL bir Postgres adresiyse olaylar LISTEN/NOTIFY ile
+# tüm işçilere dağıtılır; verilmezse yalnızca aynı süreçteki abonelere ulaşır
+app.config['EVENT_BROKER_URL'] = os.environ.get('EVENT_BROKER_URL')
+app.config['EVENTS_HEARTBEAT_SECONDS'] = int(os.environ.get('EVENTS_HEARTBEAT_SECONDS', 15))
+# EventSource'un ?access_token= ile bağlandığı akış token'ının ömrü (saniye)
+app.config['EVENTS_TOKEN_SECONDS'] = int(os.environ.get('EVENTS_TOKEN_SECONDS', 60))
+
+# Arka plan görevleri (/api/jobs): web süreci ilk görevde JOBS_EMBEDDED_THREADS iş parçacıklı bir havuz açar.
+# 0 verilirse görevleri yalnızca `flask worker` süreçleri çalıştırır. JOBS_CONCURRENCY tür başına
+# eşzamanlılık sınırlarını değiştirir, ör. "export=2,registrations_import=1"
+app.config['JOBS_EMBEDDED_THREADS'] = int(os.environ.get('JOBS_EMBEDDED_THREADS', 2))
+app.config['JOBS_POLL_SECONDS'] = float(os.environ.get('JOBS_POLL_SECONDS', 2))
+app.config['JOBS_CONCURRENCY'] = {
+    name: int(limit) for name, limit in
+    (item.split('=') for item in os.environ.get('JOBS_CONCURRENCY', '').split(',') if item)
+}
+
+# SQLAlchemy, parola hash havuzu, yanıt önbelleği, okuma kopyası, olay dağıtımı, görev kuyruğu ve istek metriklerini uygulamaya bağlama
 db.init_app(app)
-bcrypt.init_app(app)
+password_hasher.init_app(app)
+response_cache.init_app(app)
+read_replica.init_app(app)
+event_hub.init_app(app)
+job_queue.init_app(app)
+request_metrics.init_app(app)
+
+# Şema değişiklikleri (indeksler vb.) migrations/ altındaki Alembic sürümleriyle uygulanır
+migrate = Migrate(app, db)
 
 # Ana API blueprint'ini uygulamaya kaydetme
 app.register_blueprint(api_blueprint, url_prefix='/api')
+app.register_blueprint(health_blueprint)
+app.register_blueprint(metrics_blueprint)
+
+# Rol tablosunu açılışta bir kez belleğe al (tablolar henüz yoksa ilk istekte yüklenir)
+with app.app_context():
+    try:
+        role_registry.load()
+    except SQLAlchemyError:
+        role_registry.clear()
 
 # Swagger UI'ı ayarlama
 SWAGGER_URL = '/api/docs'
@@ -60,14 +128,15 @@ def seed_roles():
         ]
         db.session.add_all(roles_to_add)
         db.session.commit()
+        role_registry.load()
         print("Başlangıç rolleri başarıyla eklendi.")
 
 @app.cli.command("create_admin")
 def create_admin():
     """Create an initial admin user."""
     with app.app_context():
-        admin_role = Roles.query.filter_by(role_name='Admin').first()
-        if not admin_role:
+        admin_role_id = role_registry.id_for('Admin')
+        if not admin_role_id:
             print("Hata: 'Admin' rolü bulunamadı. Lütfen önce 'flask seed_roles' komutunu çalıştırın.")
             return
         
@@ -79,14 +148,72 @@ def create_admin():
             username='admin',
             password='123',
             email='admin@university.edu',
-            role_id=admin_role.id
+            role_id=admin_role_id
         )
         db.session.add(new_admin)
         db.session.commit()
         print("Admin kullanıcısı başarıyla oluşturuldu.")
 
+@app.cli.command("generate_data")
+@click.option('--departments', type=int, default=DEFAULT_SCALE['departments'], show_default=True)
+@click.option('--professors', type=int, default=DEFAULT_SCALE['professors'], show_default=True)
+@click.option('--students', type=int, default=DEFAULT_SCALE['students'], show_default=True)
+@click.option('--courses', type=int, default=DEFAULT_SCALE['courses'], show_default=True)
+@click.option('--registrations', type=int, default=DEFAULT_SCALE['registrations'], show_default=True)
+@click.option('--exam-results', type=int, default=DEFAULT_SCALE['exam_results'], show_default=True)
+@click.option('--announcements', type=int, default=DEFAULT_SCALE['announcements'], show_default=True)
+@click.option('--prefix', default='gen', show_default=True, help='Kullanıcı adı, ders kodu vb. öneki')
+@click.option('--seed', type=int, default=42, show_default=True)
+@click.option('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, show_default=True)
+def generate_data(prefix, seed, batch_size, **scale):
+    """Generate a synthetic university dataset for load tests."""
+    with app.app_context():
+        try:
+            counts = generate_university(prefix=prefix, seed=seed, batch_size=batch_size, log=click.echo, **scale)
+        except DataGenerationError as e:
+            print(f"Hata: {e}")
+            return
+        invalidate_tables(*counts)
+        print(f"Veri üretimi tamamlandı. Kullanıcı adları '{prefix}_student0', '{prefix}_prof0'...; parola: {DEFAULT_PASSWORD}")
+
+@app.cli.command("worker")
+@click.option('--threads', type=int, default=2, show_default=True, help='Aynı anda çalışabilecek görev sayısı')
+@click.option('--types', default=None, help='Yalnızca bu görev türleri (virgülle ayrılmış)')
+@click.option('--limit', 'limits', multiple=True, help='Tür başına eşzamanlılık sınırı, ör. --limit export=2')
+@click.option('--once', is_flag=True, help='Kuyruktaki görevleri bitirip çık')
+def worker(threads, types, limits, once):
+    """Run background jobs from the jobs table in this process."""
+    types = types.split(',') if types else None
+    unknown = set(types or ()) - set(job_registry.names())
+    if unknown:
+        print(f"Hata: bilinmeyen görev türü: {', '.join(sorted(unknown))}")
+        return
+    pool = job_queue.create_pool(threads, types, {name: int(limit) for name, limit in (item.split('=') for item in limits)})
+    if once:
+        print(f"{pool.drain()} görev çalıştırıldı.")
+        return
+    # SIGTERM (ör. konteyner durdurulurken) Ctrl+C gibi çalışan görevlerin bitmesini bekler
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stopping.set())
+    pool.start()
+    print(f"İşçi başladı ({threads} iş parçacığı, türler: {', '.join(types or job_registry.names())}). Durdurmak için Ctrl+C.")
+    try:
+        while not stopping.wait(1):
+            pass
+    except KeyboardInterrupt:
+        pass
+    print("Çalışan görevlerin bitmesi bekleniyor...")
+    pool.stop()
+
+@app.cli.command("purge_jobs")
+@click.option('--days', type=int, default=7, show_default=True)
+def purge_jobs(days):
+    """Delete finished background jobs older than the given number of days."""
+    with app.app_context():
+        print(f"{purge_finished(days)} görev silindi.")
+
 if __name__ == "__main__":
     with app.app_context():
-        db.create_all()
+        upgrade()
         print("Tüm veritabanı tabloları güncellendi.")
     app.run(host="0.0.0.0", port=5000)
\ No newline at end of file
@@ -0,0 +1,326 @@
+# Yoğun eşzamanlı okuma trafiği için ASGI (asyncio) sunum modu.
+# Çalıştırma: uvicorn asgi_app:app --host 0.0.0.0 --port 8000
+# Aynı models.py şemasını SQLAlchemy'nin asyncio motoruyla kullanır; bağlantı
+# yalnızca sorgu süresince tutulur, bekleyen istekler iş parçacığı işgal etmez.
+from quart import Quart, request, jsonify, make_response
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from collections import namedtuple
+from functools import wraps
+import asyncio
+import datetime
+import os
+import jwt
+from datetime import timezone
+from models import Users, Roles, Students, Professors, Courses, Exam_Results
+from hashing import password_hasher, HashingPoolSaturated, settings_from_env as hashing_settings_from_env
+from settings import DATABASE_URL, SECRET_KEY, engine_options_from_env
+from api.caching import LRUCache, response_cache
+from api.auth import (PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL, DEFAULT_STREAM_TOKEN_SECONDS, stream_token,
+                      token_scope_allowed, principal_version, cached_principal)
+from api.pagination import page_args, PaginationError
+from api.filters import list_filters, FilterError
+from api.serializers import OrjsonProvider, DEPARTMENT, COURSE, PROFESSOR, ANNOUNCEMENT, STUDENT_EXAM_RESULT
+from api.announcements import feed_courses_query
+from api.pubsub import event_hub
+from api.events import (Audience, EventStream, head_query, parse_event_id, SSE_HEADERS, DEFAULT_HEARTBEAT_SECONDS,
+                        DEFAULT_AUDIENCE_REFRESH_SECONDS, DEFAULT_REPLAY_LIMIT)
+
+# Senkron sürücü adlarının asyncio karşılıkları
+ASYNC_DRIVERS = {'postgresql': 'postgresql+asyncpg', 'sqlite': 'sqlite+aiosqlite'}
+
+
+def async_database_url(url):
+    """`postgresql://...` gibi bir adresi asyncio sürücüsü kullanan adrese çevirir."""
+    scheme, rest = url.split('://', 1)
+    return ASYNC_DRIVERS.get(scheme.split('+')[0], scheme) + '://' + rest
+
+
+# Token sahibinin önbellekteki özeti; rol adı aynı sorguda okunur
+AsyncPrincipal = namedtuple('AsyncPrincipal', ['id', 'username', 'role_id', 'role_name', 'student_id', 'professor_id'])
+
+principal_cache = LRUCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL)
+
+
+def create_app(database_url=None):
+    app = Quart(__name__)
+    app.json = OrjsonProvider(app)
+    app.config['SECRET_KEY'] = SECRET_KEY
+    url = async_database_url(database_url or DATABASE_URL)
+    app.engine = create_async_engine(url, **engine_options_from_env(url))
+    app.session = async_sessionmaker(app.engine, expire_on_commit=False)
+
+    # Yazmalar WSGI uygulamasında yapıldığından olayların buraya ulaşması için Postgres aracı gerekir
+    app.config['EVENT_BROKER_URL'] = os.environ.get('EVENT_BROKER_URL')
+    app.config['EVENTS_HEARTBEAT_SECONDS'] = int(os.environ.get('EVENTS_HEARTBEAT_SECONDS', DEFAULT_HEARTBEAT_SECONDS))
+    app.config['EVENTS_TOKEN_SECONDS'] = int(os.environ.get('EVENTS_TOKEN_SECONDS', DEFAULT_STREAM_TOKEN_SECONDS))
+    # Kullanıcı özetlerinin sürümleri WSGI uygulamasıyla aynı önbellek arka ucundan okunur
+    app.config['CACHE_REDIS_URL'] = os.environ.get('CACHE_REDIS_URL')
+    response_cache.init_app(app)
+    event_hub.init_app(app)
+
+    password_hasher.configure(**hashing_settings_from_env())
+
+    register_routes(app)
+    return app
+
+
+async def fetch_all(app, stmt):
+    async with app.session() as session:
+        return (await session.execute(stmt)).all()
+
+
+async def load_principal(app, user_id):
+    """Kullanıcının rol ve profil bilgisini önbellekten, yoksa tek sorguyla getirir.
+
+    Önbellekteki özet WSGI uygulamasıyla aynı sürüme bağlıdır; orada silinen
+    veya rolü değişen kullanıcının özeti burada da kullanılmaz.
+    """
+    # Redis arka ucunda sürüm okuma olay döngüsünü bloklamasın
+    version = await asyncio.to_thread(principal_version, user_id)
+    principal = cached_principal(principal_cache, user_id, version)
+    if principal is not None:
+        return principal
+
+    rows = await fetch_all(app, (
+        select(Users.id, Users.username, Users.role_id, Roles.role_name, Students.id, Professors.id)
+        .join(Roles, Roles.id == Users.role_id)
+        .outerjoin(Students, Students.user_id == Users.id)
+        .outerjoin(Professors, Professors.user_id == Users.id)
+        .where(Users.id == user_id)
+    ))
+    if not rows:
+        return None
+
+    principal = AsyncPrincipal(*rows[0])
+    principal_cache.set(user_id, (version, principal))
+    return principal
+
+
+def token_required(app, allow_query_token=False):
+    """`api.auth.token_required`ın asyncio karşılığı; aynı token'ları kabul eder."""
+    def wrapper(f):
+        @wraps(f)
+        async def decorated(*args, **kwargs):
+            parts = request.headers.get('Authorization', '').split()
+            token = parts[1] if len(parts) == 2 else None
+            from_query = token is None and allow_query_token
+            if from_query:
+                token = request.args.get('access_token')
+            if not token:
+                return jsonify({'message': 'Token is missing'}), 401
+
+            try:
+                data = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
+            except jwt.ExpiredSignatureError:
+                return jsonify({'message': 'Token has expired'}), 401
+            except jwt.InvalidTokenError:
+                return jsonify({'message': 'Token is invalid'}), 401
+
+            current_user = await load_principal(app, data['id'])
+            if current_user is None or data.get('role_id') != current_user.role_id or not token_scope_allowed(data, from_query):
+                return jsonify({'message': 'Token is invalid'}), 401
+
+            return await f(current_user, *args, **kwargs)
+        return decorated
+    return wrapper
+
+
+async def page(app, schema, criteria=()):
+    """Şemanın kolonlarını keyset sayfalamasıyla okur; ORM nesnesi oluşturulmaz.
+
+    WSGI uç noktalarıyla aynı `api.serializers` şemaları kullanıldığı için
+    yanıtların biçimi hangi sunucunun cevap verdiğine bağlı değildir.
+    """
+    limit, after = page_args(request.args, app.config)
+    stmt = schema.select().where(*criteria)
+    if after is not None:
+        stmt = stmt.where(schema.key > after)
+    rows = await fetch_all(app, stmt.order_by(schema.key).limit(limit + 1))
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = getattr(rows[-1], schema.key.key)
+    return schema.dump_rows(rows), next_cursor
+
+
+async def load_audience(app, current_user):
+    query = feed_courses_query(current_user)
+    if query is None:
+        return Audience(current_user)
+    async with app.session() as session:
+        return Audience(current_user, (await session.scalars(query)).all())
+
+
+def register_routes(app):
+    auth = token_required(app)
+    query_auth = token_required(app, allow_query_token=True)
+
+    @app.errorhandler(PaginationError)
+    @app.errorhandler(FilterError)
+    async def handle_bad_request(error):
+        return jsonify({'error': str(error)}), 400
+
+    @app.errorhandler(HashingPoolSaturated)
+    async def handle_saturated(error):
+        response = jsonify({'error': 'Sunucu şu anda yoğun, lütfen kısa süre sonra tekrar deneyin.'})
+        return response, 503, {'Retry-After': str(password_hasher.retry_after)}
+
+    @app.before_request
+    async def reject_includes():
+        # İlişki önyükleme (include/expand) yalnızca WSGI modunda desteklenir
+        if request.args.get('include') or request.args.get('expand'):
+            return jsonify({'error': 'include parametresi bu sunucu modunda desteklenmiyor.'}), 400
+
+    @app.before_serving
+    async def warm_up_pool():
+        # İlk istekler bağlantı kurulumunu beklemesin
+        async with app.engine.connect() as connection:
+            await connection.execute(text('SELECT 1'))
+
+    @app.after_serving
+    async def close_pool():
+        event_hub.close()
+        await app.engine.dispose()
+
+    @app.route('/healthz', methods=['GET'])
+    async def healthz():
+        return jsonify({'status': 'ok'})
+
+    @app.route('/readyz', methods=['GET'])
+    async def readyz():
+        try:
+            async with app.engine.connect() as connection:
+                await connection.execute(text('SELECT 1'))
+        except Exception as e:
+            app.logger.warning('readyz: veritabanına erişilemiyor: %s', e)
+            return jsonify({'status': 'unavailable'}), 503
+        return jsonify({'status': 'ok'})
+
+    @app.route('/api/login', methods=['POST'])
+    async def login():
+        data = await request.get_json()
+        username = data.get('username')
+        password = data.get('password')
+
+        if not all([username, password]):
+            return jsonify({'error': 'Eksik Kullanıcı Adı Veya Parola'}), 400
+
+        rows = await fetch_all(app, select(Users.id, Users.username, Users.role_id, Users._password)
+                               .where(Users.username == username))
+        # bcrypt kontrolü olay döngüsünü bloklamasın diye hash havuzunda, ayrı iş parçacığından beklenir
+        if not rows or not await asyncio.to_thread(password_hasher.check, rows[0][3], password):
+            return jsonify({'error': 'Geçersiz Kullanıcı Adı Veya Parola '}), 401
+
+        user_id, username, role_id, _ = rows[0]
+        token_payload = {
+            'id': user_id,
+            'username': username,
+            'role_id': role_id,
+            'exp': datetime.datetime.now(timezone.utc) + datetime.timedelta(hours=24)
+        }
+        token = jwt.encode(token_payload, app.config['SECRET_KEY'], algorithm='HS256')
+        return jsonify({'message': 'Giriş Başarılı', 'token': token}), 200
+
+    # Tüm bölümleri listeleme (Herkes)
+    @app.route('/api/departments', methods=['GET'])
+    async def get_all_departments():
+        output, next_cursor = await page(app, DEPARTMENT)
+        return jsonify({'departments': output, 'next_cursor': next_cursor})
+
+    # Tüm dersleri listeleme (Herkes)
+    @app.route('/api/courses', methods=['GET'])
+    async def get_all_courses():
+        criteria = list_filters(
+            equals={'department_id': Courses.department_id, 'professor_id': Courses.professor_id},
+            prefix={'course_code': Courses.course_code},
+            args=request.args
+        )
+        output, next_cursor = await page(app, COURSE, criteria)
+        return jsonify({'courses': output, 'next_cursor': next_cursor})
+
+    # Tüm akademisyenleri listeleme (Herkes)
+    @app.route('/api/professors', methods=['GET'])
+    async def get_all_professors():
+        criteria = list_filters(
+            equals={'department_id': Professors.department_id},
+            search={'name': (Professors.first_name, Professors.last_name)},
+            args=request.args
+        )
+        output, next_cursor = await page(app, PROFESSOR, criteria)
+        return jsonify({'professors': output, 'next_cursor': next_cursor})
+
+    # Tüm duyuruları listeleme (Herkes)
+    @app.route('/api/announcements', methods=['GET'])
+    async def get_all_announcements():
+        output, next_cursor = await page(app, ANNOUNCEMENT)
+        return jsonify({'announcements': output, 'next_cursor': next_cursor})
+
+    # Bir öğrencinin sınav sonuçları (Herkes, öğrenci yalnızca kendi sonuçlarını görür)
+    @app.route('/api/exam_results/student/<int:student_id>', methods=['GET'])
+    @auth
+    async def get_student_results(current_user, student_id):
+        if current_user.role_name == 'Student' and student_id != current_user.student_id:
+            return jsonify({'message': 'Erişim Reddedildi: Sadece kendi sınav sonuçlarınızı görebilirsiniz.'}), 403
+
+        rows = await fetch_all(app, STUDENT_EXAM_RESULT.select().where(Exam_Results.student_id == student_id))
+        if not rows:
+            return jsonify({'message': 'Bu öğrenci için sınav sonucu bulunamadı.'}), 404
+        return jsonify({'exam_results': STUDENT_EXAM_RESULT.dump_rows(rows)})
+
+
+    # Olay akışına `?access_token=` ile bağlanmak için kısa ömürlü token (Giriş yapmış herkes)
+    @app.route('/api/events/token', methods=['POST'])
+    @auth
+    async def create_stream_token(current_user):
+        seconds = app.config['EVENTS_TOKEN_SECONDS']
+        token = stream_token(current_user.id, current_user.role_id, app.config['SECRET_KEY'], seconds)
+        return jsonify({'token': token, 'expires_in': seconds}), 200
+
+    # Yeni duyuru ve notların anlık akışı, Server-Sent Events (Giriş yapmış herkes).
+    # Bekleyen bağlantılar iş parçacığı ya da veritabanı bağlantısı tutmaz.
+    @app.route('/api/events', methods=['GET'])
+    @query_auth
+    async def stream_events(current_user):
+        heartbeat = app.config['EVENTS_HEARTBEAT_SECONDS']
+        refresh = app.config.get('EVENTS_AUDIENCE_REFRESH_SECONDS', DEFAULT_AUDIENCE_REFRESH_SECONDS)
+        limit = app.config.get('EVENTS_REPLAY_LIMIT', DEFAULT_REPLAY_LIMIT)
+        cursor = parse_event_id(request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+
+        subscription = event_hub.subscribe(asynchronous=True)
+        try:
+            audience = await load_audience(app, current_user)
+            async with app.session() as session:
+                stream = EventStream(audience, tuple((await session.execute(head_query())).one()), cursor)
+                backlog = []
+                if cursor is not None:
+                    for kind, query in audience.replay_queries(cursor, limit):
+                        backlog += stream.replayed(kind, (await session.execute(query)).all(), limit)
+        except Exception:
+            subscription.close()
+            raise
+
+        async def generate():
+            with subscription:
+                yield stream.open().encode()
+                for chunk in backlog:
+                    yield chunk.encode()
+                while not subscription.dropped:
+                    event = await subscription.get(timeout=heartbeat)
+                    if stream.audience.stale(refresh):
+                        stream.audience = await load_audience(app, current_user)
+                    if event is None:
+                        yield stream.heartbeat().encode()
+                        continue
+                    chunk = stream.live(event)
+                    if chunk is not None:
+                        yield chunk.encode()
+
+        response = await make_response(generate(), 200, {'Content-Type': 'text/event-stream', **SSE_HEADERS})
+        # Akış süresiz açık kalır; Quart'ın yanıt zaman aşımı uygulanmaz
+        response.timeout = None
+        return response
+
+
+app = create_app()
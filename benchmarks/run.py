@@ -0,0 +1,234 @@
+# Çalışan bir API'ye karşı tekrarlanabilir yük testi.
+#
+#   flask generate_data            # önce sentetik veri
+#   python benchmarks/run.py --base-url http://127.0.0.1:5000 --compare HEAD~1
+#
+# Her senaryo için p50/p95/p99 gecikme ve saniyedeki istek sayısı raporlanır;
+# sonuçlar benchmarks/results/<commit>.json dosyasına yazılır ve --compare ile
+# başka bir commit'in sonuçlarıyla karşılaştırılır. Yalnızca standart kütüphane kullanılır.
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import datetime
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+class Client:
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def request(self, method, path, body=None, token=None):
+        """İsteği gönderir; (durum kodu, çözümlenmiş gövde) döndürür."""
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.base_url + urllib.parse.quote(path, safe='/?=&'), data=data, method=method)
+        if data is not None:
+            req.add_header('Content-Type', 'application/json')
+        if token:
+            req.add_header('Authorization', f'Bearer {token}')
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                status, payload = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, payload = e.code, e.read()
+        except (urllib.error.URLError, OSError):
+            # Bağlantı hatası veya zaman aşımı; hata olarak sayılır
+            return None, None
+        try:
+            return status, json.loads(payload) if payload else None
+        except ValueError:
+            return status, None
+
+    def login(self, username, password):
+        status, body = self.request('POST', '/api/login', {'username': username, 'password': password})
+        if status != 200:
+            raise SystemExit(f'{username} ile giriş yapılamadı ({status}): {body}')
+        return body['token']
+
+
+class Fixture:
+    """Senaryoların kullanacağı id'leri ve token'ları API üzerinden bir kez toplar."""
+
+    def __init__(self, client, args):
+        self.admin_token = client.login(args.username, args.password)
+        self.password = args.user_password
+        self.prefix = args.prefix
+        self.student_token = client.login(f'{args.prefix}_student0', args.user_password)
+        self.students = self._ids(client, '/api/students?limit=100')
+        courses = client.request('GET', '/api/courses?limit=100&include=exams', token=self.admin_token)[1]['courses']
+        self.courses = [course['id'] for course in courses]
+        self.exams = [exam['id'] for course in courses for exam in course.get('exams', [])]
+        if not (self.students and self.courses and self.exams):
+            raise SystemExit('Veritabanında öğrenci, ders veya sınav yok; önce "flask generate_data" çalıştırın.')
+
+    def _ids(self, client, path):
+        status, body = client.request('GET', path, token=self.admin_token)
+        return [row['id'] for row in next(v for v in body.values() if isinstance(v, list))] if status == 200 else []
+
+
+def scenarios(client, fixture, rng):
+    """Senaryo adı -> (beklenen durum kodları, tek isteği çalıştıran fonksiyon)."""
+    token = fixture.admin_token
+    return {
+        'login': ({200}, lambda: client.request('POST', '/api/login', {
+            'username': f'{fixture.prefix}_student{rng.randrange(len(fixture.students))}',
+            'password': fixture.password})),
+        'list_courses': ({200}, lambda: client.request('GET', '/api/courses')),
+        'list_departments': ({200}, lambda: client.request('GET', '/api/departments')),
+        'list_professors': ({200}, lambda: client.request('GET', '/api/professors?name=Yıl')),
+        'list_students': ({200}, lambda: client.request('GET', '/api/students', token=token)),
+        'list_announcements': ({200}, lambda: client.request('GET', '/api/announcements', token=token)),
+        'my_announcements': ({200}, lambda: client.request('GET', '/api/me/announcements', token=fixture.student_token)),
+        'gradebook': ({200}, lambda: client.request(
+            'GET', f'/api/courses/{rng.choice(fixture.courses)}/gradebook', token=token)),
+        'get_student': ({200}, lambda: client.request(
+            'GET', f'/api/students/{rng.choice(fixture.students)}', token=token)),
+        'register': ({201, 202, 409}, lambda: client.request('POST', '/api/registrations', {
+            'student_id': rng.choice(fixture.students), 'course_id': rng.choice(fixture.courses)}, token=token)),
+        'grade_entry': ({201, 409}, lambda: client.request('POST', '/api/exam_results', {
+            'student_id': rng.choice(fixture.students), 'exam_id': rng.choice(fixture.exams),
+            'grade': round(rng.uniform(0, 100), 1)}, token=token)),
+    }
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, elapsed):
+    """Gecikme listesini (saniye) rapor satırına çevirir; süreler milisaniye cinsindendir."""
+    values = sorted(latencies)
+    ms = lambda v: round(v * 1000, 2) if v is not None else None
+    return {
+        'requests': len(values),
+        'errors': errors,
+        'throughput_rps': round(len(values) / elapsed, 1) if elapsed else None,
+        'mean_ms': ms(statistics.fmean(values)) if values else None,
+        'p50_ms': ms(percentile(values, 50)),
+        'p95_ms': ms(percentile(values, 95)),
+        'p99_ms': ms(percentile(values, 99)),
+    }
+
+
+def run_scenario(expected, call, requests, concurrency, warmup):
+    for _ in range(warmup):
+        call()
+    latencies, errors = [], 0
+    lock = threading.Lock()
+
+    def one(_):
+        nonlocal errors
+        started = time.perf_counter()
+        status, _body = call()
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            if status not in expected:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def git_revision(ref='HEAD'):
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', ref], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def git_dirty():
+    try:
+        return bool(subprocess.check_output(['git', 'status', '--porcelain', '--untracked-files=no'], text=True).strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_results(ref):
+    """Commit (veya dosya yolu) için kaydedilmiş sonuçları okur."""
+    path = ref if os.path.isfile(ref) else os.path.join(RESULTS_DIR, f'{git_revision(ref) or ref}.json')
+    if not os.path.isfile(path):
+        raise SystemExit(f'Karşılaştırılacak sonuç bulunamadı: {path}')
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def print_report(results, baseline=None):
+    header = f"{'senaryo':<20}{'istek':>7}{'hata':>6}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print('-' * len(header))
+    for name, row in results['scenarios'].items():
+        line = (f"{name:<20}{row['requests']:>7}{row['errors']:>6}{row['throughput_rps']:>9}"
+                f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}")
+        base = (baseline or {}).get('scenarios', {}).get(name)
+        if base and base.get('p95_ms'):
+            line += f"   p95 {(row['p95_ms'] - base['p95_ms']) / base['p95_ms'] * 100:+.1f}%"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Akademik Yönetim API benchmark paketi')
+    parser.add_argument('--base-url', default=os.environ.get('BENCH_BASE_URL', 'http://127.0.0.1:5000'))
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default='123')
+    parser.add_argument('--prefix', default='gen', help='generate_data ile kullanılan önek')
+    parser.add_argument('--user-password', default='password123', help='Üretilen kullanıcıların parolası')
+    parser.add_argument('--scenarios', help='Virgülle ayrılmış senaryo adları (varsayılan: hepsi)')
+    parser.add_argument('--requests', type=int, default=500, help='Senaryo başına istek sayısı')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Sonuç dosyası (varsayılan: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='Karşılaştırılacak commit veya sonuç dosyası')
+    args = parser.parse_args(argv)
+
+    client = Client(args.base_url)
+    rng = random.Random(args.seed)
+    fixture = Fixture(client, args)
+    available = scenarios(client, fixture, rng)
+    selected = args.scenarios.split(',') if args.scenarios else list(available)
+    unknown = set(selected) - available.keys()
+    if unknown:
+        raise SystemExit(f"Bilinmeyen senaryo: {', '.join(sorted(unknown))}")
+
+    results = {
+        'commit': git_revision(),
+        'dirty': git_dirty(),
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'base_url': args.base_url,
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'scenarios': {},
+    }
+    for name in selected:
+        expected, call = available[name]
+        results['scenarios'][name] = run_scenario(expected, call, args.requests, args.concurrency, args.warmup)
+        print(f'{name}: tamamlandı', file=sys.stderr)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{results['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    print_report(results, load_results(args.compare) if args.compare else None)
+    print(f'\nSonuçlar: {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+# Büyük veri kümelerini ORM'yi ve parola setter'ını atlayarak yükleme.
+# Postgres'te (psycopg2) satırlar COPY FROM STDIN ile akıtılır; diğer
+# veritabanlarında ve sürücülerde parça parça executemany kullanılır.
+from models import db
+import datetime
+import io
+
+DEFAULT_BATCH_SIZE = 10000
+
+# COPY text biçiminde kaçışlanması gereken karakterler
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+class BulkLoadError(Exception):
+    """Tablolar yabancı anahtar sırasına aykırı yüklendiğinde fırlatılır."""
+
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, str):
+        return value.translate(_COPY_ESCAPES)
+    return str(value)
+
+
+class _CopyStream(io.RawIOBase):
+    """Satır üretecini COPY'nin okuyacağı dosya benzeri bir akışa çevirir; veri bellekte birikmez."""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._buffer = b''
+        self.count = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            line = ('\t'.join(map(_copy_value, row)) + '\n').encode('utf-8')
+            chunks.append(line)
+            length += len(line)
+            self.count += 1
+        data = b''.join(chunks)
+        if size < 0:
+            self._buffer = b''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+class BulkLoader:
+    """Tabloları tek bir işlem (transaction) içinde hızlıca yükler.
+
+    Satırlar `columns` sırasıyla tuple olarak verilir. Başka tablolardan
+    referans verilecek satırların id'leri `reserve_ids` ile önceden ayrılır;
+    böylece COPY'nin RETURNING desteklememesi sorun olmaz. Tablolar
+    models.py'deki yabancı anahtar sırasıyla yüklenmelidir: bir tablo,
+    kendisine referans veren bir tablo yüklendikten sonra yüklenemez.
+    Değişiklikler `commit` çağrılana kadar kalıcı olmaz.
+    """
+
+    def __init__(self, session=None, batch_size=DEFAULT_BATCH_SIZE):
+        self.session = session or db.session
+        self.dialect = self.connection.dialect
+        self.batch_size = batch_size
+        self.uses_copy = self.dialect.name == 'postgresql' and self.dialect.driver == 'psycopg2'
+        self._loaded = []
+        self._reserved = {}
+
+    @property
+    def connection(self):
+        # commit sonrası oturum yeni bir bağlantı/işlem açar
+        return self.session.connection()
+
+    def reserve_ids(self, model, count):
+        """Tablo için ardışık `count` id ayırır ve range olarak döndürür."""
+        table = model.__table__
+        if count <= 0:
+            return range(0)
+        if self.dialect.name == 'postgresql':
+            # Tablo kilidi, ayrılan aralığa işlem bitene kadar başka INSERT'in sıra numarası almasını engeller
+            name = self.dialect.identifier_preparer.format_table(table)
+            self.connection.exec_driver_sql(f'LOCK TABLE {name} IN SHARE ROW EXCLUSIVE MODE')
+            sequence = self.connection.scalar(db.select(db.func.pg_get_serial_sequence(table.name, 'id')))
+            start = self.connection.scalar(db.select(db.func.nextval(sequence)))
+            self.connection.execute(db.select(db.func.setval(sequence, start + count - 1)))
+        else:
+            # Sıra nesnesi olmayan veritabanlarında ayrılan ama henüz yazılmamış aralıklar da hesaba katılır
+            start = max((self.connection.scalar(db.select(db.func.max(table.c.id))) or 0) + 1,
+                        self._reserved.get(table.name, 0))
+            self._reserved[table.name] = start + count
+        return range(start, start + count)
+
+    def load(self, model, columns, rows):
+        """Satırları tabloya yazar ve yazılan satır sayısını döndürür."""
+        table = model.__table__
+        self._check_order(table)
+        if self.uses_copy:
+            count = self._copy(table, columns, rows)
+        else:
+            count = self._executemany(table, columns, rows)
+        self._loaded.append(table.name)
+        return count
+
+    def commit(self):
+        self.session.commit()
+        if self.dialect.name == 'postgresql':
+            # Planlayıcı istatistikleri yeni veri dağılımını hemen yansıtsın
+            for name in dict.fromkeys(self._loaded):
+                self.session.execute(db.text(f'ANALYZE {self.dialect.identifier_preparer.quote(name)}'))
+            self.session.commit()
+        self._loaded = []
+
+    def _check_order(self, table):
+        for name in self._loaded:
+            if any(fk.column.table is table for fk in db.metadata.tables[name].foreign_keys):
+                raise BulkLoadError(f"'{table.name}' tablosu, ona referans veren '{name}' tablosundan önce yüklenmelidir.")
+
+    def _copy(self, table, columns, rows):
+        quote = self.dialect.identifier_preparer.quote
+        sql = 'COPY {} ({}) FROM STDIN'.format(
+            self.dialect.identifier_preparer.format_table(table),
+            ', '.join(quote(table.c[column].name) for column in columns)
+        )
+        stream = _CopyStream(rows)
+        cursor = self.connection.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(sql, stream, size=1 << 16)
+        finally:
+            cursor.close()
+        return stream.count
+
+    def _executemany(self, table, columns, rows):
+        keys = [table.c[column].key for column in columns]
+        stmt = table.insert()
+        count, batch = 0, []
+        for row in rows:
+            batch.append(dict(zip(keys, row)))
+            if len(batch) == self.batch_size:
+                self.connection.execute(stmt, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self.connection.execute(stmt, batch)
+            count += len(batch)
+        return count
@@ -0,0 +1,170 @@
+# Yük testleri ve benchmark'lar için sentetik üniversite verisi.
+# Satırlar üreteçlerle üretilip bulkload.BulkLoader ile (Postgres'te COPY) yazılır;
+# milyonlarca sınav sonucu bile bellekte birikmez. Tüm kullanıcılar önceden bir
+# kez hesaplanan aynı parola hash'ini paylaşır, bcrypt kullanıcı başına çalışmaz.
+from models import db, Roles, Departments, Users, Students, Professors, Courses, Exams, Exam_Results, Announcements, Course_Registrations
+from hashing import password_hasher
+from bulkload import BulkLoader, DEFAULT_BATCH_SIZE
+import datetime
+import itertools
+import math
+import random
+
+DEFAULT_SCALE = {
+    'departments': 50,
+    'professors': 1500,
+    'students': 40000,
+    'courses': 3000,
+    'registrations': 400000,
+    'exam_results': 2000000,
+    'announcements': 6000,
+}
+DEFAULT_PASSWORD = 'password123'
+
+FIRST_NAMES = ['Ahmet', 'Mehmet', 'Ayşe', 'Fatma', 'Ali', 'Zeynep', 'Mustafa', 'Elif', 'Emre', 'Selin',
+               'Burak', 'Deniz', 'Can', 'Ece', 'Hakan', 'İrem', 'Kerem', 'Merve', 'Oğuz', 'Şule']
+LAST_NAMES = ['Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Yıldız', 'Yıldırım', 'Öztürk', 'Aydın', 'Özdemir',
+              'Arslan', 'Doğan', 'Kılıç', 'Aslan', 'Çetin', 'Kara', 'Koç', 'Kurt', 'Özkan', 'Şimşek']
+DEPARTMENT_NAMES = ['Bilgisayar Mühendisliği', 'Elektrik-Elektronik Mühendisliği', 'Makine Mühendisliği',
+                    'Matematik', 'Fizik', 'Kimya', 'Biyoloji', 'İktisat', 'İşletme', 'Hukuk', 'Tarih',
+                    'Psikoloji', 'Sosyoloji', 'Mimarlık', 'Endüstri Mühendisliği']
+TITLES = ['Prof. Dr.', 'Doç. Dr.', 'Dr. Öğr. Üyesi', 'Öğr. Gör.']
+EXAM_TYPES = ['Vize', 'Final', 'Quiz 1', 'Quiz 2', 'Proje', 'Bütünleme']
+
+
+class DataGenerationError(Exception):
+    """Hedef veritabanı veri üretimine hazır değilse fırlatılır."""
+
+
+def generate_university(prefix='gen', seed=42, batch_size=DEFAULT_BATCH_SIZE, password=DEFAULT_PASSWORD,
+                        log=print, **scale):
+    """Veritabanını sentetik bir üniversiteyle doldurur ve tablo başına satır sayılarını döndürür.
+
+    `scale` ile DEFAULT_SCALE değerleri değiştirilir. Kullanıcı adları, öğrenci
+    numaraları, ders kodları ve bölüm adları `prefix` ile başlar; böylece
+    birden çok veri kümesi bir arada bulunabilir, aynı önekle tekrar
+    çalıştırma reddedilir. Aynı `seed` aynı veriyi üretir.
+    """
+    scale = {**DEFAULT_SCALE, **{k: v for k, v in scale.items() if v is not None}}
+    rng = random.Random(seed)
+
+    roles = {role.role_name: role.id for role in Roles.query.all()}
+    if not {'Professor', 'Student'} <= roles.keys():
+        raise DataGenerationError("'Professor' ve 'Student' rolleri bulunamadı. Lütfen önce 'flask seed_roles' komutunu çalıştırın.")
+    if db.session.scalar(db.select(Users.id).where(Users.username.startswith(f'{prefix}_')).limit(1)):
+        raise DataGenerationError(f"'{prefix}' önekiyle oluşturulmuş veri zaten mevcut.")
+
+    loader = BulkLoader(batch_size=batch_size)
+    # Tüm sentetik hesaplar için bcrypt yalnızca bir kez çalışır
+    hashed = password_hasher.hash(password)
+    now = datetime.datetime.now()
+    counts = {}
+
+    def name():
+        return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+    # Tablolar models.py'deki yabancı anahtar sırasıyla yüklenir
+    department_ids = loader.reserve_ids(Departments, scale['departments'])
+    counts['departments'] = loader.load(Departments, ('id', 'department_name'), (
+        (department_id, f'{prefix} {DEPARTMENT_NAMES[i % len(DEPARTMENT_NAMES)]} {i // len(DEPARTMENT_NAMES) + 1}')
+        for i, department_id in enumerate(department_ids)
+    ))
+    log(f"Bölümler: {counts['departments']}")
+
+    professor_user_ids = loader.reserve_ids(Users, scale['professors'])
+    student_user_ids = loader.reserve_ids(Users, scale['students'])
+    counts['users'] = loader.load(Users, ('id', 'username', 'email', '_password', 'role_id'), itertools.chain(
+        ((user_id, f'{prefix}_prof{i}', f'{prefix}_prof{i}@university.test', hashed, roles['Professor'])
+         for i, user_id in enumerate(professor_user_ids)),
+        ((user_id, f'{prefix}_student{i}', f'{prefix}_student{i}@university.test', hashed, roles['Student'])
+         for i, user_id in enumerate(student_user_ids)),
+    ))
+    log(f"Kullanıcılar: {counts['users']}")
+
+    professor_ids = loader.reserve_ids(Professors, len(professor_user_ids))
+    professor_departments = [department_ids[i % len(department_ids)] for i in range(len(professor_ids))]
+    counts['professors'] = loader.load(Professors, ('id', 'first_name', 'last_name', 'title', 'user_id', 'department_id'), (
+        (professor_id, *name(), rng.choice(TITLES), user_id, department_id)
+        for professor_id, user_id, department_id in zip(professor_ids, professor_user_ids, professor_departments)
+    ))
+    log(f"Akademisyenler: {counts['professors']}")
+
+    student_ids = loader.reserve_ids(Students, len(student_user_ids))
+    counts['students'] = loader.load(Students, ('id', 'student_id', 'first_name', 'last_name', 'user_id', 'department_id'), (
+        (student_id, f'{prefix}{i:07d}', *name(), user_id, rng.choice(department_ids))
+        for i, (student_id, user_id) in enumerate(zip(student_ids, student_user_ids))
+    ))
+    log(f"Öğrenciler: {counts['students']}")
+
+    # Her öğrenci ortalama registrations/students derse, aynı dersi bir kez olmak üzere kaydolur
+    registrations = []
+    if student_ids and scale['courses']:
+        per_student = min(scale['courses'], max(1, math.ceil(scale['registrations'] / len(student_ids))))
+        for student_id in student_ids:
+            for course_index in rng.sample(range(scale['courses']), per_student):
+                registrations.append((student_id, course_index))
+                if len(registrations) == scale['registrations']:
+                    break
+            if len(registrations) == scale['registrations']:
+                break
+
+    enrolled = [0] * scale['courses']
+    for _, course_index in registrations:
+        enrolled[course_index] += 1
+
+    # Dersler bölümlerine ait akademisyenlere dağıtılır
+    professors_by_department = {}
+    for professor_id, department_id in zip(professor_ids, professor_departments):
+        professors_by_department.setdefault(department_id, []).append(professor_id)
+    course_ids = loader.reserve_ids(Courses, scale['courses'])
+    course_departments = [department_ids[i % len(department_ids)] for i in range(len(course_ids))]
+    # Kayıt sayacı kayıtlarla tutarlı yazılır; kontenjan, kayıtlı sayısının biraz üzerindedir
+    counts['courses'] = loader.load(Courses, ('id', 'course_code', 'course_name', 'credits', 'department_id', 'professor_id',
+                                              'capacity', 'enrolled_count'), (
+        (course_id, f'{prefix.upper()}{i:05d}', f'Ders {i}', rng.choice((2, 3, 3, 4, 5, 6)), department_id,
+         rng.choice(professors_by_department.get(department_id) or [None]),
+         enrolled[i] + rng.randint(0, 20), enrolled[i])
+        for i, (course_id, department_id) in enumerate(zip(course_ids, course_departments))
+    ))
+    log(f"Dersler: {counts['courses']}")
+
+    # Sınav sonucu hedefine ulaşacak kadar sınav açılır (kayıt başına bir sonuç / sınav)
+    exams_per_course = max(1, math.ceil(scale['exam_results'] / max(1, len(registrations))))
+    exam_ids = loader.reserve_ids(Exams, len(course_ids) * exams_per_course)
+    counts['exams'] = loader.load(Exams, ('id', 'exam_type', 'exam_date', 'course_id'), (
+        (exam_id, EXAM_TYPES[i % exams_per_course % len(EXAM_TYPES)],
+         now - datetime.timedelta(days=rng.randint(0, 120)), course_ids[i // exams_per_course])
+        for i, exam_id in enumerate(exam_ids)
+    ))
+    log(f"Sınavlar: {counts['exams']}")
+
+    counts['course_registrations'] = loader.load(Course_Registrations, ('student_id', 'course_id', 'registration_date'), (
+        (student_id, course_ids[course_index],
+         now - datetime.timedelta(days=rng.randint(0, 120), minutes=rng.randint(0, 1439)))
+        for student_id, course_index in registrations
+    ))
+    log(f"Ders kayıtları: {counts['course_registrations']}")
+
+    def exam_results():
+        produced = 0
+        for student_id, course_index in registrations:
+            for e in range(exams_per_course):
+                if produced == scale['exam_results']:
+                    return
+                grade = min(100.0, max(0.0, round(rng.gauss(68, 16), 1)))
+                yield student_id, exam_ids[course_index * exams_per_course + e], grade
+                produced += 1
+
+    counts['exam_results'] = loader.load(Exam_Results, ('student_id', 'exam_id', 'grade'), exam_results())
+    log(f"Sınav sonuçları: {counts['exam_results']}")
+
+    counts['announcements'] = loader.load(Announcements, ('title', 'content', 'date_posted', 'course_id'), (
+        (f'Duyuru {i}', 'Ders programında değişiklik yapılmıştır.',
+         now - datetime.timedelta(days=rng.randint(0, 120), minutes=rng.randint(0, 1439)),
+         rng.choice(course_ids) if course_ids else None)
+        for i in range(scale['announcements'])
+    ))
+    log(f"Duyurular: {counts['announcements']}")
+
+    loader.commit()
+    return counts
@@ -0,0 +1,61 @@
+# Üretim ortamı için gunicorn ayarları: gunicorn -c gunicorn.conf.py app:app
+# Tüm değerler ortam değişkenleriyle değiştirilebilir.
+import multiprocessing
+import os
+import tempfile
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# İstekler çoğunlukla veritabanını beklediği için her işçi birkaç iş parçacığıyla çalışır
+workers = int(os.environ.get('WEB_CONCURRENCY', cpu_count * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Bellek sızıntılarına karşı işçiler belirli sayıda istekten sonra yenilenir
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 200))
+
+accesslog = '-'
+errorlog = '-'
+# Varsayılan biçimdeki istek satırı (%(r)s) sorgu dizesini de yazar; ?access_token= günlüğe düşmesin
+# diye yalnızca yol (%(U)s) yazılır
+access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(m)s %(U)s %(H)s" %(s)s %(b)s "%(f)s" "%(a)s"'
+
+# Her işçinin havuzu iş parçacığı sayısı kadar bağlantı tutar; fazlası için taşma payı kalır.
+os.environ.setdefault('DB_POOL_SIZE', str(threads))
+# bcrypt süreç havuzu CPU'lar işçiler arasında bölünebiliyorsa kurulur. İşçi sayısı CPU sayısını
+# aştığında (varsayılan 2·CPU+1) ayrı süreç açılmaz; bcrypt GIL'i bıraktığı için hash istek
+# iş parçacığında hesaplanır; toplam eşzamanlılık işçi x iş parçacığı sayısıyla sınırlı kalır.
+os.environ.setdefault('PASSWORD_HASH_WORKERS', str(cpu_count // workers if workers <= cpu_count else 0))
+
+# /metrics hangi işçiye düşerse düşsün tüm işçilerin sayaçlarını döndürsün diye ortak dizin kullanılır
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', tempfile.mkdtemp(prefix='prometheus-'))
+
+
+def child_exit(server, worker):
+    """Kapanan işçinin metrik dosyalarını birleştirmeden çıkarır."""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def post_worker_init(worker):
+    """Uygulama işçide yüklendikten sonra bağlantı havuzunu ısıtır."""
+    from app import app, db
+    from api.routing import read_replica
+    from health import warm_up_pool
+
+    with app.app_context():
+        try:
+            opened = warm_up_pool(db.engine, int(os.environ['DB_POOL_SIZE']))
+            if read_replica.engine is not None:
+                opened += warm_up_pool(read_replica.engine, int(os.environ['DB_POOL_SIZE']))
+            worker.log.info('Bağlantı havuzu ısıtıldı: %d bağlantı', opened)
+        except Exception as e:
+            # Veritabanı henüz hazır değilse işçi yine de açılır; /readyz 503 döndürür
+            worker.log.warning('Bağlantı havuzu ısıtılamadı: %s', e)
@@ -0,0 +1,168 @@
+from concurrent.futures import ProcessPoolExecutor
+from flask import jsonify
+from metrics import HASH_LATENCY, HASH_QUEUE_DEPTH, HASH_REJECTED
+import bcrypt
+import itertools
+import os
+import threading
+import time
+
+# Varsayılan ayarlar (ortam değişkenleriyle değiştirilebilir)
+DEFAULT_LOG_ROUNDS = 12
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_RETRY_AFTER = 1  # saniye
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check(hashed, password):
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+def settings_from_env():
+    """BCRYPT_LOG_ROUNDS, PASSWORD_HASH_WORKERS ve PASSWORD_HASH_MAX_QUEUE değerlerini okur."""
+    return {
+        'log_rounds': int(os.environ.get('BCRYPT_LOG_ROUNDS', DEFAULT_LOG_ROUNDS)),
+        'workers': int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1)),
+        'max_queue': int(os.environ.get('PASSWORD_HASH_MAX_QUEUE', DEFAULT_MAX_QUEUE)),
+    }
+
+
+class HashingPoolSaturated(Exception):
+    """Hash kuyruğu dolduğunda fırlatılır; istemciye 503 döndürülür."""
+
+
+class PasswordHasher:
+    """bcrypt işlemlerini istek iş parçacığı yerine sınırlı bir süreç havuzunda çalıştırır.
+
+    Havuzdaki işçi sayısı ile bekleyebilecek iş sayısının toplamı kadar istek
+    aynı anda kabul edilir; fazlası beklemeden `HashingPoolSaturated` alır.
+    `PASSWORD_HASH_WORKERS` 0 ise işlemler çağıran iş parçacığında yapılır.
+    """
+
+    def __init__(self):
+        self.log_rounds = DEFAULT_LOG_ROUNDS
+        self.workers = os.cpu_count() or 1
+        self.max_queue = DEFAULT_MAX_QUEUE
+        self.retry_after = DEFAULT_RETRY_AFTER
+        self._executor = None
+        self._executor_pid = None
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+    def init_app(self, app):
+        settings = settings_from_env()
+        app.config.setdefault('BCRYPT_LOG_ROUNDS', settings['log_rounds'])
+        app.config.setdefault('PASSWORD_HASH_WORKERS', settings['workers'])
+        app.config.setdefault('PASSWORD_HASH_MAX_QUEUE', settings['max_queue'])
+        self.configure(
+            log_rounds=app.config['BCRYPT_LOG_ROUNDS'],
+            workers=app.config['PASSWORD_HASH_WORKERS'],
+            max_queue=app.config['PASSWORD_HASH_MAX_QUEUE']
+        )
+        app.register_error_handler(HashingPoolSaturated, self._handle_saturated)
+        app.extensions['password_hasher'] = self
+
+    def configure(self, log_rounds=None, workers=None, max_queue=None):
+        if log_rounds is not None:
+            self.log_rounds = log_rounds
+        if workers is not None:
+            self.workers = workers
+        if max_queue is not None:
+            self.max_queue = max_queue
+        self.shutdown()
+        self._slots = threading.BoundedSemaphore(max(self.workers, 1) + self.max_queue)
+
+    def shutdown(self):
+        if self._executor is not None and self._executor_pid == os.getpid():
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._executor_pid = None
+
+    def _get_executor(self):
+        # Süreç havuzu fork sonrasında (ör. gunicorn işçileri) yeniden kurulmalı
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def _run(self, operation, work):
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self._rejected += 1
+            HASH_REJECTED.inc()
+            raise HashingPoolSaturated()
+
+        started = time.perf_counter()
+        with self._stats_lock:
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        HASH_QUEUE_DEPTH.inc()
+        try:
+            return work()
+        finally:
+            elapsed = time.perf_counter() - started
+            HASH_QUEUE_DEPTH.dec()
+            HASH_LATENCY.labels(operation).observe(elapsed)
+            with self._stats_lock:
+                self._in_flight -= 1
+                self._count += 1
+                self._total_seconds += elapsed
+                self._max_seconds = max(self._max_seconds, elapsed)
+            self._slots.release()
+
+    def _call(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+        return self._get_executor().submit(fn, *args).result()
+
+    def hash(self, password):
+        return self._run('hash', lambda: self._call(_hash, password, self.log_rounds))
+
+    def check(self, hashed, password):
+        return self._run('check', lambda: self._call(_check, hashed, password))
+
+    def hash_many(self, passwords):
+        """Birden çok parolayı havuzdaki tüm işçilere dağıtarak paralel hashler.
+
+        Toplu işlem kuyrukta tek bir yer kaplar, böylece büyük bir yükleme
+        giriş isteklerinin önünü kesmez.
+        """
+        passwords = list(passwords)
+        if self.workers <= 0:
+            return self._run('hash_many', lambda: [_hash(password, self.log_rounds) for password in passwords])
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return self._run('hash_many', lambda: list(self._get_executor().map(
+            _hash, passwords, itertools.repeat(self.log_rounds), chunksize=chunksize
+        )))
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'hash_operations_total': self._count,
+                'hash_seconds_total': self._total_seconds,
+                'hash_seconds_max': self._max_seconds,
+                'hash_queue_depth': self._in_flight,
+                'hash_queue_depth_peak': self._peak_in_flight,
+                'hash_rejected_total': self._rejected
+            }
+
+    def _reset_stats(self):
+        self._count = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._rejected = 0
+
+    def _handle_saturated(self, error):
+        response = jsonify({'error': 'Sunucu şu anda yoğun, lütfen kısa süre sonra tekrar deneyin.'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(self.retry_after)
+        return response
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,64 @@
+from flask import Blueprint, jsonify, current_app
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from models import db
+
+# Yük dengeleyici / orkestratör yoklamaları; /api altında değil, kök dizinde sunulur
+health_blueprint = Blueprint('health', __name__)
+
+
+def pool_status(engine):
+    """Bağlantı havuzunun anlık durumunu (destekleniyorsa) sözlük olarak döndürür."""
+    pool = engine.pool
+    status = {'class': type(pool).__name__}
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        method = getattr(pool, name, None)
+        if callable(method):
+            status[name] = method()
+    return status
+
+
+def warm_up_pool(engine, count):
+    """Havuzda `count` bağlantıyı önceden açar; ilk istekler bağlantı kurulumunu beklemez."""
+    connections = []
+    try:
+        for _ in range(count):
+            connection = engine.connect()
+            connection.execute(text('SELECT 1'))
+            connections.append(connection)
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+# Süreç ayakta mı? (Veritabanına gitmez)
+@health_blueprint.route('/healthz', methods=['GET'])
+def healthz():
+    return jsonify({'status': 'ok'})
+
+
+def _ping(engine):
+    with engine.connect() as connection:
+        connection.execute(text('SELECT 1'))
+
+
+# Süreç istek almaya hazır mı? Her havuzdan tek bağlantıyla SELECT 1 çalıştırır
+@health_blueprint.route('/readyz', methods=['GET'])
+def readyz():
+    engines = {'primary': db.engine}
+    replica = current_app.extensions.get('read_replica')
+    if replica is not None and replica.engine is not None:
+        engines['replica'] = replica.engine
+
+    status, code = 'ok', 200
+    for name, engine in engines.items():
+        try:
+            _ping(engine)
+        except SQLAlchemyError as e:
+            current_app.logger.warning('readyz: %s veritabanına erişilemiyor: %s', name, e)
+            status, code = 'unavailable', 503
+    body = {'status': status, 'pool': pool_status(db.engine)}
+    if 'replica' in engines:
+        body['replica_pool'] = pool_status(engines['replica'])
+    return jsonify(body), code
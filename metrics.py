@@ -0,0 +1,145 @@
+from flask import Blueprint, Response, request, g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from prometheus_client import (CollectorRegistry, Counter, Gauge, Histogram, generate_latest,
+                               CONTENT_TYPE_LATEST, multiprocess)
+import logging
+import os
+import time
+
+# Prometheus yoklaması; /api altında değil, kök dizinde sunulur
+metrics_blueprint = Blueprint('metrics', __name__)
+
+slow_query_log = logging.getLogger('slow_query')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+registry = CollectorRegistry()
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'İsteğin işlenme süresi',
+    ['method', 'endpoint', 'status'], buckets=LATENCY_BUCKETS, registry=registry
+)
+REQUEST_QUERIES = Histogram(
+    'http_request_sql_queries', 'İstek başına çalıştırılan SQL ifadesi sayısı',
+    ['endpoint'], buckets=QUERY_COUNT_BUCKETS, registry=registry
+)
+REQUEST_SQL_TIME = Histogram(
+    'http_request_sql_duration_seconds', 'İstek başına SQL ifadelerinde geçen toplam süre',
+    ['endpoint'], buckets=LATENCY_BUCKETS, registry=registry
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Yanıt gövdesinin boyutu (akış yanıtları hariç)',
+    ['endpoint'], buckets=SIZE_BUCKETS, registry=registry
+)
+SLOW_QUERIES = Counter(
+    'sql_slow_queries', 'Eşik süresini aşan SQL ifadeleri',
+    ['endpoint'], registry=registry
+)
+
+# Parola hash havuzu (hashing.PasswordHasher); süre kuyrukta bekleme dahil ölçülür
+HASH_LATENCY = Histogram(
+    'password_hash_duration_seconds', 'bcrypt işleminin kuyrukta bekleme dahil süresi',
+    ['operation'], buckets=LATENCY_BUCKETS, registry=registry
+)
+HASH_QUEUE_DEPTH = Gauge(
+    'password_hash_queue_depth', 'Havuzda çalışan veya bekleyen bcrypt işi sayısı',
+    registry=registry, multiprocess_mode='livesum'
+)
+HASH_REJECTED = Counter(
+    'password_hash_rejected', 'Kuyruk dolu olduğu için 503 ile reddedilen bcrypt işleri',
+    registry=registry
+)
+
+
+def redact(parameters):
+    """Bağlı parametrelerin değerlerini gizler; yalnızca yapıları loglanır."""
+    if isinstance(parameters, dict):
+        return {key: '?' for key in parameters}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f'<{len(parameters)} parametre kümesi>'
+        return ['?'] * len(parameters)
+    return '?'
+
+
+def _endpoint():
+    return (request.endpoint or 'unmatched') if has_request_context() else '-'
+
+
+class RequestMetrics:
+    """İstek süresi, SQL sayısı/süresi ve yanıt boyutunu uç nokta bazında ölçer.
+
+    SQL ifadeleri tüm motorlarda (birincil ve okuma kopyası) sayılır.
+    `SLOW_QUERY_MS` süresini aşan ifadeler `slow_query` loguna parametre
+    değerleri gizlenerek yazılır. `SERVER_TIMING` açıksa yanıta tarayıcı
+    geliştirici araçlarında görünen bir `Server-Timing` başlığı eklenir.
+    Akış (NDJSON) yanıtlarında gövde üretilirken çalışan sorgular sayılmaz.
+    """
+
+    def __init__(self):
+        self.slow_query_seconds = None
+        self.server_timing = False
+        self._listening = False
+
+    def init_app(self, app):
+        self.slow_query_seconds = app.config.get('SLOW_QUERY_MS', 200) / 1000
+        self.server_timing = app.config.get('SERVER_TIMING', False)
+        if not self._listening:
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+            self._listening = True
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.extensions['request_metrics'] = self
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_started
+        if has_request_context() and 'sql_count' in g:
+            g.sql_count += 1
+            g.sql_time += elapsed
+        if self.slow_query_seconds is not None and elapsed >= self.slow_query_seconds:
+            endpoint = _endpoint()
+            SLOW_QUERIES.labels(endpoint).inc()
+            slow_query_log.warning('%.1f ms [%s] %s %s', elapsed * 1000, endpoint, statement, redact(parameters))
+
+    def _start_request(self):
+        # g uygulama bağlamına aittir; testlerde bağlam istekler arasında paylaşıldığı için sıfırlanır
+        g.request_started = time.perf_counter()
+        g.sql_count = 0
+        g.sql_time = 0.0
+
+    def _finish_request(self, response):
+        if 'request_started' not in g:
+            return response
+        elapsed = time.perf_counter() - g.pop('request_started')
+        endpoint = _endpoint()
+        REQUEST_LATENCY.labels(request.method, endpoint, response.status_code).observe(elapsed)
+        REQUEST_QUERIES.labels(endpoint).observe(g.sql_count)
+        REQUEST_SQL_TIME.labels(endpoint).observe(g.sql_time)
+        if not response.is_streamed:
+            RESPONSE_SIZE.labels(endpoint).observe(response.calculate_content_length() or 0)
+        if self.server_timing:
+            response.headers['Server-Timing'] = (
+                f'db;desc="{g.sql_count} sorgu";dur={g.sql_time * 1000:.1f}, app;dur={elapsed * 1000:.1f}'
+            )
+        return response
+
+
+request_metrics = RequestMetrics()
+
+
+# Prometheus metin biçiminde metrikler; gunicorn işçileri PROMETHEUS_MULTIPROC_DIR üzerinden birleştirilir
+@metrics_blueprint.route('/metrics', methods=['GET'])
+def metrics():
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        collected = CollectorRegistry()
+        multiprocess.MultiProcessCollector(collected)
+    else:
+        collected = registry
+    return Response(generate_latest(collected), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,27 @@
+"""announcement feed index
+
+Revision ID: 0c260d97d574
+Revises: 4db027f05205
+Create Date: 2026-10-18 14:34:03.394447
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0c260d97d574'
+down_revision = '4db027f05205'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Each course branch of /me/announcements is a backwards range scan on this index;
+    # id is the keyset tie-breaker for announcements posted at the same instant
+    op.create_index('ix_announcements_course_id_date_posted_id', 'announcements',
+                    ['course_id', 'date_posted', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_announcements_course_id_date_posted_id', table_name='announcements')
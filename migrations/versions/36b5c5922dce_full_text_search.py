@@ -0,0 +1,64 @@
+"""full text search
+
+Revision ID: 36b5c5922dce
+Revises: 0c260d97d574
+Create Date: 2026-10-18 14:38:18.478660
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '36b5c5922dce'
+down_revision = '0c260d97d574'
+branch_labels = None
+depends_on = None
+
+# Kept in sync with SEARCH_COLUMNS / SEARCH_FOLD_* in models.py at the time of this revision
+FOLD_FROM = 'İIıŞşĞğÇçÖöÜüÂâÎîÛû'
+FOLD_TO = 'iiissggccoouuaaiiuu'
+SEARCH_COLUMNS = {
+    'announcements': {'title': 'A', 'content': 'B'},
+    'courses': {'course_code': 'A', 'course_name': 'A'},
+}
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    for table, columns in SEARCH_COLUMNS.items():
+        names = ', '.join(columns)
+        if dialect == 'postgresql':
+            # Generated column: filled for existing rows by the ALTER, then maintained by Postgres
+            vector = ' || '.join(
+                f"setweight(to_tsvector('simple', lower(translate(coalesce({column}, ''), "
+                f"'{FOLD_FROM}', '{FOLD_TO}'))), '{weight}')"
+                for column, weight in columns.items()
+            )
+            op.execute(f'ALTER TABLE {table} ADD COLUMN search_vector tsvector '
+                       f'GENERATED ALWAYS AS ({vector}) STORED')
+            op.execute(f'CREATE INDEX ix_{table}_search_vector ON {table} USING gin (search_vector)')
+        elif dialect == 'sqlite':
+            new_values = ', '.join(f"replace(new.{column}, 'ı', 'i')" for column in columns)
+            assignments = ', '.join(f"{column} = replace(new.{column}, 'ı', 'i')" for column in columns)
+            op.execute(f"CREATE VIRTUAL TABLE {table}_fts USING fts5({names}, tokenize='unicode61 remove_diacritics 2')")
+            op.execute(f"INSERT INTO {table}_fts (rowid, {names}) SELECT id, "
+                       + ', '.join(f"replace({column}, 'ı', 'i')" for column in columns) + f' FROM {table}')
+            op.execute(f'CREATE TRIGGER {table}_fts_insert AFTER INSERT ON {table} BEGIN '
+                       f'INSERT INTO {table}_fts (rowid, {names}) VALUES (new.id, {new_values}); END')
+            op.execute(f'CREATE TRIGGER {table}_fts_update AFTER UPDATE OF {names} ON {table} BEGIN '
+                       f'UPDATE {table}_fts SET {assignments} WHERE rowid = new.id; END')
+            op.execute(f'CREATE TRIGGER {table}_fts_delete AFTER DELETE ON {table} BEGIN '
+                       f'DELETE FROM {table}_fts WHERE rowid = old.id; END')
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    for table in SEARCH_COLUMNS:
+        if dialect == 'postgresql':
+            op.execute(f'DROP INDEX ix_{table}_search_vector')
+            op.execute(f'ALTER TABLE {table} DROP COLUMN search_vector')
+        elif dialect == 'sqlite':
+            for trigger in ('insert', 'update', 'delete'):
+                op.execute(f'DROP TRIGGER {table}_fts_{trigger}')
+            op.execute(f'DROP TABLE {table}_fts')
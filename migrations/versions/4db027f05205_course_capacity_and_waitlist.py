@@ -0,0 +1,50 @@
+"""course capacity and waitlist
+
+Revision ID: 4db027f05205
+Revises: e0244306205f
+Create Date: 2026-10-18 14:31:26.628457
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4db027f05205'
+down_revision = 'e0244306205f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('course_waitlist',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('student_id', 'course_id', name='_waitlist_student_course_uc')
+    )
+    # Serves "next student in line for this course" (WHERE course_id = ? ORDER BY id LIMIT 1)
+    op.create_index('ix_course_waitlist_course_id_id', 'course_waitlist', ['course_id', 'id'], unique=False)
+
+    # capacity NULL means unlimited, so existing courses keep accepting registrations
+    op.add_column('courses', sa.Column('capacity', sa.Integer(), nullable=True))
+    op.add_column('courses', sa.Column('enrolled_count', sa.Integer(), server_default='0', nullable=False))
+
+    # From here on the counter is maintained by api.enrollment; seed it from existing registrations
+    op.execute(
+        'UPDATE courses SET enrolled_count = '
+        '(SELECT count(*) FROM course_registrations WHERE course_registrations.course_id = courses.id)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.drop_column('enrolled_count')
+        batch_op.drop_column('capacity')
+
+    op.drop_index('ix_course_waitlist_course_id_id', table_name='course_waitlist')
+    op.drop_table('course_waitlist')
@@ -0,0 +1,58 @@
+"""filter and search indexes
+
+Revision ID: e0244306205f
+Revises: c621aea0bc06
+Create Date: 2026-10-18 14:07:35.439879
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e0244306205f'
+down_revision = 'c621aea0bc06'
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXES = [
+    ('ix_students_first_name_trgm', 'students', 'first_name'),
+    ('ix_students_last_name_trgm', 'students', 'last_name'),
+    ('ix_professors_first_name_trgm', 'professors', 'first_name'),
+    ('ix_professors_last_name_trgm', 'professors', 'last_name'),
+]
+
+
+def upgrade():
+    # Foreign keys used as list filters; id is included so keyset pagination
+    # (WHERE department_id = ? AND id > ? ORDER BY id) is served by one index.
+    op.create_index('ix_courses_department_id_id', 'courses', ['department_id', 'id'], unique=False)
+    op.create_index('ix_courses_professor_id_id', 'courses', ['professor_id', 'id'], unique=False)
+    op.create_index('ix_professors_department_id_id', 'professors', ['department_id', 'id'], unique=False)
+    op.create_index('ix_students_department_id_id', 'students', ['department_id', 'id'], unique=False)
+
+    # Prefix-friendly name indexes for every dialect
+    op.create_index('ix_professors_last_name_first_name', 'professors', ['last_name', 'first_name'], unique=False)
+    op.create_index('ix_students_last_name_first_name', 'students', ['last_name', 'first_name'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(name, table, [column], unique=False,
+                            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+        op.create_index('ix_courses_course_code_pattern', 'courses', ['course_code'], unique=False,
+                        postgresql_ops={'course_code': 'varchar_pattern_ops'})
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_courses_course_code_pattern', table_name='courses')
+        for name, table, column in TRIGRAM_INDEXES:
+            op.drop_index(name, table_name=table)
+
+    op.drop_index('ix_students_last_name_first_name', table_name='students')
+    op.drop_index('ix_professors_last_name_first_name', table_name='professors')
+    op.drop_index('ix_students_department_id_id', table_name='students')
+    op.drop_index('ix_professors_department_id_id', table_name='professors')
+    op.drop_index('ix_courses_professor_id_id', table_name='courses')
+    op.drop_index('ix_courses_department_id_id', table_name='courses')
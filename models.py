@@ -1,11 +1,49 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_bcrypt import Bcrypt
+from flask_sqlalchemy.session import Session
+from sqlalchemy import DDL, Select, event
+from hashing import password_hasher
 
-db = SQLAlchemy()
-bcrypt = Bcrypt()
+
+class RoutingSession(Session):
+    """Session that may send plain SELECT statements to a read replica.
+
+    `read_bind` is installed by api.routing; it returns the replica engine when
+    the current request may read from it, otherwise None. Flushes, locking
+    reads (FOR UPDATE) and everything else always use the primary.
+    """
+
+    read_bind = None
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and self.read_bind is not None and not self._flushing
+                and isinstance(clause, Select) and clause._for_update_arg is None):
+            engine = self.read_bind()
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Models must be defined in an order that respects foreign key dependencies.
 # For example, a table that references another should be defined after the referenced table.
+# bulkload.BulkLoader loads tables in the same order and refuses to load a table
+# after one that references it.
+
+# Indexes are also created by the Alembic revisions in migrations/; Postgres-only
+# indexes (trigram name search, pattern ops for prefix search) use ddl_if so that
+# SQLite's create_all skips them.
+
+event.listen(
+    db.metadata, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
+
+def trigram_index(name, column):
+    """Postgres pg_trgm GIN index that serves ILIKE '%...%' searches on a column."""
+    return db.Index(
+        name, column, postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+    ).ddl_if(dialect='postgresql')
 
 class Roles(db.Model):
     __tablename__ = 'roles'
@@ -42,12 +80,12 @@ class Users(db.Model):
 
     @password.setter
     def password(self, password_text):
-        """Parolayı şifreleyerek _password alanına yazar."""
-        self._password = bcrypt.generate_password_hash(password_text).decode('utf-8')
+        """Parolayı hash havuzunda şifreleyerek _password alanına yazar."""
+        self._password = password_hasher.hash(password_text)
 
     def check_password(self, password_text):
         """Girilen parolayı şifrelenmiş parola ile karşılaştırır."""
-        return bcrypt.check_password_hash(self._password, password_text)
+        return password_hasher.check(self._password, password_text)
 
     def __repr__(self):
         return f'<User {self.username}>'
@@ -62,6 +100,12 @@ class Students(db.Model):
     department_id = db.Column(db.Integer, db.ForeignKey('departments.id'), nullable=False)
     course_registrations = db.relationship('Course_Registrations', backref='student', lazy=True)
     exam_results = db.relationship('Exam_Results', backref='student', lazy=True)
+    __table_args__ = (
+        db.Index('ix_students_department_id_id', 'department_id', 'id'),
+        db.Index('ix_students_last_name_first_name', 'last_name', 'first_name'),
+        trigram_index('ix_students_first_name_trgm', 'first_name'),
+        trigram_index('ix_students_last_name_trgm', 'last_name'),
+    )
     def __repr__(self):
         return f'<Student {self.student_id}>'
 
@@ -74,6 +118,12 @@ class Professors(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), unique=True, nullable=False)
     department_id = db.Column(db.Integer, db.ForeignKey('departments.id'), nullable=False)
     courses = db.relationship('Courses', backref='professor', lazy=True)
+    __table_args__ = (
+        db.Index('ix_professors_department_id_id', 'department_id', 'id'),
+        db.Index('ix_professors_last_name_first_name', 'last_name', 'first_name'),
+        trigram_index('ix_professors_first_name_trgm', 'first_name'),
+        trigram_index('ix_professors_last_name_trgm', 'last_name'),
+    )
     def __repr__(self):
         return f'<Professor {self.first_name} {self.last_name}>'
 
@@ -85,9 +135,20 @@ class Courses(db.Model):
     credits = db.Column(db.Integer, nullable=False)
     department_id = db.Column(db.Integer, db.ForeignKey('departments.id'), nullable=False)
     professor_id = db.Column(db.Integer, db.ForeignKey('professors.id'), nullable=True)
+    capacity = db.Column(db.Integer, nullable=True) # None: unlimited
+    # Denormalized number of registrations; only changed by api.enrollment with conditional UPDATEs
+    enrolled_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     course_registrations = db.relationship('Course_Registrations', backref='course', lazy=True)
     exams = db.relationship('Exams', backref='course', lazy=True)
     announcements = db.relationship('Announcements', backref='course', lazy=True)
+    __table_args__ = (
+        db.Index('ix_courses_department_id_id', 'department_id', 'id'),
+        db.Index('ix_courses_professor_id_id', 'professor_id', 'id'),
+        db.Index(
+            'ix_courses_course_code_pattern', 'course_code',
+            postgresql_ops={'course_code': 'varchar_pattern_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
     def __repr__(self):
         return f'<Course {self.course_code}>'
 
@@ -101,6 +162,20 @@ class Course_Registrations(db.Model):
     def __repr__(self):
         return f'<Course Registration student_id:{self.student_id} for course_id:{self.course_id}>'
 
+class Course_Waitlist(db.Model):
+    """Students waiting for a seat in a full course, served in id order."""
+    __tablename__ = 'course_waitlist'
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
+    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=db.func.now())
+    __table_args__ = (
+        db.UniqueConstraint('student_id', 'course_id', name='_waitlist_student_course_uc'),
+        db.Index('ix_course_waitlist_course_id_id', 'course_id', 'id'),
+    )
+    def __repr__(self):
+        return f'<Course Waitlist student_id:{self.student_id} for course_id:{self.course_id}>'
+
 class Exams(db.Model):
     __tablename__ = 'exams'
     id = db.Column(db.Integer, primary_key=True)
@@ -128,5 +203,124 @@ class Announcements(db.Model):
     content = db.Column(db.Text, nullable=False)
     date_posted = db.Column(db.DateTime, default=db.func.now())
     course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=True)
+    __table_args__ = (
+        # Serves the per-course branches of the announcement feed
+        # (WHERE course_id = ? ORDER BY date_posted DESC, id DESC LIMIT n)
+        db.Index('ix_announcements_course_id_date_posted_id', 'course_id', 'date_posted', 'id'),
+    )
+    def __repr__(self):
+        return f'<Announcement {self.title}>'
+
+class Jobs(db.Model):
+    """Background jobs (api/jobs.py) queued by the API and run by a worker pool.
+
+    Workers claim `queued` rows with a conditional UPDATE and keep
+    `heartbeat_at` current while running. The result's mimetype is stored on
+    the row and its bytes in `job_result_chunks`. `progress`/`total` are
+    units of work reported by the handler.
+    """
+    __tablename__ = 'jobs'
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    params = db.Column(db.Text, nullable=True)
+    progress = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=True)
+    # NULL when the job produced no result
+    result_type = db.Column(db.String(100), nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    worker = db.Column(db.String(100), nullable=True)
+    # Deleting a user keeps their jobs (and running workers) intact
+    created_by = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+    created_at = db.Column(db.DateTime, default=db.func.now())
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    __table_args__ = (
+        # Serves the claim query (WHERE status = 'queued' AND job_type IN (...) ORDER BY id)
+        db.Index('ix_jobs_status_job_type_id', 'status', 'job_type', 'id'),
+    )
+    def __repr__(self):
+        return f'<Job {self.id} {self.job_type} {self.status}>'
+
+class Job_Result_Chunks(db.Model):
+    """A job's result split into ordered pieces.
+
+    Handlers append pieces while they run and the download streams them back
+    in `seq` order, so a large export is never held in memory as a whole.
+    """
+    __tablename__ = 'job_result_chunks'
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True)
+    seq = db.Column(db.Integer, primary_key=True)
+    data = db.Column(db.LargeBinary, nullable=False)
     def __repr__(self):
-        return f'<Announcement {self.title}>'
\ No newline at end of file
+        return f'<Job Result Chunk {self.job_id}:{self.seq}>'
+
+# Full-text search (api/search.py) over announcements and the course catalog.
+# Postgres: each searchable table gets a generated, weighted tsvector column
+# (`search_vector`) with a GIN index. SQLite: each gets an FTS5 table
+# `<table>_fts` whose rowid is the source row id, kept current by triggers so
+# that Core and bulk inserts are indexed as well as ORM writes. Neither is
+# mapped on the models; migrations/env.py keeps autogenerate away from them.
+# Text is folded the same way on both sides: Turkish letters map to their
+# ASCII base (ı/İ -> i, ş -> s, ğ -> g, ...) so "Iğdır", "igdir" and "IĞDIR"
+# all match. On SQLite the unicode61 tokenizer strips the diacritics itself;
+# only the dotless ı needs an explicit replace().
+SEARCH_FOLD_FROM = 'İIıŞşĞğÇçÖöÜüÂâÎîÛû'
+SEARCH_FOLD_TO = 'iiissggccoouuaaiiuu'
+SEARCH_FOLD = str.maketrans(SEARCH_FOLD_FROM, SEARCH_FOLD_TO)
+
+# table -> {column: tsvector weight}
+SEARCH_COLUMNS = {
+    'announcements': {'title': 'A', 'content': 'B'},
+    'courses': {'course_code': 'A', 'course_name': 'A'},
+}
+
+
+def search_fold(text):
+    """Fold text for matching against the search index (see SEARCH_FOLD_FROM)."""
+    return text.translate(SEARCH_FOLD).lower()
+
+
+def _search_vector_sql(columns):
+    return ' || '.join(
+        f"setweight(to_tsvector('simple', lower(translate(coalesce({column}, ''), "
+        f"'{SEARCH_FOLD_FROM}', '{SEARCH_FOLD_TO}'))), '{weight}')"
+        for column, weight in columns.items()
+    )
+
+
+def _search_ddl(table_name, columns):
+    names = ', '.join(columns)
+    new_values = ', '.join(f"replace(new.{column}, 'ı', 'i')" for column in columns)
+    assignments = ', '.join(f"{column} = replace(new.{column}, 'ı', 'i')" for column in columns)
+    postgresql = [
+        f'ALTER TABLE {table_name} ADD COLUMN search_vector tsvector '
+        f'GENERATED ALWAYS AS ({_search_vector_sql(columns)}) STORED',
+        f'CREATE INDEX ix_{table_name}_search_vector ON {table_name} USING gin (search_vector)',
+    ]
+    sqlite = [
+        f"CREATE VIRTUAL TABLE {table_name}_fts USING fts5({names}, tokenize='unicode61 remove_diacritics 2')",
+        f'CREATE TRIGGER {table_name}_fts_insert AFTER INSERT ON {table_name} BEGIN '
+        f'INSERT INTO {table_name}_fts (rowid, {names}) VALUES (new.id, {new_values}); END',
+        f'CREATE TRIGGER {table_name}_fts_update AFTER UPDATE OF {names} ON {table_name} BEGIN '
+        f'UPDATE {table_name}_fts SET {assignments} WHERE rowid = new.id; END',
+        f'CREATE TRIGGER {table_name}_fts_delete AFTER DELETE ON {table_name} BEGIN '
+        f'DELETE FROM {table_name}_fts WHERE rowid = old.id; END',
+    ]
+    return postgresql, sqlite
+
+
+def _install_search_ddl():
+    for table_name, columns in SEARCH_COLUMNS.items():
+        table = db.metadata.tables[table_name]
+        postgresql, sqlite = _search_ddl(table_name, columns)
+        for statement in postgresql:
+            event.listen(table, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+        for statement in sqlite:
+            event.listen(table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+        # The triggers go with the table; the FTS table has to be dropped explicitly
+        event.listen(table, 'after_drop', DDL(f'DROP TABLE IF EXISTS {table_name}_fts').execute_if(dialect='sqlite'))
+
+_install_search_ddl()
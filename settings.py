@@ -0,0 +1,31 @@
+# WSGI (app.py) ve ASGI (asgi_app.py) uygulamalarının ortak ayarları
+import os
+
+DATABASE_URL = os.environ.get('DATABASE_URL', 'postgresql://postgres:1234@db:5432/akademik_yonetim')
+SECRET_KEY = os.environ.get('SECRET_KEY', 'sifreleme_icin_cok_gizli_bir_anahtar')
+
+
+def engine_options_from_env(url):
+    """Bağlantı havuzu ayarlarını ortam değişkenlerinden okur.
+
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE (saniye),
+    DB_POOL_PRE_PING (1/0) ve DB_STATEMENT_TIMEOUT_MS (yalnızca PostgreSQL).
+    SQLite sürücüsünün havuzu boyut ayarı almadığı için orada yalnızca
+    pre-ping uygulanır.
+    """
+    options = {'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', '1') == '1'}
+    if url.startswith('sqlite'):
+        return options
+
+    options.update(
+        pool_size=int(os.environ.get('DB_POOL_SIZE', 5)),
+        max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        pool_timeout=int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        pool_recycle=int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    )
+    statement_timeout = os.environ.get('DB_STATEMENT_TIMEOUT_MS')
+    if statement_timeout and url.startswith('postgresql+asyncpg'):
+        options['connect_args'] = {'server_settings': {'statement_timeout': str(int(statement_timeout))}}
+    elif statement_timeout and url.startswith('postgresql'):
+        options['connect_args'] = {'options': f'-c statement_timeout={int(statement_timeout)}'}
+    return options
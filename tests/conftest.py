@@ -1,6 +1,21 @@
+import os
 import pytest
+from flask import has_request_context, request_started, request_finished, request as flask_request
+from sqlalchemy import event
+
+# Motor app import edilirken oluşturulduğu için test veritabanı önceden seçilmeli
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+# Testlerde parolalar düşük maliyetle ve istek iş parçacığında hashlenir
+os.environ.setdefault('BCRYPT_LOG_ROUNDS', '4')
+os.environ.setdefault('PASSWORD_HASH_WORKERS', '0')
+# Arka plan görevleri testlerde havuz açılmadan, testin kendisinde çalıştırılır
+os.environ.setdefault('JOBS_EMBEDDED_THREADS', '0')
+
 from app import app as flask_app, db as flask_db
-from models import Users, Roles
+from models import Users, Roles, Students, Courses, Departments
+from api.auth import principal_cache
+from api.roles import role_registry
+from api.caching import response_cache
 
 @pytest.fixture(scope='session')
 def app():
@@ -14,6 +29,41 @@ def app():
         # Testler bittikten sonra tabloları temizle
         flask_db.drop_all()
 
+# Bir isteğin çalıştırabileceği varsayılan en fazla SQL ifadesi sayısı.
+# Daha fazlasına ihtiyaç duyan testler @pytest.mark.max_queries(n) kullanır.
+DEFAULT_MAX_QUERIES_PER_REQUEST = 10
+
+@pytest.fixture(autouse=True)
+def query_guard(request, app):
+    """Sınırı aşan sayıda SQL çalıştıran (ör. N+1) istekleri testte hata olarak raporlar."""
+    marker = request.node.get_closest_marker('max_queries')
+    limit = marker.args[0] if marker else DEFAULT_MAX_QUERIES_PER_REQUEST
+    counts = []
+    violations = []
+
+    def on_request_started(sender, **extra):
+        counts.append(0)
+
+    def on_request_finished(sender, response, **extra):
+        if counts and counts[-1] > limit:
+            violations.append(f'{flask_request.method} {flask_request.full_path}: {counts[-1]} sorgu (sınır {limit})')
+
+    def before_cursor_execute(*args):
+        if counts and has_request_context():
+            counts[-1] += 1
+
+    engine = flask_db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    request_started.connect(on_request_started, app)
+    request_finished.connect(on_request_finished, app)
+    try:
+        yield counts
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+        request_started.disconnect(on_request_started, app)
+        request_finished.disconnect(on_request_finished, app)
+    assert not violations, 'İstek başına SQL sınırı aşıldı: ' + '; '.join(violations)
+
 @pytest.fixture(scope='function')
 def test_client(app):
     """API testleri için bir test istemcisi sağlar."""
@@ -23,9 +73,15 @@ def test_client(app):
 def db(app):
     """Her test için izole edilmiş bir veritabanı oturumu sağlar."""
     with app.app_context():
-        flask_db.session.begin_nested()
         yield flask_db
+        # Commit edilmiş verileri de temizle, testler birbirini etkilemesin
         flask_db.session.rollback()
+        flask_db.session.remove()
+        flask_db.drop_all()
+        flask_db.create_all()
+        principal_cache.clear()
+        role_registry.clear()
+        response_cache.clear()
 
 @pytest.fixture(scope='function')
 def admin_user(app, db):
@@ -83,4 +139,28 @@ def student_token(test_client, student_user):
             'password': 'password123'
         }
     )
-    return response.json['token']
\ No newline at end of file
+    return response.json['token']
+
+def make_students_and_courses(db, role_id, student_count=2, course_count=2):
+    """Bir bölüm, öğrenciler (parolası hashlenmeden) ve dersler oluşturup id'lerini döndürür."""
+    department = Departments(department_name='Bilgisayar Mühendisliği')
+    db.session.add(department)
+    db.session.flush()
+
+    students = []
+    for i in range(student_count):
+        user = Users(username=f'ogrenci{i}', email=f'ogrenci{i}@test.com', role_id=role_id, _password='x')
+        db.session.add(user)
+        db.session.flush()
+        student = Students(student_id=f'2024{i:03}', first_name='Ad', last_name='Soyad',
+                           user_id=user.id, department_id=department.id)
+        db.session.add(student)
+        students.append(student)
+
+    courses = [
+        Courses(course_code=f'CS10{i}', course_name=f'Ders {i}', credits=3, department_id=department.id)
+        for i in range(course_count)
+    ]
+    db.session.add_all(courses)
+    db.session.commit()
+    return [s.id for s in students], [c.id for c in courses]
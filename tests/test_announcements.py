@@ -0,0 +1,46 @@
+import datetime
+from models import Announcements, Course_Registrations, Students
+from conftest import make_students_and_courses
+
+
+def test_my_announcements_feed_pages_through_own_courses(test_client, db, student_user, student_token):
+    """Akışın yalnızca genel ve kayıtlı derslerin duyurularını, en yeniden eskiye sayfalayarak döndürdüğünü test eder."""
+    _, (own_course, other_course) = make_students_and_courses(db, student_user.role_id, student_count=0)
+    student = Students(student_id='2024999', first_name='Ad', last_name='Soyad', user_id=student_user.id,
+                       department_id=1)
+    db.session.add(student)
+    db.session.flush()
+    db.session.add(Course_Registrations(student_id=student.id, course_id=own_course))
+
+    start = datetime.datetime(2025, 9, 1)
+    posted = {own_course: [0, 2, 2, 5], None: [1, 4], other_course: [3, 6]}
+    for course_id, hours in posted.items():
+        db.session.add_all([Announcements(title=f'Duyuru {course_id} {h}', content='Uzun içerik', course_id=course_id,
+                                          date_posted=start + datetime.timedelta(hours=h)) for h in hours])
+    db.session.commit()
+
+    headers = {'Authorization': f'Bearer {student_token}'}
+    seen, cursor = [], None
+    while True:
+        response = test_client.get('/api/me/announcements?limit=2' + (f'&after={cursor}' if cursor else ''),
+                                   headers=headers)
+        assert response.status_code == 200
+        page = response.json['announcements']
+        assert len(page) <= 2 and all('content' not in a for a in page)
+        seen += page
+        cursor = response.json['next_cursor']
+        if cursor is None:
+            break
+
+    assert [a['date_posted'][11:13] for a in seen] == ['05', '04', '02', '02', '01', '00']
+    assert {a['course_id'] for a in seen} == {own_course, None}
+    assert len({a['id'] for a in seen}) == 6
+
+    detail = test_client.get(f"/api/announcements/{seen[0]['id']}")
+    assert detail.json['content'] == 'Uzun içerik'
+
+
+def test_my_announcements_rejects_bad_cursor(test_client, db, student_token):
+    response = test_client.get('/api/me/announcements?after=42',
+                               headers={'Authorization': f'Bearer {student_token}'})
+    assert response.status_code == 400
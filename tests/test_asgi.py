@@ -0,0 +1,168 @@
+import asyncio
+import datetime
+import pytest
+from sqlalchemy import create_engine, insert, delete
+from models import db, Roles, Users, Departments, Courses, Exams, Exam_Results, Students, Professors, Announcements
+from hashing import password_hasher
+from asgi_app import create_app, async_database_url, principal_cache
+from api.auth import invalidate_principal
+from api.pubsub import event_hub
+from conftest import make_students_and_courses
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    """ASGI uygulaması kendi motorunu açtığı için veriler geçici bir SQLite dosyasına yazılır."""
+    url = f'sqlite:///{tmp_path / "asgi.db"}'
+    engine = create_engine(url)
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Roles), [{'id': 1, 'role_name': 'Admin'}, {'id': 2, 'role_name': 'Student'}])
+        connection.execute(insert(Users), [
+            {'id': 1, 'username': 'admin', 'email': 'a@test.com', 'role_id': 1, '_password': password_hasher.hash('gizli')},
+            {'id': 2, 'username': 'ogrenci', 'email': 'o@test.com', 'role_id': 2, '_password': password_hasher.hash('gizli')},
+        ])
+        connection.execute(insert(Departments), [{'id': 1, 'department_name': 'Fizik'}])
+        connection.execute(insert(Students), [{'id': 1, 'student_id': '2024001', 'first_name': 'Ali', 'last_name': 'Kaya',
+                                               'user_id': 2, 'department_id': 1}])
+        connection.execute(insert(Courses), [
+            {'id': 1, 'course_code': 'FIZ101', 'course_name': 'Fizik I', 'credits': 4, 'department_id': 1},
+            {'id': 2, 'course_code': 'MAT101', 'course_name': 'Analiz', 'credits': 4, 'department_id': 1},
+        ])
+        connection.execute(insert(Exams), [{'id': 1, 'exam_type': 'Vize', 'exam_date': datetime.datetime(2025, 11, 1), 'course_id': 1}])
+        connection.execute(insert(Exam_Results), [{'student_id': 1, 'exam_id': 1, 'grade': 80}])
+        connection.execute(insert(Announcements), [{'title': 'Duyuru', 'content': 'İçerik',
+                                                    'date_posted': datetime.datetime(2025, 9, 1), 'course_id': 1}])
+    engine.dispose()
+    yield url
+    principal_cache.clear()
+
+
+def test_async_database_url():
+    assert async_database_url('postgresql://u:p@db/x') == 'postgresql+asyncpg://u:p@db/x'
+    assert async_database_url('sqlite:///a.db') == 'sqlite+aiosqlite:///a.db'
+
+
+def test_async_login_and_protected_read(database_url):
+    app = create_app(database_url)
+
+    async def scenario():
+        async with app.test_app():
+            client = app.test_client()
+            response = await client.post('/api/login', json={'username': 'ogrenci', 'password': 'yanlis'})
+            assert response.status_code == 401
+
+            response = await client.post('/api/login', json={'username': 'ogrenci', 'password': 'gizli'})
+            headers = {'Authorization': f'Bearer {(await response.get_json())["token"]}'}
+
+            response = await client.get('/api/exam_results/student/1', headers=headers)
+            assert (await response.get_json()) == {'exam_results': [{'exam_id': 1, 'grade': 80.0}]}
+            response = await client.get('/api/exam_results/student/2', headers=headers)
+            assert response.status_code == 403
+
+            response = await client.get('/api/courses?course_code=MAT&limit=1')
+            assert (await response.get_json())['courses'][0]['id'] == 2
+            response = await client.get('/api/courses?limit=abc')
+            assert response.status_code == 400
+            response = await client.get('/api/announcements')
+            assert (await response.get_json())['announcements'][0]['date_posted'] == '2025-09-01T00:00:00'
+
+    asyncio.run(scenario())
+
+
+def test_async_list_responses_match_the_wsgi_shape(database_url, test_client, db, admin_user):
+    """Aynı liste adresinin WSGI ve ASGI sunucularında aynı alanlarla döndüğünü test eder."""
+    _, course_ids = make_students_and_courses(db, admin_user.role_id, student_count=0, course_count=1)
+    db.session.add_all([
+        Professors(first_name='Ayşe', last_name='Kaya', user_id=admin_user.id, department_id=1),
+        Announcements(title='Duyuru', content='İçerik', course_id=course_ids[0]),
+    ])
+    db.session.commit()
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(insert(Professors), [{'first_name': 'Veli', 'last_name': 'Can', 'user_id': 1, 'department_id': 1}])
+    engine.dispose()
+    app = create_app(database_url)
+    paths = {'/api/departments': 'departments', '/api/courses': 'courses', '/api/professors': 'professors',
+             '/api/announcements': 'announcements'}
+
+    async def async_shapes():
+        async with app.test_app():
+            client = app.test_client()
+            shapes = {}
+            for path, key in paths.items():
+                body = await (await client.get(path)).get_json()
+                shapes[path] = (set(body), set(body[key][0]))
+            return shapes
+
+    wsgi = {path: (set(body), set(body[key][0]))
+            for path, key in paths.items() for body in [test_client.get(path).json]}
+    assert asyncio.run(async_shapes()) == wsgi
+    assert 'capacity' in wsgi['/api/courses'][1]
+
+
+def test_principal_invalidated_by_wsgi_is_not_served_from_async_cache(database_url):
+    """WSGI tarafında silinen kullanıcının token'ının ASGI sunucusunda da hemen reddedildiğini test eder."""
+    app = create_app(database_url)
+
+    async def scenario():
+        async with app.test_app():
+            client = app.test_client()
+            response = await client.post('/api/login', json={'username': 'ogrenci', 'password': 'gizli'})
+            headers = {'Authorization': f'Bearer {(await response.get_json())["token"]}'}
+            assert (await client.get('/api/exam_results/student/1', headers=headers)).status_code == 200
+
+            engine = create_engine(database_url)
+            with engine.begin() as connection:
+                connection.execute(delete(Students).where(Students.user_id == 2))
+                connection.execute(delete(Users).where(Users.id == 2))
+            engine.dispose()
+            # WSGI'deki kullanıcı silme uç noktasının çağırdığı kanca
+            invalidate_principal(2)
+            assert (await client.get('/api/exam_results/student/1', headers=headers)).status_code == 401
+
+    asyncio.run(scenario())
+
+
+def test_single_worker_serves_many_concurrent_requests(database_url):
+    """Tek süreç ve küçük bir havuzla 1000 eşzamanlı isteğin hepsinin yanıtlandığını test eder."""
+    app = create_app(database_url)
+
+    async def scenario():
+        async with app.test_app():
+            client = app.test_client()
+            responses = await asyncio.gather(*(client.get('/api/departments') for _ in range(1000)))
+            assert all(response.status_code == 200 for response in responses)
+
+    asyncio.run(scenario())
+
+
+def test_async_event_stream_replays_and_pushes(database_url):
+    """asyncio akışının kaçırılan notu tekrar gönderdiğini ve yayınlanan duyuruyu ilettiğini test eder."""
+    app = create_app(database_url)
+
+    async def receive_event(connection):
+        while True:
+            chunk = (await asyncio.wait_for(connection.receive(), 5)).decode()
+            if chunk.startswith('id:'):
+                return chunk
+
+    async def scenario():
+        async with app.test_app():
+            client = app.test_client()
+            response = await client.post('/api/login', json={'username': 'ogrenci', 'password': 'gizli'})
+            token = (await response.get_json())['token']
+            assert (await client.get(f'/api/events?access_token={token}')).status_code == 401
+            response = await client.post('/api/events/token', headers={'Authorization': f'Bearer {token}'})
+            token = (await response.get_json())['token']
+
+            async with client.request(f'/api/events?access_token={token}&last_event_id=1-0') as connection:
+                await connection.send_complete()
+                assert (await receive_event(connection)).startswith('id: 1-1\nevent: grade\n')
+
+                event_hub.publish('announcement', {'id': 5, 'title': 'Başka ders', 'date_posted': None, 'course_id': 2})
+                event_hub.publish('announcement', {'id': 6, 'title': 'Genel', 'date_posted': None, 'course_id': None})
+                assert (await receive_event(connection)).startswith('id: 6-1\nevent: announcement\n')
+                await connection.disconnect()
+
+    asyncio.run(scenario())
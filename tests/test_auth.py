@@ -0,0 +1,61 @@
+from sqlalchemy import event
+from models import Users, Roles
+from api.auth import principal_cache
+from api.roles import role_registry
+
+
+def test_principal_is_cached_after_first_request(test_client, student_user, student_token):
+    """İlk yetkili istekten sonra kullanıcı özetinin önbellekte tutulduğunu test eder."""
+    headers = {'Authorization': f'Bearer {student_token}'}
+    assert test_client.get('/api/protected', headers=headers).status_code == 200
+
+    _, principal = principal_cache.get(student_user.id)
+    assert principal.username == 'student_test'
+    assert principal.role_name == 'Student'
+
+
+def test_deleted_user_is_evicted_from_principal_cache(test_client, admin_token, student_user, student_token):
+    """Silinen kullanıcının önbellekteki özetinin düşürüldüğünü test eder."""
+    student_headers = {'Authorization': f'Bearer {student_token}'}
+    admin_headers = {'Authorization': f'Bearer {admin_token}'}
+    assert test_client.get('/api/protected', headers=student_headers).status_code == 200
+
+    response = test_client.delete(f'/api/users/{student_user.id}', headers=admin_headers)
+    assert response.status_code == 200
+
+    assert principal_cache.get(student_user.id) is None
+    assert test_client.get('/api/protected', headers=student_headers).status_code == 401
+
+
+def test_token_with_stale_role_is_rejected(app, test_client, db, student_user, student_token):
+    """Token'daki role_id kullanıcının güncel rolüyle uyuşmazsa isteğin reddedildiğini test eder."""
+    admin_role = Roles(role_name='Admin')
+    db.session.add(admin_role)
+    db.session.commit()
+    user = db.session.get(Users, student_user.id)
+    user.role_id = admin_role.id
+    db.session.commit()
+    principal_cache.clear()
+
+    headers = {'Authorization': f'Bearer {student_token}'}
+    response = test_client.get('/api/users', headers=headers)
+    assert response.status_code == 401
+
+
+def test_unknown_role_does_not_reload_the_table_on_every_lookup(db, admin_user):
+    """Bilinmeyen rol adının her seferinde rol tablosunu yeniden okutmadığını, yeni eklenen rolün ise hemen görüldüğünü test eder."""
+    role_registry.load()
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        assert role_registry.ids_for(['Admin', 'Admn']) == {admin_user.role_id}
+        assert role_registry.id_for('Admn') is None
+        assert statements == []
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    role = Roles(role_name='Admn')
+    db.session.add(role)
+    db.session.commit()
+    assert role_registry.id_for('Admn') == role.id
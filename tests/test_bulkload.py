@@ -0,0 +1,29 @@
+import datetime
+import pytest
+from models import Departments, Courses
+from bulkload import BulkLoader, BulkLoadError, _CopyStream
+
+
+def test_copy_stream_escapes_values_in_copy_text_format():
+    stream = _CopyStream([(1, 'a\tb', None, datetime.datetime(2024, 3, 1, 9, 30)), (2, 'c\\d\ne', 1.5, True)])
+    data = b''
+    while chunk := stream.read(7):
+        data += chunk
+    assert data.decode() == '1\ta\\tb\t\\N\t2024-03-01 09:30:00\n2\tc\\\\d\\ne\t1.5\tt\n'
+    assert stream.count == 2
+
+
+def test_loader_reserves_ids_and_enforces_foreign_key_order(db):
+    loader = BulkLoader(batch_size=2)
+    department_ids = loader.reserve_ids(Departments, 2)
+    other_ids = loader.reserve_ids(Departments, 1)
+    assert list(other_ids) == [department_ids[-1] + 1]
+
+    loader.load(Departments, ('id', 'department_name'), [(i, f'Bölüm {i}') for i in department_ids])
+    loader.load(Courses, ('course_code', 'course_name', 'credits', 'department_id'),
+                [(f'C{i}', 'Ders', 3, department_ids[0]) for i in range(5)])
+    with pytest.raises(BulkLoadError):
+        loader.load(Departments, ('id', 'department_name'), [(other_ids[0], 'Geç')])
+    loader.commit()
+
+    assert Courses.query.filter_by(department_id=department_ids[0]).count() == 5
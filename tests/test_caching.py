@@ -0,0 +1,119 @@
+import fnmatch
+from api.caching import LRUCache, MemoryCache, RedisCache, ResponseCache, KeyedCache, response_cache
+from conftest import make_students_and_courses
+
+
+class FakeRedis:
+    """Testlerde Redis sunucusunun yerine geçen, kullanılan komutları destekleyen istemci."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value if isinstance(value, bytes) else str(value).encode()
+        return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def incr(self, key):
+        value = int(self.data.get(key, b'0')) + 1
+        self.data[key] = str(value).encode()
+        return value
+
+    def scan_iter(self, match):
+        return [key for key in list(self.data) if fnmatch.fnmatch(key, match)]
+
+    def info(self, section):
+        return {'evicted_keys': 0}
+
+
+def test_lru_cache_counts_hits_misses_and_evictions():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 1, 'size': 2}
+
+
+def test_memory_cache_versions_stay_bounded_without_reusing_old_versions():
+    backend = MemoryCache(maxsize=2)
+    seen = {backend.versions('a')}
+    backend.bump('a')
+    seen.add(backend.versions('a'))
+    for index in range(10):
+        backend.bump(f'other:{index}')
+    assert len(backend._versions) <= 2
+    assert backend.versions('a') not in seen
+    assert backend.versions('never-bumped') not in seen
+
+
+def test_redis_backend_shares_versions_between_workers():
+    """Bir işçideki yazma işleminin diğer işçinin sürümlerini de değiştirdiğini test eder."""
+    server = FakeRedis()
+    first, second = RedisCache(server), RedisCache(server)
+
+    before = second.versions('courses')
+    first.set('response:x', b'{}')
+    assert second.get('response:x') == b'{}'
+    first.bump('courses')
+    assert second.versions('courses') != before
+    assert second.versions('courses')[0] == before[0]
+
+    # Sunucu boşaltılırsa yeni bir epoch ile eski anahtarlar tekrar eşleşmez
+    server.data.clear()
+    assert second.versions('courses') != before
+    assert second.stats() == {'backend': 'redis', 'hits': 1, 'misses': 0, 'evictions': 0}
+
+
+def test_keyed_cache_invalidation_reaches_other_workers():
+    """Transkript gibi anahtar bazlı girdilerin başka bir işçide geçersizleştirilebildiğini test eder."""
+    server = FakeRedis()
+    workers = []
+    for _ in range(2):
+        cache = ResponseCache()
+        cache.backend = RedisCache(server)
+        workers.append(KeyedCache('transcript', cache=cache))
+    first, second = workers
+
+    entry, value = first.lookup(7)
+    assert value is None
+    first.store(entry, b'{"gpa": 70}')
+    assert second.lookup(7)[1] == b'{"gpa": 70}'
+
+    second.invalidate(7)
+    assert first.lookup(7)[1] is None
+    # Geçersizleştirmeden önce başlamış bir hesaplama yeni sürümün üzerine yazamaz
+    first.store(entry, b'{"gpa": 70}')
+    assert second.lookup(7)[1] is None
+
+
+def test_permission_dependent_response_is_cached_per_user(test_client, db, admin_user, admin_token, student_token):
+    """Bir kullanıcının önbelleğe giren yanıtının başka bir kullanıcıya verilmediğini test eder."""
+    student_ids, _ = make_students_and_courses(db, admin_user.role_id, student_count=1, course_count=0)
+    url = f'/api/students/{student_ids[0]}'
+
+    hits = response_cache.stats()['hits']
+    assert test_client.get(url, headers={'Authorization': f'Bearer {admin_token}'}).status_code == 200
+    assert test_client.get(url, headers={'Authorization': f'Bearer {admin_token}'}).status_code == 200
+    assert response_cache.stats()['hits'] == hits + 1
+
+    assert test_client.get(url, headers={'Authorization': f'Bearer {student_token}'}).status_code == 403
+
+
+def test_write_handler_invalidates_cached_list(test_client, db, admin_token):
+    assert test_client.get('/api/departments').json['departments'] == []
+    test_client.post('/api/departments', json={'department_name': 'Fizik'},
+                     headers={'Authorization': f'Bearer {admin_token}'})
+    assert [d['department_name'] for d in test_client.get('/api/departments').json['departments']] == ['Fizik']
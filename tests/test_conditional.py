@@ -0,0 +1,26 @@
+def test_catalog_etag_returns_304_without_database(test_client, db, admin_token, query_guard):
+    """Değişmeyen katalog için If-None-Match isteğinin sorgusuz 304 döndürdüğünü test eder."""
+    response = test_client.get('/api/departments')
+    assert response.status_code == 200
+    assert 'public' in response.headers['Cache-Control']
+    etag = response.headers['ETag']
+
+    response = test_client.get('/api/departments', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert query_guard[-1] == 0
+
+    # Farklı sorgu parametreleri farklı bir ETag üretir
+    assert test_client.get('/api/departments?limit=1').headers['ETag'] != etag
+
+
+def test_catalog_etag_changes_after_write(test_client, db, admin_token):
+    """Bölüm eklendikten sonra eski ETag'in geçersizleştiğini test eder."""
+    etag = test_client.get('/api/courses').headers['ETag']
+
+    response = test_client.post('/api/departments', json={'department_name': 'Fizik'},
+                                headers={'Authorization': f'Bearer {admin_token}'})
+    assert response.status_code == 201
+
+    response = test_client.get('/api/courses', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
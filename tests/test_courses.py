@@ -0,0 +1,97 @@
+import datetime
+import pytest
+from models import Exams, Exam_Results, Course_Registrations, Courses, Professors
+from conftest import make_students_and_courses
+
+
+def test_gradebook_matrix_and_statistics(test_client, db, admin_user, admin_token):
+    """Not defterinin öğrenci x sınav matrisini ve sınav istatistiklerini döndürdüğünü test eder."""
+    student_ids, course_ids = make_students_and_courses(db, admin_user.role_id, student_count=3, course_count=1)
+    course_id = course_ids[0]
+    db.session.add_all([Course_Registrations(student_id=s, course_id=course_id) for s in student_ids])
+    vize = Exams(exam_type='Vize', exam_date=datetime.datetime(2025, 11, 10), course_id=course_id)
+    final = Exams(exam_type='Final', exam_date=datetime.datetime(2026, 1, 10), course_id=course_id)
+    db.session.add_all([vize, final])
+    db.session.flush()
+    db.session.add_all([
+        Exam_Results(student_id=student_ids[0], exam_id=vize.id, grade=40),
+        Exam_Results(student_id=student_ids[1], exam_id=vize.id, grade=60),
+        Exam_Results(student_id=student_ids[2], exam_id=vize.id, grade=95),
+        Exam_Results(student_id=student_ids[0], exam_id=final.id, grade=70),
+    ])
+    db.session.commit()
+
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    response = test_client.get(f'/api/courses/{course_id}/gradebook', headers=headers)
+    assert response.status_code == 200
+    body = response.json
+
+    assert body['exam_ids'] == [vize.id, final.id]
+    assert body['student_ids'] == student_ids
+    assert body['grades'] == [[40, 70], [60, None], [95, None]]
+
+    vize_stats, final_stats = body['exams']
+    assert vize_stats['count'] == 3
+    assert vize_stats['mean'] == 65
+    assert vize_stats['median'] == 60
+    assert vize_stats['histogram']['counts'][4] == 1
+    assert vize_stats['histogram']['counts'][9] == 1
+    assert final_stats['count'] == 1
+    assert final_stats['stddev'] == 0
+
+
+@pytest.mark.max_queries(7)
+def test_gradebook_for_large_course_uses_constant_queries(test_client, db, admin_user, admin_token):
+    """2000 öğrencili bir derste not defterinin öğrenci sayısından bağımsız sayıda sorguyla hesaplandığını test eder.
+
+    Gecikme ölçümü benchmarks/run.py içindeki gradebook senaryosundadır."""
+    student_ids, course_ids = make_students_and_courses(db, admin_user.role_id, student_count=1, course_count=1)
+    course_id = course_ids[0]
+    exams = [Exams(exam_type=f'Sınav {i}', exam_date=datetime.datetime(2025, 10, 1 + i), course_id=course_id)
+             for i in range(4)]
+    db.session.add_all(exams)
+    db.session.flush()
+    db.session.execute(db.insert(Course_Registrations), [
+        {'student_id': s, 'course_id': course_id} for s in range(1, 2001)
+    ])
+    db.session.execute(db.insert(Exam_Results), [
+        {'student_id': s, 'exam_id': exam.id, 'grade': (s * 7 + i * 13) % 101}
+        for s in range(1, 2001) for i, exam in enumerate(exams)
+    ])
+    db.session.commit()
+
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    response = test_client.get(f'/api/courses/{course_id}/gradebook', headers=headers)
+
+    assert response.status_code == 200
+    body = response.json
+    assert body['exam_ids'] == [exam.id for exam in exams]
+    assert body['student_ids'] == list(range(1, 2001))
+    assert len(body['grades']) == 2000
+    assert {len(row) for row in body['grades']} == {4}
+    assert body['grades'][9] == [(10 * 7 + i * 13) % 101 for i in range(4)]
+    assert [stats['count'] for stats in body['exams']] == [2000] * 4
+
+
+@pytest.mark.max_queries(2)
+def test_course_list_includes_related_rows_without_n_plus_one(test_client, db, admin_user):
+    """include=department,professor ile ilişkilerin ders başına ek sorgu olmadan yüklendiğini test eder."""
+    _, course_ids = make_students_and_courses(db, admin_user.role_id, student_count=0, course_count=5)
+    professor = Professors(first_name='Ahmet', last_name='Demir', user_id=admin_user.id,
+                           department_id=db.session.get(Courses, course_ids[0]).department_id)
+    db.session.add(professor)
+    db.session.flush()
+    for course_id in course_ids:
+        db.session.get(Courses, course_id).professor_id = professor.id
+    db.session.commit()
+
+    response = test_client.get('/api/courses?include=department,professor')
+    assert response.status_code == 200
+    courses = response.json['courses']
+    assert len(courses) == 5
+    assert all(c['department']['department_name'] == 'Bilgisayar Mühendisliği' for c in courses)
+    assert all(c['professor']['last_name'] == 'Demir' for c in courses)
+
+
+def test_unknown_include_returns_400(test_client, db):
+    assert test_client.get('/api/courses?include=password').status_code == 400
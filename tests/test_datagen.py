@@ -0,0 +1,23 @@
+import pytest
+from models import Roles, Users, Students, Courses, Course_Registrations, Exam_Results
+from datagen import generate_university, DataGenerationError
+
+
+def test_generate_university_at_small_scale(db):
+    """Küçük ölçekte istenen satır sayılarının ve tutarlı ilişkilerin üretildiğini test eder."""
+    db.session.add_all([Roles(role_name='Professor'), Roles(role_name='Student')])
+    db.session.commit()
+
+    counts = generate_university(departments=3, professors=6, students=20, courses=9, registrations=60,
+                                 exam_results=150, announcements=5, batch_size=7, log=lambda message: None)
+
+    assert counts['students'] == Students.query.count() == 20
+    assert counts['course_registrations'] == Course_Registrations.query.count() == 60
+    assert counts['exam_results'] == Exam_Results.query.count() == 150
+    assert Courses.query.filter(Courses.professor_id.is_(None)).count() == 0
+    pairs = db.session.execute(db.select(Course_Registrations.student_id, Course_Registrations.course_id)).all()
+    assert len(set(pairs)) == len(pairs)
+    assert db.session.get(Users, Students.query.first().user_id).check_password('password123')
+
+    with pytest.raises(DataGenerationError):
+        generate_university(students=1, log=lambda message: None)
@@ -0,0 +1,235 @@
+import os
+import threading
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from models import (db as models_db, Roles, Users, Departments, Students, Professors, Courses, Course_Registrations,
+                    Course_Waitlist)
+from conftest import make_students_and_courses
+from api.enrollment import enroll, drop_registration, REGISTERED, WAITLISTED
+
+
+def test_full_course_waitlists_and_promotes_in_order(test_client, db, admin_user, admin_token):
+    """Kontenjan dolunca bekleme listesine alınan öğrencilerin sırayla kayda terfi ettiğini test eder."""
+    student_ids, course_ids = make_students_and_courses(db, admin_user.role_id, student_count=4, course_count=1)
+    course_id = course_ids[0]
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    assert test_client.put(f'/api/courses/{course_id}/capacity', json={'capacity': 1}, headers=headers).status_code == 200
+
+    responses = [test_client.post('/api/registrations', json={'student_id': s, 'course_id': course_id}, headers=headers)
+                 for s in student_ids[:3]]
+    assert [r.status_code for r in responses] == [201, 202, 202]
+    assert [r.json.get('position') for r in responses] == [None, 1, 2]
+    again = test_client.post('/api/registrations', json={'student_id': student_ids[1], 'course_id': course_id}, headers=headers)
+    assert (again.status_code, again.json['status']) == (409, 'already_waitlisted')
+
+    seats = test_client.get(f'/api/courses/{course_id}/seats', headers=headers).json
+    assert seats == {'course_id': course_id, 'capacity': 1, 'enrolled': 1, 'available': 0, 'waitlist_length': 2}
+
+    registration = Course_Registrations.query.filter_by(student_id=student_ids[0]).one()
+    response = test_client.delete(f'/api/registrations/{registration.id}', headers=headers)
+    assert response.json['promoted_student_ids'] == [student_ids[1]]
+
+    response = test_client.put(f'/api/courses/{course_id}/capacity', json={'capacity': 5}, headers=headers)
+    assert response.json['promoted_student_ids'] == [student_ids[2]]
+    assert test_client.get(f'/api/courses/{course_id}/waitlist', headers=headers).json['waitlist'] == []
+    assert db.session.get(Courses, course_id).enrolled_count == Course_Registrations.query.count() == 2
+
+
+# Satır sayısından bağımsız sabit sayıda sorgu: kilit, mevcut kayıtlar, ekleme, sayaç, bekleme listesi
+@pytest.mark.max_queries(12)
+def test_bulk_registration_respects_capacity(test_client, db, admin_user, admin_token):
+    student_ids, course_ids = make_students_and_courses(db, admin_user.role_id, student_count=3, course_count=2)
+    db.session.get(Courses, course_ids[0]).capacity = 2
+    db.session.commit()
+
+    payload = [{'student_id': s, 'course_id': c} for c in course_ids for s in student_ids]
+    response = test_client.post('/api/registrations/bulk', json=payload, headers={'Authorization': f'Bearer {admin_token}'})
+
+    assert response.json['summary'] == {'created': 5, 'waitlisted': 1}
+    assert [db.session.get(Courses, c).enrolled_count for c in course_ids] == [2, 3]
+    assert Course_Waitlist.query.one().student_id == student_ids[2]
+
+
+def test_professor_can_only_drop_registrations_in_own_courses(test_client, db, admin_user):
+    """Akademisyenin yalnızca kendi verdiği derslerin kayıtlarını silebildiğini test eder."""
+    student_ids, course_ids = make_students_and_courses(db, admin_user.role_id, student_count=1, course_count=2)
+    role = Roles(role_name='Professor')
+    user = Users(username='hoca', email='hoca@test.com', role=role)
+    user.password = 'password123'
+    db.session.add(user)
+    db.session.flush()
+    professor = Professors(first_name='Ayşe', last_name='Kaya', user_id=user.id,
+                           department_id=db.session.get(Courses, course_ids[0]).department_id)
+    db.session.add(professor)
+    db.session.flush()
+    db.session.get(Courses, course_ids[0]).professor_id = professor.id
+    own, other = (Course_Registrations(student_id=student_ids[0], course_id=c) for c in course_ids)
+    db.session.add_all([own, other])
+    db.session.commit()
+    token = test_client.post('/api/login', json={'username': 'hoca', 'password': 'password123'}).json['token']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    assert test_client.delete(f'/api/registrations/{other.id}', headers=headers).status_code == 403
+    assert test_client.delete(f'/api/registrations/{own.id}', headers=headers).status_code == 200
+    assert [r.course_id for r in Course_Registrations.query.all()] == [course_ids[1]]
+    # Satırlar doğrudan eklendiği için sayaca yansımamıştı; silme sayacı eksiye düşürmez
+    db.session.expire_all()
+    assert db.session.get(Courses, course_ids[0]).enrolled_count == 0
+
+
+def _stress_engine(tmp_path):
+    """Eşzamanlılık testleri için ayrı bağlantılarla çalışan bir motor.
+
+    Varsayılan olarak dosya tabanlı SQLite kullanılır; STRESS_DATABASE_URL ile
+    (ör. Postgres) gerçek satır kilitleriyle çalıştırılabilir.
+    """
+    url = os.environ.get('STRESS_DATABASE_URL', f'sqlite:///{tmp_path}/stress.db')
+    engine = create_engine(url, connect_args={'timeout': 60} if url.startswith('sqlite') else {},
+                           pool_size=20, max_overflow=0)
+    if url.startswith('sqlite'):
+        @event.listens_for(engine, 'connect')
+        def wal_mode(connection, record):
+            connection.execute('PRAGMA journal_mode=WAL')
+    models_db.metadata.drop_all(engine)
+    models_db.metadata.create_all(engine)
+    return engine
+
+
+def _seed_hot_course(Session, students, capacity):
+    """`students` öğrenci ve tek bir kontenjanlı ders oluşturup dersin id'sini döndürür."""
+    with Session() as session:
+        role = Roles(role_name='Student')
+        department = Departments(department_name='Fizik')
+        session.add_all([role, department])
+        session.flush()
+        session.add_all([Users(id=i, username=f'u{i}', email=f'u{i}@test.com', role_id=role.id, _password='x')
+                         for i in range(1, students + 1)])
+        session.flush()
+        session.add_all([Students(id=i, student_id=f'S{i}', first_name='Ad', last_name='Soyad', user_id=i,
+                                  department_id=department.id) for i in range(1, students + 1)])
+        course = Courses(course_code='HOT101', course_name='Popüler Ders', credits=3,
+                         department_id=department.id, capacity=capacity)
+        session.add(course)
+        session.commit()
+        return course.id
+
+
+def test_hot_course_is_never_oversubscribed_under_concurrency(tmp_path):
+    """Tek bir derse eşzamanlı gelen çok sayıda kaydın kontenjanı aşmadığını test eder."""
+    engine = _stress_engine(tmp_path)
+    Session = sessionmaker(bind=engine)
+    students, capacity, threads = 200, 25, 20
+    course_id = _seed_hot_course(Session, students, capacity)
+
+    statuses, errors = [], []
+    lock = threading.Lock()
+    start = threading.Barrier(threads)
+
+    def worker(offset):
+        start.wait()
+        with Session() as session:
+            for student_id in range(offset + 1, students + 1, threads):
+                try:
+                    status, _ = enroll(student_id, course_id, session)
+                except Exception as e:
+                    session.rollback()
+                    with lock:
+                        errors.append(e)
+                    continue
+                with lock:
+                    statuses.append(status)
+
+    pool = [threading.Thread(target=worker, args=(offset,)) for offset in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    with Session() as session:
+        registered = session.query(Course_Registrations).filter_by(course_id=course_id).count()
+        waitlisted = session.query(Course_Waitlist).filter_by(course_id=course_id).count()
+        enrolled_count = session.get(Courses, course_id).enrolled_count
+    engine.dispose()
+
+    assert errors == []
+    assert statuses.count(REGISTERED) == registered == enrolled_count == capacity
+    assert statuses.count(WAITLISTED) == waitlisted == students - capacity
+
+
+def test_no_seat_stays_free_while_students_wait_under_concurrent_drops(tmp_path):
+    """Dolu derse kayıtlar ile kayıt silmeler aynı anda yapılırken boş koltuk varken kimsenin beklemede kalmadığını test eder."""
+    engine = _stress_engine(tmp_path)
+    Session = sessionmaker(bind=engine)
+    students, capacity, threads = 120, 20, 12
+    course_id = _seed_hot_course(Session, students, capacity)
+    with Session() as session:
+        for student_id in range(1, capacity + 1):
+            enroll(student_id, course_id, session)
+
+    errors = []
+    lock = threading.Lock()
+    start = threading.Barrier(threads)
+
+    def dropper(offset):
+        start.wait()
+        with Session() as session:
+            for student_id in range(offset + 1, capacity + 1, threads // 2):
+                try:
+                    registration = session.query(Course_Registrations).filter_by(
+                        student_id=student_id, course_id=course_id).one()
+                    drop_registration(registration, session)
+                except Exception as e:
+                    session.rollback()
+                    with lock:
+                        errors.append(e)
+
+    def enroller(offset):
+        start.wait()
+        with Session() as session:
+            for student_id in range(capacity + 1 + offset, students + 1, threads // 2):
+                try:
+                    enroll(student_id, course_id, session)
+                except Exception as e:
+                    session.rollback()
+                    with lock:
+                        errors.append(e)
+
+    pool = [threading.Thread(target=target, args=(offset,))
+            for offset in range(threads // 2) for target in (dropper, enroller)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    with Session() as session:
+        registered = session.query(Course_Registrations).filter_by(course_id=course_id).count()
+        waitlist_length = session.query(Course_Waitlist).filter_by(course_id=course_id).count()
+        enrolled_count = session.get(Courses, course_id).enrolled_count
+    engine.dispose()
+
+    assert errors == []
+    assert enrolled_count == registered <= capacity
+    available = capacity - enrolled_count
+    assert available == 0 or waitlist_length == 0
+
+
+def test_seat_freed_while_joining_the_waitlist_is_handed_out(tmp_path):
+    """Dolu derse kayıt geri alınıp bekleme listesine yazılmadan hemen önce boşalan koltuğun öğrenciye verildiğini test eder."""
+    engine = _stress_engine(tmp_path)
+    Session = sessionmaker(bind=engine)
+    course_id = _seed_hot_course(Session, students=2, capacity=1)
+    with Session() as session:
+        enroll(1, course_id, session)
+
+    with Session() as session:
+        @event.listens_for(session, 'after_rollback', once=True)
+        def drop_in_the_gap(session):
+            # Başka bir istek koltuğu bu arada boşaltır; bekleme listesi henüz boş
+            with Session() as other:
+                assert drop_registration(other.query(Course_Registrations).filter_by(student_id=1).one(), other) == []
+
+        assert enroll(2, course_id, session) == (REGISTERED, None)
+        assert session.query(Course_Waitlist).count() == 0
+        assert session.get(Courses, course_id).enrolled_count == 1
+    engine.dispose()
@@ -0,0 +1,99 @@
+import datetime
+import pytest
+from models import Announcements, Course_Registrations, Exams, Students
+from conftest import make_students_and_courses
+from api.pubsub import event_hub
+
+
+def _events(stream, count):
+    """SSE akışından `count` olay okur; olay dışındaki satırlar (retry, keep-alive) atlanır."""
+    events = []
+    for _ in range(count * 20):
+        chunk = next(stream).decode()
+        if chunk.startswith('id:'):
+            fields = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+            events.append((fields['id'], fields['event'], fields['data']))
+            if len(events) == count:
+                return events
+    raise AssertionError(f'{count} olay beklenirken {len(events)} olay geldi')
+
+
+@pytest.fixture
+def fast_heartbeat(app):
+    app.config['EVENTS_HEARTBEAT_SECONDS'] = 0.01
+    yield
+    app.config['EVENTS_HEARTBEAT_SECONDS'] = 15
+
+
+def test_event_stream_pushes_own_announcements_and_grades_and_resumes(
+        test_client, db, admin_user, admin_token, student_user, student_token, fast_heartbeat):
+    """Akışın yalnızca öğrencinin derslerine ait duyuruları ve kendi notlarını ilettiğini, Last-Event-ID ile devam ettiğini test eder."""
+    _, (own_course, other_course) = make_students_and_courses(db, admin_user.role_id, student_count=0)
+    student = Students(student_id='2024999', first_name='Ad', last_name='Soyad', user_id=student_user.id, department_id=1)
+    exam = Exams(exam_type='Vize', exam_date=datetime.datetime(2025, 11, 1), course_id=own_course)
+    db.session.add_all([student, exam, Announcements(title='Eski', content='...')])
+    db.session.flush()
+    db.session.add(Course_Registrations(student_id=student.id, course_id=own_course))
+    db.session.commit()
+    student_id, exam_id = student.id, exam.id
+
+    admin = {'Authorization': f'Bearer {admin_token}'}
+    issued = test_client.post('/api/events/token', headers={'Authorization': f'Bearer {student_token}'}).json
+    assert issued['expires_in'] == 60
+    response = test_client.get(f"/api/events?access_token={issued['token']}", headers={'Last-Event-ID': '0-0'},
+                               buffered=False)
+    assert response.mimetype == 'text/event-stream'
+    stream = iter(response.response)
+    (event_id, kind, data), = _events(stream, 1)
+    assert (event_id, kind, '"title":"Eski"' in data) == ('1-0', 'announcement', True)
+
+    for course_id in (other_course, own_course):
+        test_client.post('/api/announcements', json={'title': f'Ders {course_id}', 'content': 'İçerik',
+                                                     'course_id': course_id}, headers=admin)
+    test_client.post('/api/exam_results', json={'student_id': student_id, 'exam_id': exam_id, 'grade': 85},
+                     headers=admin)
+    (announcement_id, kind, data), (grade_id, grade_kind, grade_data) = _events(stream, 2)
+    assert (announcement_id, kind, f'"course_id":{own_course}' in data) == ('3-0', 'announcement', True)
+    assert (grade_id, grade_kind, '"grade":85' in grade_data) == ('3-1', 'grade', True)
+    response.close()
+    assert event_hub.subscriber_count() == 0
+
+    # Kopan istemci son olay id'siyle bağlanınca yalnızca kaçırdıklarını alır
+    test_client.post('/api/announcements', json={'title': 'Genel', 'content': 'İçerik'}, headers=admin)
+    response = test_client.get('/api/events', headers={'Authorization': f'Bearer {student_token}',
+                                                       'Last-Event-ID': '1-0'}, buffered=False)
+    replayed = _events(iter(response.response), 3)
+    assert [(event_id, kind) for event_id, kind, _ in replayed] == [('3-0', 'announcement'), ('4-0', 'announcement'),
+                                                                    ('4-1', 'grade')]
+    response.close()
+
+
+def test_event_stream_refreshes_courses_without_going_idle(test_client, db, app, admin_user, admin_token,
+                                                            student_user, student_token, fast_heartbeat):
+    """Kalp atışı beklenmeden, sonraki olayda öğrencinin yeni kayıt olduğu dersin duyurularının geldiğini test eder."""
+    _, (course_id, _) = make_students_and_courses(db, admin_user.role_id, student_count=0)
+    student = Students(student_id='2024999', first_name='Ad', last_name='Soyad', user_id=student_user.id, department_id=1)
+    db.session.add(student)
+    db.session.commit()
+    student_id = student.id
+    app.config['EVENTS_AUDIENCE_REFRESH_SECONDS'] = 0
+    try:
+        response = test_client.get('/api/events', headers={'Authorization': f'Bearer {student_token}'}, buffered=False)
+        stream = iter(response.response)
+        db.session.add(Course_Registrations(student_id=student_id, course_id=course_id))
+        db.session.commit()
+        test_client.post('/api/announcements', json={'title': 'Yeni kayıt', 'content': 'İçerik', 'course_id': course_id},
+                         headers={'Authorization': f'Bearer {admin_token}'})
+        (_, kind, data), = _events(stream, 1)
+        assert (kind, '"title":"Yeni kayıt"' in data) == ('announcement', True)
+        response.close()
+    finally:
+        app.config.pop('EVENTS_AUDIENCE_REFRESH_SECONDS')
+
+
+def test_event_stream_requires_a_token(test_client, db, student_token):
+    """URL'de yalnızca akış token'ının, akış token'ının da yalnızca akışta kabul edildiğini test eder."""
+    assert test_client.get('/api/events').status_code == 401
+    assert test_client.get(f'/api/events?access_token={student_token}').status_code == 401
+    token = test_client.post('/api/events/token', headers={'Authorization': f'Bearer {student_token}'}).json['token']
+    assert test_client.get('/api/protected', headers={'Authorization': f'Bearer {token}'}).status_code == 401
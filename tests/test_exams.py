@@ -0,0 +1,82 @@
+import datetime
+from models import Exams, Exam_Results, Course_Registrations, Courses
+from conftest import make_students_and_courses
+
+
+def _exam_with_registrations(db, role_id):
+    student_ids, course_ids = make_students_and_courses(db, role_id, student_count=3, course_count=1)
+    db.session.add_all([
+        Course_Registrations(student_id=student_id, course_id=course_ids[0])
+        for student_id in student_ids[:2]
+    ])
+    exam = Exams(exam_type='Vize', exam_date=datetime.datetime(2025, 11, 10), course_id=course_ids[0])
+    db.session.add(exam)
+    db.session.commit()
+    return exam.id, student_ids
+
+
+def test_bulk_grades_validate_registration_and_range(test_client, db, admin_user, admin_token):
+    """Toplu not girişinin kayıtsız öğrencileri ve geçersiz notları satır bazında raporladığını test eder."""
+    exam_id, student_ids = _exam_with_registrations(db, admin_user.role_id)
+    payload = [
+        {'student_id': student_ids[0], 'grade': 70},
+        {'student_id': student_ids[1], 'grade': 140},
+        {'student_id': student_ids[2], 'grade': 50},
+        {'student_id': student_ids[0], 'grade': 80},
+    ]
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    response = test_client.post(f'/api/exams/{exam_id}/results/bulk', json=payload, headers=headers)
+
+    assert response.status_code == 200
+    assert [r['status'] for r in response.json['results']] == ['created', 'invalid', 'not_registered', 'duplicate']
+    assert 'rows_per_second' in response.json
+    assert Exam_Results.query.count() == 1
+
+
+def test_bulk_grades_replace_existing(test_client, db, admin_user, admin_token):
+    exam_id, student_ids = _exam_with_registrations(db, admin_user.role_id)
+    db.session.add(Exam_Results(student_id=student_ids[0], exam_id=exam_id, grade=40))
+    db.session.commit()
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    payload = [{'student_id': student_ids[0], 'grade': 65}, {'student_id': student_ids[1], 'grade': 90}]
+
+    response = test_client.post(f'/api/exams/{exam_id}/results/bulk', json=payload, headers=headers)
+    assert response.json['summary'] == {'already_graded': 1, 'created': 1}
+
+    response = test_client.post(f'/api/exams/{exam_id}/results/bulk?replace=true', json=payload, headers=headers)
+    assert response.json['summary'] == {'updated': 2}
+    db.session.expire_all()
+    grades = {r.student_id: r.grade for r in Exam_Results.query.all()}
+    assert grades == {student_ids[0]: 65, student_ids[1]: 90}
+
+
+def test_transcript_is_credit_weighted_and_invalidated_on_grade_write(test_client, db, admin_user, admin_token):
+    """Transkriptin kredi ağırlıklı hesaplandığını ve not girişinde önbelleğin yenilendiğini test eder."""
+    student_ids, course_ids = make_students_and_courses(db, admin_user.role_id, student_count=1, course_count=2)
+    student_id = student_ids[0]
+    db.session.get(Courses, course_ids[1]).credits = 6
+    exams = [
+        Exams(exam_type='Vize', exam_date=datetime.datetime(2025, 11, 10), course_id=course_ids[0]),
+        Exams(exam_type='Final', exam_date=datetime.datetime(2026, 1, 10), course_id=course_ids[0]),
+        Exams(exam_type='Vize', exam_date=datetime.datetime(2025, 11, 12), course_id=course_ids[1]),
+    ]
+    db.session.add_all(exams)
+    db.session.flush()
+    db.session.add_all([Course_Registrations(student_id=student_id, course_id=c) for c in course_ids])
+    db.session.add_all([
+        Exam_Results(student_id=student_id, exam_id=exams[0].id, grade=60),
+        Exam_Results(student_id=student_id, exam_id=exams[1].id, grade=80),
+    ])
+    db.session.commit()
+    headers = {'Authorization': f'Bearer {admin_token}'}
+
+    response = test_client.get(f'/api/students/{student_id}/transcript', headers=headers)
+    assert response.status_code == 200
+    assert response.json['courses'][0]['average'] == 70
+    assert response.json['gpa'] == 70
+
+    test_client.post('/api/exam_results', json={'student_id': student_id, 'exam_id': exams[2].id, 'grade': 100},
+                     headers=headers)
+    response = test_client.get(f'/api/students/{student_id}/transcript', headers=headers)
+    assert response.json['total_credits'] == 9
+    assert response.json['gpa'] == round((70 * 3 + 100 * 6) / 9, 2)
@@ -0,0 +1,18 @@
+import json
+from models import Announcements
+
+
+def test_announcements_stream_as_ndjson(test_client, db):
+    """`?format=ndjson` ile her satırın ayrı bir JSON nesnesi olarak akıtıldığını test eder."""
+    db.session.add_all([
+        Announcements(title=f'Duyuru {i}', content='İçerik') for i in range(3)
+    ])
+    db.session.commit()
+
+    response = test_client.get('/api/announcements?format=ndjson')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+
+    rows = [json.loads(line) for line in response.data.decode('utf-8').splitlines()]
+    assert [row['title'] for row in rows] == ['Duyuru 0', 'Duyuru 1', 'Duyuru 2']
+    assert set(rows[0]) == {'id', 'title', 'content', 'date_posted', 'course_id'}
@@ -0,0 +1,46 @@
+from models import Courses, Departments, Students
+from conftest import make_students_and_courses
+
+
+def test_student_list_filters_by_department_and_name(test_client, db, admin_user, admin_token):
+    """department_id ve name filtrelerinin SQL tarafında uygulandığını test eder."""
+    student_ids, _ = make_students_and_courses(db, admin_user.role_id, student_count=3, course_count=0)
+    other = Departments(department_name='Fizik')
+    db.session.add(other)
+    db.session.flush()
+    first, second, third = (db.session.get(Students, s) for s in student_ids)
+    first.first_name, first.last_name = 'Ayşe', 'Yılmaz'
+    second.first_name, second.last_name = 'Ali', 'Yıldız'
+    third.first_name, third.last_name = 'Ali', 'Kaya'
+    third.department_id = other.id
+    db.session.commit()
+
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    response = test_client.get('/api/students?name=Yıl', headers=headers)
+    assert [s['id'] for s in response.json['students']] == [first.id, second.id]
+
+    response = test_client.get('/api/students?name=ali yıl', headers=headers)
+    assert [s['id'] for s in response.json['students']] == [second.id]
+
+    response = test_client.get(f'/api/students?name=Ali&department_id={other.id}', headers=headers)
+    assert [s['id'] for s in response.json['students']] == [third.id]
+
+    response = test_client.get(f'/api/students?department_id={other.id}&format=ndjson', headers=headers)
+    assert response.get_data(as_text=True).count('\n') == 1
+
+
+def test_course_list_filters_by_code_prefix(test_client, db, admin_user):
+    """course_code önekinin LIKE joker karakterlerini kaçışladığını test eder."""
+    _, course_ids = make_students_and_courses(db, admin_user.role_id, student_count=0, course_count=2)
+    db.session.add(Courses(course_code='MAT101', course_name='Analiz', credits=4,
+                           department_id=db.session.get(Courses, course_ids[0]).department_id))
+    db.session.commit()
+
+    response = test_client.get('/api/courses?course_code=CS')
+    assert [c['id'] for c in response.json['courses']] == course_ids
+    assert test_client.get('/api/courses?course_code=%25').json['courses'] == []
+    assert test_client.get('/api/courses?course_code=_S').json['courses'] == []
+
+
+def test_invalid_filter_value_returns_400(test_client, db):
+    assert test_client.get('/api/professors?department_id=abc').status_code == 400
@@ -0,0 +1,59 @@
+from hashing import PasswordHasher, password_hasher
+from models import Users, Roles, Students, Departments
+
+
+def test_process_pool_hash_roundtrip():
+    """Süreç havuzunda üretilen hash'in doğrulanabildiğini ve metriklerin tutulduğunu test eder."""
+    hasher = PasswordHasher()
+    hasher.configure(log_rounds=4, workers=2, max_queue=4)
+    try:
+        hashed = hasher.hash('gizli')
+        assert hasher.check(hashed, 'gizli')
+        assert not hasher.check(hashed, 'yanlis')
+        assert len(set(hasher.hash_many(['a', 'b', 'c']))) == 3
+    finally:
+        hasher.shutdown()
+
+    stats = hasher.stats()
+    assert stats['hash_operations_total'] == 4
+    assert stats['hash_queue_depth'] == 0
+
+
+def test_saturated_pool_returns_503_with_retry_after(test_client, admin_user):
+    """Hash kuyruğu doluyken girişin beklemeden 503 döndürdüğünü test eder."""
+    password_hasher.configure(workers=0, max_queue=0)
+    assert password_hasher._slots.acquire(blocking=False)
+    try:
+        response = test_client.post('/api/login', json={'username': admin_user.username, 'password': 'password123'})
+    finally:
+        password_hasher._slots.release()
+        password_hasher.configure(max_queue=64)
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert password_hasher.stats()['hash_rejected_total'] >= 1
+
+    body = test_client.get('/metrics').get_data(as_text=True)
+    assert 'password_hash_rejected_total' in body
+    assert 'password_hash_duration_seconds_count{operation="hash"}' in body
+    assert 'password_hash_queue_depth 0.0' in body
+
+
+def test_create_students_in_bulk(test_client, db, admin_token):
+    db.session.add(Roles(role_name='Student'))
+    department = Departments(department_name='Fizik')
+    db.session.add(department)
+    db.session.commit()
+
+    payload = [
+        {'username': f'fizik{i}', 'password': 'parola', 'email': f'fizik{i}@test.com',
+         'student_id': f'F{i}', 'first_name': 'Ad', 'last_name': 'Soyad', 'department_id': department.id}
+        for i in range(3)
+    ]
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    response = test_client.post('/api/students', json=payload, headers=headers)
+
+    assert response.status_code == 201
+    assert len(response.json['created']) == 3
+    assert Students.query.count() == 3
+    assert Users.query.filter_by(username='fizik1').first().check_password('parola')
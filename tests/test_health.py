@@ -0,0 +1,20 @@
+from settings import engine_options_from_env
+
+
+def test_healthz_and_readyz(test_client, db):
+    assert test_client.get('/healthz').json == {'status': 'ok'}
+    response = test_client.get('/readyz')
+    assert response.status_code == 200
+    assert response.json['status'] == 'ok'
+    assert 'class' in response.json['pool']
+
+
+def test_engine_options_from_env(monkeypatch):
+    """Havuz ayarlarının ortam değişkenlerinden okunduğunu test eder."""
+    monkeypatch.setenv('DB_POOL_SIZE', '8')
+    monkeypatch.setenv('DB_STATEMENT_TIMEOUT_MS', '5000')
+    options = engine_options_from_env('postgresql://u:p@db/x')
+    assert options['pool_size'] == 8
+    assert options['pool_pre_ping'] is True
+    assert options['connect_args'] == {'options': '-c statement_timeout=5000'}
+    assert 'pool_size' not in engine_options_from_env('sqlite:///:memory:')
@@ -0,0 +1,105 @@
+import datetime
+import orjson
+from models import Jobs, Job_Result_Chunks, Courses
+from conftest import make_students_and_courses
+from api.jobs import job_queue, requeue_stale, QUEUED, RUNNING, SUCCEEDED, FAILED
+
+
+def run_jobs(limits=None):
+    """Kuyruktaki görevleri testin iş parçacığında çalıştırır."""
+    return job_queue.create_pool(0, limits=limits).drain()
+
+
+def test_export_job_runs_and_result_downloads(test_client, app, db, admin_user, admin_token):
+    """Dışa aktarım görevinin kuyruğa alınıp çalıştırıldığını, sonucunun parça parça saklanıp akışla indirildiğini test eder."""
+    student_ids, _ = make_students_and_courses(db, admin_user.role_id, student_count=3, course_count=1)
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    app.config['JOBS_RESULT_CHUNK_BYTES'] = 64
+
+    response = test_client.post('/api/jobs', json={'type': 'export', 'params': {'resource': 'students'}}, headers=headers)
+    assert response.status_code == 202
+    job_id = response.json['job_id']
+    assert response.headers['Location'] == f'/api/jobs/{job_id}'
+    assert test_client.get(f'/api/jobs/{job_id}/result', headers=headers).status_code == 409
+
+    try:
+        assert run_jobs() == 1
+    finally:
+        app.config.pop('JOBS_RESULT_CHUNK_BYTES')
+    job = test_client.get(f'/api/jobs/{job_id}', headers=headers).json
+    assert (job['status'], job['progress'], job['total']) == (SUCCEEDED, 3, 3)
+    chunks = db.session.scalars(db.select(Job_Result_Chunks.data).where(Job_Result_Chunks.job_id == job_id)
+                                .order_by(Job_Result_Chunks.seq)).all()
+    assert len(chunks) > 1 and all(len(chunk) <= 64 for chunk in chunks)
+
+    result = test_client.get(job['result_url'], headers=headers)
+    assert result.is_streamed and result.mimetype == 'application/x-ndjson'
+    assert result.data == b''.join(chunks)
+    assert [orjson.loads(line)['id'] for line in result.data.splitlines()] == student_ids
+
+
+def test_async_bulk_registration_and_access(test_client, db, admin_user, admin_token, student_token):
+    student_ids, course_ids = make_students_and_courses(db, admin_user.role_id, student_count=2, course_count=1)
+    payload = [{'student_id': s, 'course_id': course_ids[0]} for s in student_ids] + [{'student_id': 'x'}]
+
+    response = test_client.post('/api/registrations/bulk?async=1', json=payload,
+                                headers={'Authorization': f'Bearer {admin_token}'})
+    assert response.status_code == 202
+    job_id = response.json['job_id']
+    run_jobs()
+
+    result = test_client.get(f'/api/jobs/{job_id}/result', headers={'Authorization': f'Bearer {admin_token}'}).json
+    assert result['summary'] == {'created': 2, 'invalid': 1}
+    assert db.session.get(Courses, course_ids[0]).enrolled_count == 2
+
+    # Öğrenci başkasının görevini göremez, yalnızca izin verilen türleri başlatabilir
+    student_headers = {'Authorization': f'Bearer {student_token}'}
+    assert test_client.get(f'/api/jobs/{job_id}', headers=student_headers).status_code == 403
+    assert test_client.post('/api/jobs', json={'type': 'export', 'params': {'resource': 'students'}},
+                            headers=student_headers).status_code == 403
+    assert test_client.get('/api/jobs', headers=student_headers).json['jobs'] == []
+
+
+def test_invalid_jobs_are_rejected_or_fail(test_client, db, admin_token):
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    assert test_client.post('/api/jobs', json={'type': 'unknown'}, headers=headers).status_code == 400
+    assert test_client.post('/api/jobs', json={'type': 'export', 'params': {'resource': 'users'}},
+                            headers=headers).status_code == 400
+
+    response = test_client.post('/api/jobs', json={'type': 'exam_results_import', 'params': {'exam_id': 999, 'rows': []}},
+                                headers=headers)
+    run_jobs()
+    job = test_client.get(f"/api/jobs/{response.json['job_id']}", headers=headers).json
+    assert (job['status'], job['error']) == (FAILED, '999 numaralı sınav bulunamadı.')
+    assert test_client.get(f"/api/jobs/{response.json['job_id']}/result", headers=headers).status_code == 409
+
+
+def test_concurrency_limit_and_stale_jobs(test_client, db, admin_user, admin_token):
+    """Sınırı dolan türün beklediğini, diğer türlerin çalıştığını ve ölü işçinin görevinin geri alındığını test eder."""
+    _, course_ids = make_students_and_courses(db, admin_user.role_id, student_count=1, course_count=2)
+    db.session.get(Courses, course_ids[0]).enrolled_count = 5
+    db.session.commit()
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    export = test_client.post('/api/jobs', json={'type': 'export', 'params': {'resource': 'students'}}, headers=headers)
+    recount = test_client.post('/api/jobs', json={'type': 'recount_enrollments'}, headers=headers)
+
+    assert run_jobs(limits={'export': 0}) == 1
+    assert db.session.get(Jobs, export.json['job_id']).status == QUEUED
+    result = test_client.get(f"/api/jobs/{recount.json['job_id']}/result", headers=headers).json
+    assert result == {'courses': 2, 'corrected_course_ids': [course_ids[0]]}
+    db.session.expire_all()
+    assert db.session.get(Courses, course_ids[0]).enrolled_count == 0
+
+    old = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) - datetime.timedelta(hours=1)
+    job = db.session.get(Jobs, export.json['job_id'])
+    job.status, job.heartbeat_at, job.attempts = RUNNING, old, 1
+    db.session.commit()
+    assert requeue_stale(stale_seconds=60) == (1, 0)
+    db.session.refresh(job)
+    assert job.status == QUEUED
+
+    job.status, job.heartbeat_at, job.attempts = RUNNING, old, 3
+    db.session.commit()
+    assert requeue_stale(stale_seconds=60) == (0, 1)
+    db.session.refresh(job)
+    assert job.status == FAILED
@@ -0,0 +1,27 @@
+import logging
+from metrics import request_metrics, redact
+from conftest import make_students_and_courses
+
+
+def test_metrics_endpoint_reports_latency_and_sql_per_endpoint(test_client, db, admin_user):
+    make_students_and_courses(db, admin_user.role_id, student_count=0, course_count=2)
+    assert test_client.get('/api/courses').status_code == 200
+
+    body = test_client.get('/metrics').get_data(as_text=True)
+    assert 'http_request_duration_seconds_count{endpoint="api.get_all_courses",method="GET",status="200"}' in body
+    assert 'http_request_sql_queries_bucket{endpoint="api.get_all_courses"' in body
+    assert 'http_response_size_bytes_sum{endpoint="api.get_all_courses"}' in body
+
+
+def test_slow_queries_are_logged_with_redacted_parameters(test_client, db, admin_user, admin_token, monkeypatch, caplog):
+    """Eşiği aşan sorguların parametre değerleri olmadan loglandığını test eder."""
+    monkeypatch.setattr(request_metrics, 'slow_query_seconds', 0)
+    monkeypatch.setattr(request_metrics, 'server_timing', True)
+    with caplog.at_level(logging.WARNING, logger='slow_query'):
+        response = test_client.get(f'/api/users/{admin_user.id}', headers={'Authorization': f'Bearer {admin_token}'})
+
+    assert response.headers['Server-Timing'].startswith('db;desc="')
+    assert any('[api.get_user]' in record.getMessage() for record in caplog.records)
+    assert 'admin@test.com' not in caplog.text
+    assert redact({'id': 5}) == {'id': '?'}
+    assert redact([(1, 'a'), (2, 'b')]) == '<2 parametre kümesi>'
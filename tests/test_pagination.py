@@ -0,0 +1,43 @@
+from models import Departments
+
+
+def _add_departments(db, count):
+    db.session.add_all([Departments(department_name=f'Bölüm {i}') for i in range(count)])
+    db.session.commit()
+
+
+def test_list_endpoint_follows_next_cursor(test_client, db):
+    """Liste uç noktasının imleç ile tüm kayıtları sayfa sayfa döndürdüğünü test eder."""
+    _add_departments(db, 5)
+
+    seen = []
+    cursor = None
+    while True:
+        url = '/api/departments?limit=2' + (f'&after={cursor}' if cursor else '')
+        response = test_client.get(url)
+        assert response.status_code == 200
+        assert len(response.json['departments']) <= 2
+        seen.extend(d['id'] for d in response.json['departments'])
+        cursor = response.json['next_cursor']
+        if cursor is None:
+            break
+
+    assert seen == sorted(seen)
+    assert len(seen) == 5
+
+
+def test_limit_is_capped_by_max_page_size(app, test_client, db):
+    """Sunucu tarafındaki en büyük sayfa boyutunun aşılamadığını test eder."""
+    _add_departments(db, 4)
+    app.config['PAGE_SIZE_MAX'] = 3
+    try:
+        response = test_client.get('/api/departments?limit=1000')
+    finally:
+        app.config.pop('PAGE_SIZE_MAX')
+    assert len(response.json['departments']) == 3
+    assert response.json['next_cursor'] is not None
+
+
+def test_invalid_cursor_returns_400(test_client, db):
+    response = test_client.get('/api/departments?after=abc')
+    assert response.status_code == 400
@@ -0,0 +1,55 @@
+import io
+from models import Course_Registrations
+from conftest import make_students_and_courses
+
+
+def test_bulk_registration_reports_per_row_outcome(test_client, db, admin_user, admin_token):
+    """Toplu kayıt uç noktasının her satır için sonucu döndürdüğünü test eder."""
+    student_ids, course_ids = make_students_and_courses(db, admin_user.role_id)
+    db.session.add(Course_Registrations(student_id=student_ids[0], course_id=course_ids[0]))
+    db.session.commit()
+
+    payload = {'registrations': [
+        {'student_id': student_ids[0], 'course_id': course_ids[0]},
+        {'student_id': student_ids[0], 'course_id': course_ids[1]},
+        {'student_id': student_ids[1], 'course_id': course_ids[1]},
+        {'student_id': student_ids[1], 'course_id': course_ids[1]},
+        {'student_id': 9999, 'course_id': course_ids[0]},
+        {'student_id': student_ids[1], 'course_id': 9999},
+        {'student_id': 'abc', 'course_id': course_ids[0]},
+    ]}
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    response = test_client.post('/api/registrations/bulk', json=payload, headers=headers)
+
+    assert response.status_code == 200
+    statuses = [r['status'] for r in response.json['results']]
+    assert statuses == ['already_registered', 'created', 'created', 'duplicate',
+                        'student_not_found', 'course_not_found', 'invalid']
+    assert Course_Registrations.query.count() == 3
+
+
+def test_bulk_registration_accepts_csv_upload(test_client, db, admin_user, admin_token):
+    student_ids, course_ids = make_students_and_courses(db, admin_user.role_id)
+    csv_text = 'student_id,course_id\n' + '\n'.join(
+        f'{s},{c}' for s in student_ids for c in course_ids
+    )
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    response = test_client.post(
+        '/api/registrations/bulk',
+        data={'file': (io.BytesIO(csv_text.encode('utf-8')), 'kayitlar.csv')},
+        headers=headers,
+        content_type='multipart/form-data'
+    )
+
+    assert response.status_code == 200
+    assert response.json['summary'] == {'created': 4}
+    assert Course_Registrations.query.count() == 4
+
+    # UTF-8 olmayan dosya sunucu hatası değil, 400 döndürür
+    response = test_client.post(
+        '/api/registrations/bulk',
+        data={'file': (io.BytesIO('student_id,course_id\nÖğrenci,1'.encode('cp1254')), 'kayitlar.csv')},
+        headers=headers,
+        content_type='multipart/form-data'
+    )
+    assert response.status_code == 400
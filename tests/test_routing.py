@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import insert
+from app import db as flask_db
+from models import Departments
+from api.routing import read_replica
+
+
+@pytest.fixture
+def replica(app, db, tmp_path):
+    """Okuma kopyası olarak ayrı bir SQLite dosyası bağlar; birincil test veritabanı aynı kalır."""
+    read_replica.init_app(app, url=f'sqlite:///{tmp_path / "replica.db"}')
+    flask_db.metadata.create_all(read_replica.engine)
+    yield read_replica.engine
+    read_replica.init_app(app)
+
+
+def test_get_requests_read_from_replica_until_tables_are_written(test_client, db, admin_token, replica):
+    db.session.add(Departments(department_name='Birincil'))
+    db.session.commit()
+    with replica.begin() as connection:
+        connection.execute(insert(Departments), [{'department_name': 'Kopya'}])
+
+    names = [d['department_name'] for d in test_client.get('/api/departments').json['departments']]
+    assert names == ['Kopya']
+
+    # Yazma birincile gider; tabloya yeni yazıldığı için sonraki okuma da birincilden yapılır
+    response = test_client.post('/api/departments', json={'department_name': 'Yeni'},
+                                headers={'Authorization': f'Bearer {admin_token}'})
+    assert response.status_code == 201
+    names = [d['department_name'] for d in test_client.get('/api/departments').json['departments']]
+    assert names == ['Birincil', 'Yeni']
+
+
+def test_user_reads_own_writes_from_primary(test_client, db, admin_user, admin_token, replica):
+    """Kimlik doğrulaması kopyada olmayan kullanıcı için de birincilden yapılır."""
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    response = test_client.get('/api/users', headers=headers)
+    assert response.status_code == 200
+    assert response.json['users'] == []
+
+    test_client.post('/api/departments', json={'department_name': 'Fizik'}, headers=headers)
+    usernames = [u['username'] for u in test_client.get('/api/users', headers=headers).json['users']]
+    assert usernames == [admin_user.username]
@@ -0,0 +1,62 @@
+from models import Announcements, Courses, Departments
+
+
+def _catalog(db):
+    department = Departments(department_name='Coğrafya')
+    db.session.add(department)
+    db.session.flush()
+    db.session.add_all([
+        Courses(course_code='COG101', course_name='Iğdır ve Doğu Anadolu', credits=3, department_id=department.id),
+        Courses(course_code='BIL201', course_name='Veri Yapıları', credits=4, department_id=department.id),
+        Announcements(title='Iğdır gezisi', content='Gezi programı açıklandı.'),
+        Announcements(title='Sınav takvimi', content='Iğdır gezisine katılanların sınavı ertelendi.'),
+        Announcements(title='Kütüphane', content='Çalışma saatleri uzatıldı.'),
+    ])
+    db.session.commit()
+
+
+def test_search_folds_turkish_letters_and_ranks_titles_first(test_client, db):
+    """Aramanın Türkçe harflerden bağımsız, önek eşleşmeli ve başlığı öne alan sıralamayla çalıştığını test eder."""
+    _catalog(db)
+
+    for q in ('igdir', 'IĞDIR', 'ığd'):
+        results = test_client.get(f'/api/search?q={q}').json['results']
+        assert {(r['type'], r['title']) for r in results} == {
+            ('course', 'Iğdır ve Doğu Anadolu'), ('announcement', 'Iğdır gezisi'), ('announcement', 'Sınav takvimi')}
+
+    announcements = test_client.get('/api/search?q=igdir gez&type=announcement').json['results']
+    assert [r['title'] for r in announcements] == ['Iğdır gezisi', 'Sınav takvimi']
+    assert test_client.get('/api/search?q=bil2').json['results'][0]['title'] == 'Veri Yapıları'
+    assert test_client.get('/api/search?q=calisma saat').json['results'][0]['title'] == 'Kütüphane'
+
+
+def test_search_index_follows_updates_and_deletes(test_client, db):
+    _catalog(db)
+    announcement = Announcements.query.filter_by(title='Kütüphane').one()
+    announcement.title = 'Kütüphane taşınıyor'
+    db.session.commit()
+    assert len(test_client.get('/api/search?q=tasiniyor').json['results']) == 1
+
+    db.session.delete(announcement)
+    db.session.commit()
+    assert test_client.get('/api/search?q=kutuphane').json['results'] == []
+
+
+def test_search_paginates_by_rank(test_client, db):
+    db.session.add_all([Announcements(title=f'Duyuru {i}', content='Ödev ' * (i + 1)) for i in range(5)])
+    db.session.commit()
+
+    seen, cursor = [], None
+    while True:
+        response = test_client.get('/api/search?q=odev&limit=2' + (f'&after={cursor}' if cursor else ''))
+        seen += response.json['results']
+        cursor = response.json['next_cursor']
+        if cursor is None:
+            break
+    assert len({r['id'] for r in seen}) == 5
+    assert [r['rank'] for r in seen] == sorted((r['rank'] for r in seen), reverse=True)
+
+
+def test_search_requires_a_query(test_client, db):
+    assert test_client.get('/api/search?q=  ').status_code == 400
+    assert test_client.get('/api/search?q=a&type=users').status_code == 400
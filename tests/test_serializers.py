@@ -0,0 +1,29 @@
+import datetime
+import decimal
+import numpy as np
+import orjson
+from models import Announcements
+from conftest import make_students_and_courses
+from api.serializers import dumps
+
+
+def test_dumps_handles_datetime_numpy_and_decimal():
+    value = {'date': datetime.datetime(2024, 3, 1, 9, 30), 'grade': np.float64(87.5), 'credits': decimal.Decimal('3.5')}
+    assert orjson.loads(dumps(value)) == {'date': '2024-03-01T09:30:00', 'grade': 87.5, 'credits': '3.5'}
+
+
+def test_announcement_list_serializes_columns_and_includes_alike(test_client, db, admin_user):
+    """Kolon yolu ile include yolunun aynı alanları aynı biçimde yazdığını test eder."""
+    _, course_ids = make_students_and_courses(db, admin_user.role_id, student_count=0, course_count=1)
+    posted = datetime.datetime(2024, 3, 1, 9, 30)
+    db.session.add(Announcements(title='Sınav', content='Vize tarihi', date_posted=posted, course_id=course_ids[0]))
+    db.session.commit()
+
+    plain = test_client.get('/api/announcements').json['announcements']
+    assert plain == [{'id': 1, 'title': 'Sınav', 'content': 'Vize tarihi',
+                      'date_posted': '2024-03-01T09:30:00', 'course_id': course_ids[0]}]
+
+    included = test_client.get('/api/announcements?include=course').json['announcements']
+    assert included[0]['course']['id'] == course_ids[0]
+    del included[0]['course']
+    assert included == plain